@@ -4,6 +4,7 @@ import { debugMode } from "../config.user.js";
 const { exec } = Utils;
 
 export const CACHE_DIR = `${GLib.get_user_cache_dir()}/wfinfo/ags`;
+export const RUNTIME_DIR = `${GLib.get_user_runtime_dir()}/wfinfo`;
 export const BIN_PATH = `${App.configDir}/../wfinfo`;
 export const WM_OR_DE = exec("wmctrl -m").split("\n")[0].replace("Name: ", "");
 
@@ -1,17 +1,31 @@
 import Cairo from "cairo";
 import { autodetect, logPath as defaultLogPath } from "../config.user.js";
-import { CACHE_DIR, debug, fileExists, info } from "../lib/misc.js";
+import { CACHE_DIR, RUNTIME_DIR, debug, fileExists, info } from "../lib/misc.js";
 const { Window, Box, Label, Icon } = Widget;
 const { exec, execAsync, HOME, readFile, writeFile, subprocess } = Utils;
 
-const SCREENSHOT_PATH = `${CACHE_DIR}/../screenshot.png`;
+// Raw PPM in memory so it doesn't have to be encoded and decoded as a PNG
+const SCREENSHOT_PATH = `${RUNTIME_DIR}/screenshot.ppm`;
 
 const findEELog = () =>
     exec(
         `bash -c "find ${HOME} -type f -name 'EE.log' -printf '%T@ %p\n' 2>/dev/null | sort -n | tail -1 | cut -d ' ' -f 2"`
     );
+const PYTHON_PATH = `${App.configDir}/../.venv/bin/python`;
 const execPython = (script, args = "", async = true) =>
-    (async ? execAsync : exec)(`${App.configDir}/../.venv/bin/python ${App.configDir}/../src/${script}.py ${args}`);
+    (async ? execAsync : exec)(`${PYTHON_PATH} ${App.configDir}/../src/${script}.py ${args}`);
+const execClient = (method, args = "") => execPython("client", `${method} ${args}`);
+
+// Printed by the daemon once it has updated the databases, which is usually in the background after the trigger
+const DBS_UPDATED = "Updated databases successfully!";
+
+// Start daemon so scripts don't have to load the databases and tesseract on every trigger
+const daemon = subprocess(
+    [PYTHON_PATH, `${App.configDir}/../src/daemon.py`],
+    out => (out === DBS_UPDATED ? info : debug)(out),
+    print
+);
+App.connect("shutdown", () => daemon.force_exit());
 
 const getDimensions = () => {
     // For multi-monitor, get monitor window is on
@@ -118,7 +132,20 @@ const LoadingDisplay = i => DisplayBase(i, Label({ hexpand: true, className: "re
 // Position gui so top = screen center
 const Spacer = () => hookWindowOpen(Box(), self => (self.css = `min-height: ${getDimensions().screenHeight / 2}px;`));
 
+// So overlapping triggers don't run the pipeline on the same screenshot at once
+let triggering = false;
+
 globalThis.trigger = async () => {
+    if (triggering) return debug("Already triggered, ignoring");
+    triggering = true;
+    try {
+        await runTrigger();
+    } finally {
+        triggering = false;
+    }
+};
+
+const runTrigger = async () => {
     debug("Triggered!");
 
     // Screenshot
@@ -128,26 +155,26 @@ globalThis.trigger = async () => {
     const { name: output } = monitors.find(
         m => m.make === monitor.get_manufacturer() && m.model === monitor.get_model()
     );
-    await execAsync(`grim -l 0 -o '${output}' ${SCREENSHOT_PATH}`);
+    await execAsync(`grim -t ppm -o '${output}' ${SCREENSHOT_PATH}`);
 
-    // Get number of rewards and open loading
-    const numRewards = await execPython("num_rewards", SCREENSHOT_PATH);
+    // Get number of rewards and open loading, counting is quick so it shows long before the rewards are read
+    const numRewards = await execClient("num_rewards", `path=${SCREENSHOT_PATH}`);
     rewards.value = parseInt(numRewards, 10);
     App.openWindow("wfinfo-fissure");
 
-    // Update databases async
-    execPython("database")
-        .then(out => {
-            if (!out.includes("Ignoring.")) info(out.replace(/.*\u001b\\/, "").split("\n")[0]);
-        })
-        .catch(print);
+    // Update databases async, the daemon says when it is done
+    execClient("update_dbs").catch(print);
 
-    // Parse image
-    const pyOut = await execPython("parser", `${SCREENSHOT_PATH} ${numRewards}`);
+    // Get the rewards and time left in one go, they are already counted
+    const pyOut = await execClient("analyze", `path=${SCREENSHOT_PATH} num_rewards=${numRewards}`);
 
     // Set value or warn if unable to parse
     try {
-        rewards.value = JSON.parse(pyOut);
+        const analysis = JSON.parse(pyOut);
+        if (analysis.trace) info(analysis.trace);
+        timeLeft = analysis.time_left;
+        rewards.value = analysis.items;
+        App.openWindow("wfinfo-fissure");
     } catch {
         console.warn(`Unable to parse script output as JSON: ${pyOut}`);
         App.closeWindow("wfinfo-fissure");
@@ -155,19 +182,25 @@ globalThis.trigger = async () => {
 };
 
 const rewards = Variable();
+let timeLeft = null;
 
 if (autodetect) {
     const logPath = getLogPath();
     if (fileExists(logPath)) {
         info(`Monitoring Warframe log at ${logPath}`);
-        subprocess(["tail", "-f", logPath], out => {
-            if (
-                out.includes("Pause countdown done") ||
-                out.includes("Got rewards") ||
-                out.includes("Created /Lotus/Interface/ProjectionRewardChoice.swf")
-            )
-                trigger().catch(print);
-        });
+        // Watcher merges the several markers of one reward screen into a single trigger event
+        const watcher = subprocess(
+            [PYTHON_PATH, `${App.configDir}/../src/log_watcher.py`, logPath],
+            out => {
+                const event = JSON.parse(out);
+                if (event.event === "trigger") {
+                    debug(`Log trigger on "${event.marker}", session: ${JSON.stringify(event.session)}`);
+                    trigger().catch(print);
+                } else if (event.event === "reset") info(`Warframe log ${event.reason}`);
+            },
+            print
+        );
+        App.connect("shutdown", () => watcher.force_exit());
     } else console.log("[WARNING] Unable to find Warframe's EE.log. Auto rewards detection will not be available.");
 }
 
@@ -204,21 +237,19 @@ export default () =>
 
                     // Try close when reward choosing over or in 15 seconds
                     timeout?.destroy();
-                    execPython("time_left", SCREENSHOT_PATH).then(out => {
-                        const timeLeft = Math.max(3, Math.min(15, out)) || 15;
-
-                        debug(
-                            (timeLeft == out
-                                ? `Detected time remaining as ${timeLeft} seconds.`
-                                : `Invalid time: ${out}.`) + ` Closing GUI in ${timeLeft} seconds...`
-                        );
-
-                        const now = Date.now();
-                        timeout = setTimeout(() => {
-                            App.closeWindow(self.name);
-                            debug(`Closed GUI after ${(Date.now() - now) / 1000} seconds.`);
-                        }, timeLeft * 1000);
-                    });
+                    const closeAfter = Math.max(3, Math.min(15, timeLeft)) || 15;
+
+                    debug(
+                        (closeAfter == timeLeft
+                            ? `Detected time remaining as ${closeAfter} seconds.`
+                            : `Invalid time: ${timeLeft}.`) + ` Closing GUI in ${closeAfter} seconds...`
+                    );
+
+                    const now = Date.now();
+                    timeout = setTimeout(() => {
+                        App.closeWindow(self.name);
+                        debug(`Closed GUI after ${(Date.now() - now) / 1000} seconds.`);
+                    }, closeAfter * 1000);
                 }
             });
         },
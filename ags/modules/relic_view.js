@@ -4,9 +4,44 @@ import OverlayWindow from "../lib/overlay_window.js";
 const { Box, Label, Icon, Button, Revealer, Scrollable, Entry, ToggleButton, Menu, MenuItem } = Widget;
 const { readFile, execAsync } = Utils;
 
-const resourceDir = `${CACHE_DIR}/../resources`;
-const items = JSON.parse(readFile(`${resourceDir}/prices.json`));
-const relics = JSON.parse(readFile(`${resourceDir}/relics.json`));
+const resourceDir = `${CACHE_DIR}/../resources/current`;
+// Relics with presorted orders, era and vaulted flags and a search index, built when the databases update
+const view = JSON.parse(readFile(`${resourceDir}/relic_view.json`));
+const VAULTED_FLAG = 1 << view.eras.length;
+const relics = view.relics.map(([tier, name, flags, price, drops], index) => ({
+    index,
+    tier,
+    name,
+    flags,
+    vaulted: Boolean(flags & VAULTED_FLAG),
+    price,
+    drops,
+}));
+
+// Relics with a word in their name or drops starting with the prefix, binary search for the first token
+const prefixMatches = prefix => {
+    let low = 0;
+    let high = view.tokens.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (view.tokens[mid] < prefix) low = mid + 1;
+        else high = mid;
+    }
+    const matches = new Set();
+    for (let i = low; i < view.tokens.length && view.tokens[i].startsWith(prefix); i++)
+        for (const relic of view.postings[i]) matches.add(relic);
+    return matches;
+};
+
+// Relics matching every word of the query, null if no query
+const searchRelics = query => {
+    let matches = null;
+    for (const word of query.toLowerCase().split(/\s+/).filter(Boolean)) {
+        const wordMatches = prefixMatches(word);
+        matches = matches ? new Set([...matches].filter(r => wordMatches.has(r))) : wordMatches;
+    }
+    return matches;
+};
 
 const ExpandIndicator = () =>
     Object.assign(
@@ -33,7 +68,7 @@ const DropWorth = ({ platinum, ducats }) =>
         ],
     });
 
-const Drop = (drop, rarity) => {
+const Drop = ([drop, rarity, platinum, ducats]) => {
     const wikiLink = `https://warframe.fandom.com/wiki/${drop
         .replace(" Blueprint", "")
         .replace(/(?<=Prime).*/, "")
@@ -55,7 +90,7 @@ const Drop = (drop, rarity) => {
     return Button({
         child: Box({
             className: `relic-drop relic-drop-${rarity}`,
-            children: [Label({ hexpand: true, xalign: 0, label: drop }), DropWorth(items[drop].price)],
+            children: [Label({ hexpand: true, xalign: 0, label: drop }), DropWorth({ platinum, ducats })],
         }),
         onSecondaryClickRelease: (_, event) => menu.popup_at_pointer(event),
         setup: self => menu.attach_to_widget(self, null),
@@ -97,10 +132,7 @@ const RelicTitle = (relic, dropsRevealer) => {
             ],
         }),
         onClicked: () => {
-            if (!dropsRevealer.child.children.length)
-                dropsRevealer.child.children = Object.entries(relic.drops).flatMap(([rarity, drops]) =>
-                    drops.map(d => Drop(d, rarity))
-                );
+            if (!dropsRevealer.child.children.length) dropsRevealer.child.children = relic.drops.map(Drop);
             dropsRevealer.revealChild = !dropsRevealer.revealChild;
             indicator.toggle(dropsRevealer.revealChild);
         },
@@ -141,53 +173,33 @@ const FilterButton = ({ label, toggled = false, onToggled = () => {}, ...rest })
         setup: setupCursorHover,
     });
 
-const SortChooser = (list, updateFilter) => {
-    const sorts = ["Default", "Platinum", "Ducats", "Platinum increase"];
-    const selected = Variable(sorts[0]);
+const SortChooser = (list, getRelicWidgets, updateFilter) => {
+    // Order and refinement in the view of each sort, default is the order of the relics
+    const sorts = {
+        Default: null,
+        Platinum: ["platinum", "intact"],
+        Ducats: ["ducats", "intact"],
+        "Platinum increase": ["platinum_increase", "radiant"],
+    };
+    const selected = Variable("Default");
     const descending = Variable(false);
     let childFocused = false;
 
     const sort = () => {
+        const relicWidgets = getRelicWidgets();
         // Ignore init call
-        if (!list.children.length) return;
-
-        let children = null;
-        switch (selected.value) {
-            case "Default":
-                children = list.children.sort((a, b) => {
-                    a = a.attribute.tier + a.attribute.name;
-                    b = b.attribute.tier + b.attribute.name;
-                    return a > b ? 1 : a < b ? -1 : 0;
-                });
-                break;
-            case "Platinum":
-                children = list.children.sort(
-                    (a, b) => a.attribute.price.intact.platinum - b.attribute.price.intact.platinum
-                );
-                break;
-            case "Ducats":
-                children = list.children.sort(
-                    (a, b) => a.attribute.price.intact.ducats - b.attribute.price.intact.ducats
-                );
-                break;
-            case "Platinum increase":
-                children = list.children.sort(
-                    ({ attribute: { price: a } }, { attribute: { price: b } }) =>
-                        a.radiant.platinum - a.intact.platinum - (b.radiant.platinum - b.intact.platinum)
-                );
-                break;
-            default:
-                console.log(`[WARNING] Invalid sort choice: ${selected.value}`);
-                break;
-        }
+        if (!relicWidgets) return;
 
-        if (children) {
-            if (descending.value) children.reverse();
-            list.children = children;
+        if (!(selected.value in sorts)) return console.log(`[WARNING] Invalid sort choice: ${selected.value}`);
 
-            // Update filter cause changing sort messes it up
-            updateFilter();
-        }
+        // Orders are presorted ascending so just pick the widgets in order
+        const order = sorts[selected.value];
+        const children = order ? view.orders[order[0]][order[1]].map(i => relicWidgets[i]) : [...relicWidgets];
+        if (descending.value) children.reverse();
+        list.children = children;
+
+        // Update filter cause changing sort messes it up
+        updateFilter();
     };
 
     list.hook(selected, sort);
@@ -223,7 +235,7 @@ const SortChooser = (list, updateFilter) => {
         transition: "slide_right",
         transitionDuration: 150,
         revealChild: false,
-        child: Box({ children: selected.bind().as(s => sorts.filter(so => so !== s).map(SortButton)) }),
+        child: Box({ children: selected.bind().as(s => Object.keys(sorts).filter(so => so !== s).map(SortButton)) }),
     });
 
     return Box({
@@ -312,22 +324,14 @@ export default () => {
     const updateFilter = () => {
         if (!relicWidgets) return;
 
-        const matcher = new RegExp(searchEntry.text, "i");
-
-        for (const [i, relic] of Object.values(relics).flatMap(Object.values).entries()) {
-            // Vaulted shows both vaulted and not, vaulted false only shows not
-            const vaultMatch = vaulted.value || !relic.vaulted;
-            const eraMatch = era.value === "All" || era.value === relic.tier;
-            // Match vaulted status and relic name
-            let vis = vaultMatch && eraMatch && matcher.test(`${relic.tier} ${relic.name}`);
+        const matches = searchRelics(searchEntry.text);
+        // Vaulted shows both vaulted and not, vaulted false only shows not
+        const hidden = vaulted.value ? 0 : VAULTED_FLAG;
+        const required = era.value === "All" ? 0 : 1 << view.eras.indexOf(era.value);
 
-            // Check drops if vaulted status matches and not already visible
-            if (vaultMatch && eraMatch && !vis)
-                vis = Object.values(relic.drops).some(rarity => rarity.some(drop => matcher.test(drop)));
-
-            // Change relic widget visibility
-            relicWidgets[i].visible = vis;
-        }
+        for (const { index, flags } of relics)
+            relicWidgets[index].visible =
+                !(flags & hidden) && (flags & required) === required && (!matches || matches.has(index));
     };
 
     vaulted.connect("changed", updateFilter);
@@ -340,7 +344,7 @@ export default () => {
             const id = App.connect("window-toggled", (_, name, visible) => {
                 if (visible && name === "wfinfo-relics") {
                     // Store in another array cause accessing children by index is extremely slow for some reason
-                    relicWidgets = Object.values(relics).flatMap(r => Object.values(r).map(Relic));
+                    relicWidgets = relics.map(Relic);
                     self.children = relicWidgets;
                     App.disconnect(id);
                 }
@@ -370,7 +374,7 @@ export default () => {
         children: [
             Box({
                 className: "relic-view-header",
-                children: [search, vaultedFilter, SortChooser(list, updateFilter), EraFilter(era)],
+                children: [search, vaultedFilter, SortChooser(list, () => relicWidgets, updateFilter), EraFilter(era)],
             }),
             Scrollable({
                 vexpand: true,
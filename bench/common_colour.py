@@ -0,0 +1,81 @@
+"""Checks finding the most common colour of the bottom line for theme detection against an exact count.
+
+The exact count sorts every pixel like theme detection originally did. It is compared with
+`theme.get_most_common_colour` on the bottom line of synthetic screens from `synthetic.py` and on busy
+backgrounds, where a noisy dark background is crowded into one histogram bin but no single background
+colour is as common as the text. Reports the median latency of each and exits with an error if any colour
+differs.
+
+Usage: python bench/common_colour.py [count] [seed]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import geometry  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+
+def _exact(array: np.ndarray) -> np.ndarray:
+    unique, counts = np.unique(array.reshape(-1, 3), axis=0, return_counts=True)
+    return unique[counts.argmax()]
+
+
+def _busy(rng: np.random.Generator, text: float, colour: tuple[int, int, int]):
+    # Dark noise within a single 5 bit bin, with a fraction of the pixels the text colour
+    height, width = 40, 1600
+    array = np.stack(
+        [
+            rng.integers(16, 24, (height, width)),
+            rng.integers(24, 32, (height, width)),
+            rng.integers(24, 32, (height, width)),
+        ],
+        axis=-1,
+    ).astype(np.uint8)
+    array[rng.random((height, width)) < text] = colour
+    return array
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else len(theme.themes) * 2
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = np.random.default_rng(seed)
+
+    cases = [
+        (
+            "synthetic",
+            np.asarray(
+                geometry.get_bottom_line_rewards(image, geometry.get_scale(image))
+            ),
+        )
+        for image, _ in synthetic.generate(count, seed)
+    ]
+    for text in (0.05, 0.15, 0.3):
+        for colour in ((190, 169, 102), tuple(theme.themes[0][0])):
+            cases.append((f"busy {text:.0%} text", _busy(rng, text, colour)))
+
+    times = {"exact": [], "histogram": []}
+    wrong = 0
+    for label, array in cases:
+        start = time.perf_counter()
+        expected = _exact(array)
+        times["exact"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        result = theme.get_most_common_colour(array)
+        times["histogram"].append(time.perf_counter() - start)
+
+        if (result != expected).any():
+            wrong += 1
+            print(f"    {label}: got {result.tolist()}, expected {expected.tolist()}")
+
+    print(f"{len(cases)} bottom lines, {wrong} wrong")
+    for method, method_times in times.items():
+        print(f"{method:<12}{statistics.median(method_times) * 1000:>8.2f} ms")
+    sys.exit(1 if wrong else 0)
@@ -0,0 +1,51 @@
+"""Compares the latency of cold script spawns with warm daemon requests.
+
+The daemon must be running (`python src/daemon.py`) for the warm measurements.
+
+Usage: python bench/daemon_latency.py <screenshot> [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(_SRC_DIR))
+
+from client import request  # noqa: E402
+
+_METHODS = "num_rewards", "parse", "time_left"
+
+
+def _cold(method: str, path: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import daemon; daemon.handle({method!r}, {{'path': {path!r}}})",
+        ],
+        cwd=_SRC_DIR,
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def _warm(method: str, path: str) -> float:
+    start = time.perf_counter()
+    request(method, path=path)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    path = str(Path(sys.argv[1]).resolve())
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"{'method':<12} {'cold (ms)':>10} {'warm (ms)':>10}")
+    for method in _METHODS:
+        cold = statistics.median(_cold(method, path) for _ in range(runs))
+        warm = statistics.median(_warm(method, path) for _ in range(runs))
+        print(f"{method:<12} {cold * 1000:>10.1f} {warm * 1000:>10.1f}")
@@ -0,0 +1,64 @@
+"""Compares loading the GUI's relic view JSON with loading the databases lazily from the snapshot.
+
+Uses the current generation of the cached databases, so they must exist (`python src/database.py`).
+
+Usage: python bench/db_load.py [runs]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(_SRC_DIR))
+
+import database as db  # noqa: E402
+import snapshot  # noqa: E402
+
+
+def _json_relic_view() -> None:
+    # What the GUI parses on start
+    json.loads(db._RELIC_VIEW_PATH.read_text())
+
+
+def _snapshot_section(name: str) -> None:
+    snapshot.Snapshot(db._SNAPSHOT_PATH).load(name)
+
+
+def _cold_import(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=_SRC_DIR, check=True)
+    return time.perf_counter() - start
+
+
+def _median(fn, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"JSON relic view: {_median(_json_relic_view, runs) * 1000:.2f} ms")
+    for name in db._SECTIONS:
+        print(
+            f"Snapshot {name}: {_median(lambda: _snapshot_section(name), runs) * 1000:.2f} ms"
+        )
+
+    cold_runs = max(runs // 4, 1)
+    baseline = statistics.median(_cold_import("pass") for _ in range(cold_runs))
+    for name in "item_endings", "items":
+        cold = statistics.median(
+            _cold_import(f"import database; database.{name}") for _ in range(cold_runs)
+        )
+        print(
+            f"Import to first use of {name}: {(cold - baseline) * 1000:.1f} ms"
+            f" (excluding {baseline * 1000:.1f} ms interpreter start)"
+        )
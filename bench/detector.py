@@ -0,0 +1,156 @@
+"""Checks the frame stream detector against recorded frame sequences and measures its throughput.
+
+A sequence alternates runs of gameplay-like frames (smooth colour fields with bright blobs and HUD text in
+theme colours away from the reward area) with runs of synthetic reward screens from `synthetic.py`. Every
+reward screen run should trigger exactly once, on any of its frames. The signature check must manage `detector.TARGET_FPS` at
+each resolution on one core.
+
+Usage: python bench/detector.py [reward screens] [seed] [--save <dir>]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import PIL.Image as Img
+from PIL import ImageDraw
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import detector  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+# Frames in each run of gameplay and of a reward screen
+_GAMEPLAY_FRAMES = 12
+_REWARD_FRAMES = 8
+
+
+def _gameplay(
+    size: tuple[int, int], rand: random.Random, rng: np.random.Generator
+) -> Img.Image:
+    width, height = size
+    # Smooth gradient between two random colours plus noise
+    start, end = rng.integers(0, 256, (2, 3))
+    t = np.linspace(0, 1, height)[:, None, None]
+    background = (start + (end - start) * t).astype(np.int16)
+    background = background + rng.integers(-24, 24, (height, width, 3))
+    image = Img.fromarray(np.clip(background, 0, 255).astype(np.uint8))
+
+    draw = ImageDraw.Draw(image)
+    scale = min(width / 1920, height / 1080)
+    # Bright blobs anywhere, e.g. muzzle flashes or sky
+    for _ in range(rand.randint(0, 6)):
+        x, y = rand.uniform(0, width), rand.uniform(0, height)
+        r = rand.uniform(10, 200) * scale
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=(255, 255, 255))
+    # HUD text in theme colours at the edges
+    font = synthetic._font(20 * scale)
+    for _ in range(rand.randint(2, 8)):
+        colour = tuple(rand.choice(theme.themes)[0])
+        x = rand.choice(
+            (rand.uniform(0, width * 0.2), rand.uniform(width * 0.7, width))
+        )
+        draw.text((x, rand.uniform(0, height)), "HUD 123", fill=colour, font=font)
+    return image
+
+
+def record(screens: int, seed: int = 0):
+    """Generates a recorded frame sequence.
+
+    Args:
+        screens (int): The number of reward screens in the sequence.
+        seed (int, optional): The seed. Defaults to 0.
+
+    Yields:
+        tuple[Img.Image, dict | None]: Each frame and the truth of the reward screen it shows, if any.
+    """
+
+    rand = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    for image, truth in synthetic.generate(screens, seed):
+        size = synthetic.RESOLUTIONS[truth["resolution"]]
+        for _ in range(_GAMEPLAY_FRAMES):
+            yield _gameplay(size, rand, rng), None
+        for _ in range(_REWARD_FRAMES):
+            yield image, truth
+    for _ in range(_GAMEPLAY_FRAMES):
+        yield _gameplay(size, rand, rng), None
+
+
+def _throughput(size: tuple[int, int], rng: np.random.Generator) -> float:
+    image = synthetic.render(size, ["Forma Blueprint"] * 4, theme.themes[0], 10, rng)
+    frames = [np.asarray(image), np.asarray(_gameplay(size, random.Random(0), rng))]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.5:
+        detector.check_frame(frames[count % 2])
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("screens", nargs="?", type=int, default=28)
+    arg_parser.add_argument("seed", nargs="?", type=int, default=0)
+    arg_parser.add_argument("--save", help="write the sequence and its truth here")
+    args = arg_parser.parse_args()
+
+    truths = []
+    output_dir = Path(args.save) if args.save else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    def frames():
+        # Streamed, a whole sequence at 4K doesn't fit in memory
+        for i, (image, truth) in enumerate(record(args.screens, args.seed)):
+            truths.append(truth)
+            if output_dir:
+                image.save(output_dir / f"{i}.ppm")
+            yield np.asarray(image)
+
+    triggered = [index for index, _ in detector.detect(frames())]
+    if output_dir:
+        (output_dir / "truth.json").write_text(json.dumps(truths))
+
+    # Each run of reward frames should trigger once, on any frame of the run
+    runs = {}
+    for i, truth in enumerate(truths):
+        if truth:
+            runs[i] = runs.get(i - 1, i)
+    detected = {}
+    false = []
+    for index in triggered:
+        if index in runs and runs[index] not in detected:
+            detected[runs[index]] = index
+        else:
+            false.append(index)
+    missed = sorted(set(runs.values()) - set(detected))
+    latency = [index - start for start, index in detected.items()]
+
+    print(
+        f"{len(truths)} frames, {len(missed) + len(detected)} reward screens: "
+        f"{len(detected)} detected, {len(false)} false triggers"
+    )
+    if latency:
+        print(f"mean latency {statistics.mean(latency):.2f} frames")
+    for index in missed:
+        print(f"    missed screen at frame {index}: {truths[index]}")
+    for index in false:
+        print(f"    false trigger at frame {index}: {truths[index]}")
+
+    print(f"\n{'resolution':<12}{'check fps':>12}")
+    slow = False
+    rng = np.random.default_rng(args.seed)
+    for resolution, size in synthetic.RESOLUTIONS.items():
+        fps = _throughput(size, rng)
+        slow |= fps < detector.TARGET_FPS
+        print(f"{resolution:<12}{fps:>12.0f}")
+    print(f"target {detector.TARGET_FPS} fps")
+
+    sys.exit(1 if missed or false or slow else 0)
@@ -0,0 +1,219 @@
+"""Checks getting the databases from the data API against a local mock with slow and failing responses.
+
+Serves recorded payloads (see `mock_api.py`) in process under several conditions and gets them the way the
+databases did before, one after the other on new connections then parsed in full, and with `remote.fetch_all`,
+concurrently on pooled connections and parsed as they arrive. Then checks retries of failed and hung
+requests, that conditional requests reuse pooled connections, and that refreshing stale databases returns
+straight away and keeps the current databases when the API is down. Parsing is also checked with the
+payloads split into chunks at random places, and a document of numbers split at every place.
+
+Everything is cached in a temporary dir, the real cache is not touched.
+
+Usage: python bench/fetch.py <payload dir> [runs]
+"""
+
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.parse import urlsplit
+
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp()
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import remote  # noqa: E402
+from mock_api import create_server  # noqa: E402
+
+_CONDITIONS = {
+    "fast": {},
+    "200 ms latency": {"latency": 0.2},
+    "256 KB/s": {"rate": 256_000},
+}
+
+
+def _sequential(payloads: list[str]) -> dict:
+    # What the databases did before
+    result = {}
+    for data in payloads:
+        conn = HTTPConnection(remote._DATA_API.netloc)
+        try:
+            conn.request("GET", f"/wfinfo/{data}/", headers={"Accept-Encoding": "gzip"})
+            response = conn.getresponse()
+            body = response.read()
+            if response.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            result[data] = json.loads(body)
+        finally:
+            conn.close()
+    return result
+
+
+def _concurrent(payloads: list[str], raw_dir: Path) -> dict:
+    return {
+        data: value
+        for data, (value, _) in remote.fetch_all(
+            {
+                data: (raw_dir / f"{data}.json", None, db._REMOTE_DATA.get(data, 1))
+                for data in payloads
+            }
+        ).items()
+    }
+
+
+def _serve(payload_dir: Path, **kwargs):
+    server = create_server(payload_dir, verbose=False, hang_time=5, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    remote._DATA_API = urlsplit(f"http://localhost:{server.server_port}")
+    # Connections to the last server are useless
+    remote._pool.clear()
+    return server
+
+
+def _check_chunks(payload_dir: Path, seed: int = 0) -> int:
+    """Checks parsing documents split into chunks anywhere, numbers in particular, against parsing them whole.
+
+    Returns:
+        int: The number of splits parsed wrongly.
+    """
+
+    rng = random.Random(seed)
+    docs = ['[1.5, -2, 5e-07, 1E+2, 10, 0.25, [3.0e1, 7], {"a": -0.5, "b": 12}]']
+    docs += [path.read_text() for path in sorted(payload_dir.glob("*.json"))]
+    wrong = 0
+    for doc in docs:
+        expected = json.loads(doc)
+        if len(doc) < 1000:
+            # Every split into two chunks
+            splits = [[i] for i in range(1, len(doc))]
+        else:
+            splits = [sorted(rng.sample(range(1, len(doc)), 2000)) for _ in range(20)]
+        for split in splits:
+            chunks = [doc[i:j] for i, j in zip([0, *split], [*split, len(doc)])]
+            for depth in (1, 2):
+                try:
+                    ok = remote.parse_stream(chunks, depth) == expected
+                except json.JSONDecodeError:
+                    ok = False
+                wrong += not ok
+    return wrong
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    try:
+        return fn(*args), time.perf_counter() - start
+    except Exception as e:
+        return e, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    payload_dir = Path(sys.argv[1])
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    payloads = sorted(path.stem for path in payload_dir.glob("*.json"))
+    raw_dir = Path(tempfile.mkdtemp())
+    expected = {
+        data: json.loads((payload_dir / f"{data}.json").read_bytes())
+        for data in payloads
+    }
+    failed = False
+
+    wrong = _check_chunks(payload_dir)
+    print(f"chunk splits: {'ok' if not wrong else f'{wrong} parsed wrongly'}")
+    failed |= bool(wrong)
+
+    print(f"{'condition':<20}{'sequential (ms)':>16}{'concurrent (ms)':>16}")
+    for condition, kwargs in _CONDITIONS.items():
+        server = _serve(payload_dir, **kwargs)
+        times = {"sequential": [], "concurrent": []}
+        for _ in range(runs):
+            for method, fn, args in (
+                ("sequential", _sequential, (payloads,)),
+                ("concurrent", _concurrent, (payloads, raw_dir)),
+            ):
+                result, elapsed = _timed(fn, *args)
+                times[method].append(elapsed)
+                if result != expected:
+                    print(f"    {method} got the wrong data: {result!r:.200}")
+                    failed = True
+        server.shutdown()
+        print(
+            f"{condition:<20}"
+            + "".join(f"{statistics.median(t) * 1000:>16.1f}" for t in times.values())
+        )
+
+    remote._TIMEOUT = 1
+    remote._BACKOFF = 0.1
+    print()
+    for condition, kwargs, succeeds in (
+        ("503 then ok", {"fail": 1}, True),
+        ("hang then ok", {"hang": 1}, True),
+        ("always 503", {"fail": remote._ATTEMPTS}, False),
+    ):
+        server = _serve(payload_dir, **kwargs)
+        result, elapsed = _timed(_concurrent, payloads, raw_dir)
+        server.shutdown()
+        ok = result == expected
+        print(
+            f"{condition:<20}{elapsed * 1000:>10.0f} ms  {'ok' if ok else type(result).__name__}, "
+            f"requests {server.requests}"
+        )
+        failed |= ok != succeeds
+
+    # Conditional requests after a full download should be 304s on the same connections
+    server = _serve(payload_dir)
+    requests = {data: (raw_dir / f"{data}.json", None, 1) for data in payloads}
+    validators = {data: v for data, (_, v) in remote.fetch_all(requests).items()}
+    connections = server.connections
+    requests = {
+        data: (raw_dir / f"{data}.json", validators[data], 1) for data in payloads
+    }
+    result, elapsed = _timed(remote.fetch_all, requests)
+    unchanged = all(value is None for value, _ in result.values())
+    print(
+        f"{'304s':<20}{elapsed * 1000:>10.1f} ms  {'ok' if unchanged else result}, "
+        f"{server.connections - connections} new connections"
+    )
+    failed |= not unchanged or server.connections != connections
+    server.shutdown()
+
+    # Stale while revalidate, the databases need to exist first
+    server = _serve(payload_dir)
+    db.update_dbs()
+    server.shutdown()
+    db._UPDATE_THRESHOLD = 0
+
+    # Full downloads so the databases are updated
+    remote._TIMEOUT = 5
+    server = _serve(payload_dir, latency=1)
+    db._REMOTE_META_PATH.unlink()
+    refreshed = threading.Event()
+    result, elapsed = _timed(db.refresh_dbs, refreshed.set)
+    start = time.perf_counter()
+    refreshed.wait(10)
+    print(
+        f"{'refresh slow API':<20}{elapsed * 1000:>10.1f} ms  returned {result}, "
+        f"updated {(time.perf_counter() - start) * 1000:.0f} ms later"
+    )
+    failed |= not result or not refreshed.is_set() or elapsed > 0.1
+    server.shutdown()
+
+    server = _serve(payload_dir, fail=remote._ATTEMPTS)
+    db._REMOTE_META_PATH.unlink(missing_ok=True)
+    result, elapsed = _timed(db.update_dbs)
+    kept = db._dbs_exist() and db.items
+    print(
+        f"{'update API down':<20}{elapsed * 1000:>10.1f} ms  returned {result!r}, "
+        f"{'kept' if kept else 'lost'} current databases"
+    )
+    failed |= result is not False or not kept
+    server.shutdown()
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,134 @@
+"""Measures the size and speed of the price history store.
+
+Simulates years of database updates every few hours for a few hundred items with random walk prices, some
+items only being added part way through, in a temporary history dir. Reports the time to append an update
+(including compaction), the size of the store and the latency of the queries the overlay makes. Then checks
+an update after being idle long enough for the whole head to be compacted, exiting with an error if it fails.
+
+Usage: python bench/history.py [years] [items] [hours between updates] [seed]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import history  # noqa: E402
+
+
+def _size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+
+def _use_temp_dir() -> None:
+    history._HISTORY_DIR = Path(tempfile.mkdtemp())
+    history._IDS_PATH = history._HISTORY_DIR / "items.json"
+    history._HEAD_PATH = history._HISTORY_DIR / "head.json"
+
+
+def _item(price: float) -> dict:
+    return {"price": {"platinum": price}, "sold": {"today": 1, "yesterday": 2}}
+
+
+def _check_idle() -> list[str]:
+    """Checks an update after longer than the raw days idle, which compacts the whole head, with a new item.
+
+    Returns:
+        list[str]: The problems found.
+    """
+
+    _use_temp_dir()
+    start = time.time() - 90 * history._DAY
+    history.append(start, {"A": _item(10), "updated": start})
+    history.append(start + 3600, {"A": _item(20), "updated": start + 3600})
+
+    # Idle then a new item, the head is emptied by compaction then widened
+    now = time.time()
+    try:
+        history.append(now, {"A": _item(30), "B": _item(40), "updated": now})
+        result = history.query(["A", "B", "Unknown"], 0)
+    except Exception as e:
+        return [f"idle update failed: {type(e).__name__}: {e}"]
+
+    problems = []
+    if result["times"].tolist() != [start // history._DAY * history._DAY, now]:
+        problems.append(f"idle times {result['times'].tolist()}")
+    platinum = result["platinum"].tolist()
+    if platinum[0][0] != 15 or platinum[1][:2] != [30, 40]:
+        problems.append(f"idle prices {platinum}")
+    if not np.isnan(result["platinum"][:, 2]).all():
+        problems.append("unknown item has prices")
+    return problems
+
+
+if __name__ == "__main__":
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    num_items = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    hours = float(sys.argv[3]) if len(sys.argv) > 3 else 4
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+
+    _use_temp_dir()
+    rng = np.random.default_rng(seed)
+    names = [f"Item {i} Prime Blueprint" for i in range(num_items)]
+    # A tenth of the items are added over time, like new primes
+    added = np.where(rng.random(num_items) < 0.1, rng.random(num_items) * years, 0)
+    prices = rng.uniform(5, 100, num_items)
+
+    end = time.time()
+    start = end - years * 365 * history._DAY
+    updates = np.arange(start, end, hours * 3600)
+    appends = []
+    for i, updated in enumerate(updates):
+        prices *= np.exp(rng.normal(0, 0.02, num_items))
+        elapsed = (updated - start) / (365 * history._DAY)
+        items = {
+            name: {
+                "price": {"platinum": round(float(price), 1)},
+                "sold": {
+                    "today": int(rng.integers(0, 200)),
+                    "yesterday": int(rng.integers(0, 200)),
+                },
+            }
+            for name, price, added_at in zip(names, prices, added)
+            if added_at <= elapsed
+        }
+        items["updated"] = updated
+
+        t = time.perf_counter()
+        history.append(updated, items)
+        appends.append(time.perf_counter() - t)
+
+    size = _size(history._HISTORY_DIR)
+    print(f"{len(updates)} updates of {num_items} items over {years:g} years")
+    print(
+        f"append: median {statistics.median(appends) * 1000:.2f} ms, "
+        f"max {max(appends) * 1000:.2f} ms"
+    )
+    print(
+        f"store: {size / 1024:.0f} KiB ({size / len(updates) / num_items:.2f} B per item per update), "
+        f"{len(updates) * num_items * 16 / 1024:.0f} KiB as float64 rows"
+    )
+
+    rewards = list(rng.choice(names, 4, replace=False))
+    for label, run in (
+        ("trend 4 items 7 days", lambda: history.trend(rewards, 7)),
+        ("trend 4 items 90 days", lambda: history.trend(rewards, 90)),
+        ("query 4 items all", lambda: history.query(rewards, 0)),
+        ("query all items 30 days", lambda: history.query(names, end - 30 * 86400)),
+    ):
+        times = []
+        for _ in range(20):
+            t = time.perf_counter()
+            result = run()
+            times.append(time.perf_counter() - t)
+        rows = len(result["times"])
+        print(f"{label:<26}{statistics.median(times) * 1000:>8.2f} ms{rows:>8} rows")
+
+    problems = _check_idle()
+    print("idle then new item: " + ("ok" if not problems else ", ".join(problems)))
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,70 @@
+"""Checks the import time of each entry point in src/ against its budget with `python -X importtime`.
+
+Exits with an error if any entry point is over budget, so it can be used as a regression check.
+
+Usage: python bench/import_time.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Budget of cumulative import time in milliseconds for each entry point
+_BUDGETS = {
+    "client": 40,
+    "num_rewards": 40,
+    "time_left": 40,
+    "geometry": 100,
+    "snapshot": 40,
+    "database": 120,
+    "theme": 250,
+    "parser": 500,
+    "daemon": 550,
+}
+
+
+def import_time(module: str) -> float:
+    """Measures the cumulative import time of the given module in a fresh interpreter.
+
+    Args:
+        module (str): The name of the module.
+
+    Returns:
+        float: The import time in milliseconds.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_SRC_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    # Lines are `import time: self [us] | cumulative | imported package`
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Top level import of the module has no extra indentation
+        if name.strip() == module and not name[1:].startswith(" "):
+            return int(cumulative) / 1000
+    raise RuntimeError(f"Unable to find import time of {module}")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    over = []
+    for module, budget in _BUDGETS.items():
+        time = statistics.median(import_time(module) for _ in range(runs))
+        status = "ok" if time <= budget else "OVER"
+        print(f"{module:<12} {time:>8.1f} ms / {budget:>4} ms  {status}")
+        if time > budget:
+            over.append(module)
+
+    if over:
+        sys.exit(f"Over import time budget: {', '.join(over)}")
@@ -0,0 +1,74 @@
+"""Compares opening screenshots from PNG files with opening raw PPM frames.
+
+Synthetic frames are written to a temporary directory (in shared memory if available) at 1080p and 4K, then
+opened each way: a PNG file decoded by PIL, a PPM file memory mapped, and a PPM read from stdin as bytes.
+
+Usage: python bench/ingest.py [runs]
+"""
+
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import PIL.Image as Img
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import frame  # noqa: E402
+
+_RESOLUTIONS = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def _synthetic(width: int, height: int) -> Img.Image:
+    # Noise compresses badly like a real screenshot
+    rng = np.random.default_rng(0)
+    return Img.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+def _png_file(path: Path) -> Img.Image:
+    # What each script did before
+    with Img.open(path) as image:
+        return image.convert("RGB")
+
+
+def _median(fn, runs: int, *args) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    tmp_root = "/dev/shm" if Path("/dev/shm").is_dir() else None
+
+    with tempfile.TemporaryDirectory(dir=tmp_root) as tmp_dir:
+        for label, (width, height) in _RESOLUTIONS.items():
+            image = _synthetic(width, height)
+            png_path = Path(tmp_dir) / f"{label}.png"
+            ppm_path = Path(tmp_dir) / f"{label}.ppm"
+            image.save(png_path, compress_level=1)  # grim -l 0 is even less compressed
+            ppm = io.BytesIO()
+            image.save(ppm, "PPM")
+            ppm = ppm.getvalue()
+            ppm_path.write_bytes(ppm)
+
+            assert frame._open(str(ppm_path)).tobytes() == image.tobytes()
+
+            png = _median(_png_file, runs, png_path)
+            mapped = _median(frame._open, runs, str(ppm_path))
+            stdin = _median(frame.from_ppm, runs, ppm)
+            # Further requests on the same frame are a stat
+            cached = _median(frame.open_frame, runs, str(ppm_path))
+
+            print(f"{label}:")
+            print(f"  PNG file: {png * 1000:.1f} ms")
+            print(f"  PPM mapped: {mapped * 1000:.1f} ms ({png / mapped:.1f}x)")
+            print(f"  PPM stdin: {stdin * 1000:.1f} ms ({png / stdin:.1f}x)")
+            print(f"  Reused frame: {cached * 1000:.3f} ms")
@@ -0,0 +1,158 @@
+"""Checks the events of the Warframe log watcher as a temporary log is written, truncated and rotated.
+
+Markers are written to a log in a temporary dir with short merge windows and cooldowns, checking that the first
+marker of a reward screen triggers, the markers after it are merged or suppressed, lines split across writes
+are only read once complete, and that the log being truncated or replaced by a new one resets it. This is done
+with inotify and again polling, as if inotify was unavailable. Exits with an error if any event is wrong.
+
+Usage: python bench/log_events.py
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import log_watcher  # noqa: E402
+
+_WINDOW = 0.3
+_COOLDOWN = 0.8
+# Seconds to wait for an event, and to wait to be sure there isn't one
+_TIMEOUT = 3
+_QUIET = 0.2
+
+
+class _Log:
+    """A log being written to and the events watching it, from a background thread."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.events = queue.Queue()
+        threading.Thread(target=self._watch, daemon=True).start()
+        # Let the watcher find the end of the file before writing
+        time.sleep(_QUIET)
+
+    def _watch(self) -> None:
+        for event in log_watcher.watch(str(self.path), _WINDOW, _COOLDOWN):
+            self.events.put(event)
+
+    def write(self, text: str) -> None:
+        with open(self.path, "a") as file:
+            file.write(text)
+
+    def next(self) -> dict | None:
+        try:
+            return self.events.get(timeout=_TIMEOUT)
+        except queue.Empty:
+            return None
+
+    def quiet(self) -> bool:
+        time.sleep(_QUIET)
+        return self.events.empty()
+
+
+def _check(directory: Path) -> list[str]:
+    """Writes, truncates and rotates a log, checking the events after each step.
+
+    Returns:
+        list[str]: The problems found.
+    """
+
+    problems = []
+
+    def expect(step: str, event: dict | None, kind: str, **expected) -> None:
+        if event is None:
+            problems.append(f"{step}: no event")
+        elif event["event"] != kind or any(
+            event.get(key) != value for key, value in expected.items()
+        ):
+            problems.append(f"{step}: got {event}")
+
+    path = directory / "EE.log"
+    path.write_text(f"0.000 Script [Info]: {log_watcher.MARKERS[0]}\n")
+    log = _Log(path)
+    if not log.quiet():
+        problems.append(f"existing lines: got {log.next()}")
+
+    log.write(f"1.000 Script [Info]: {log_watcher.MARKERS[0]}\nunrelated line\n")
+    session = {"triggers": 1, "merged": 0, "suppressed": 0}
+    expect("first marker", log.next(), "trigger", session=session)
+
+    log.write(
+        "".join(
+            f"1.100 Script [Info]: {marker}\n" for marker in log_watcher.MARKERS[1:]
+        )
+    )
+    time.sleep(_WINDOW)
+    log.write(f"1.500 Script [Info]: {log_watcher.MARKERS[1]}\n")
+    if not log.quiet():
+        problems.append(f"merged and suppressed markers: got {log.next()}")
+
+    # A marker split across writes is only read once the line is complete
+    time.sleep(_COOLDOWN)
+    log.write(f"2.000 Script [Info]: {log_watcher.MARKERS[1][:4]}")
+    if not log.quiet():
+        problems.append(f"partial line: got {log.next()}")
+    log.write(f"{log_watcher.MARKERS[1][4:]}\n")
+    session = {"triggers": 2, "merged": 2, "suppressed": 1}
+    expect(
+        "after cooldown",
+        log.next(),
+        "trigger",
+        marker=log_watcher.MARKERS[1],
+        session=session,
+    )
+
+    # Truncated logs are read from the start, in the same session
+    time.sleep(_COOLDOWN)
+    path.write_text("")
+    expect("truncated", log.next(), "reset", reason="truncated")
+    log.write(f"0.100 Script [Info]: {log_watcher.MARKERS[2]}\n")
+    session = {"triggers": 3, "merged": 2, "suppressed": 1}
+    expect(
+        "after truncation",
+        log.next(),
+        "trigger",
+        marker=log_watcher.MARKERS[2],
+        session=session,
+    )
+
+    # A new log is a new session, even straight after a trigger
+    os.rename(path, directory / "EE.log.old")
+    path.write_text(
+        f"0.000 Sys [Info]: Starting\n0.100 Script [Info]: {log_watcher.MARKERS[0]}\n"
+    )
+    expect("rotated", log.next(), "reset", reason="rotated", session=session)
+    session = {"triggers": 1, "merged": 0, "suppressed": 0}
+    expect("after rotation", log.next(), "trigger", session=session)
+    if not log.quiet():
+        problems.append(f"end: got {log.next()}")
+
+    return problems
+
+
+if __name__ == "__main__":
+    failed = False
+    inotify_watch = log_watcher._inotify_watch
+    for mode in ("inotify", "polling"):
+        if mode == "polling":
+            log_watcher._inotify_watch = lambda directory: None
+            log_watcher._POLL_INTERVAL = 0.02
+        else:
+            log_watcher._inotify_watch = inotify_watch
+
+        start = time.perf_counter()
+        problems = _check(Path(tempfile.mkdtemp()))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:<10}{elapsed:>6.1f} s  "
+            + ("ok" if not problems else ", ".join(problems))
+        )
+        failed |= bool(problems)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,166 @@
+"""Serves recorded warframestat.us payloads locally as a stand-in for the data API.
+
+Each `<data>.json` file in the given directory is served at `/wfinfo/<data>/` with ETag and Last-Modified
+headers, conditional requests, gzip encoding and keep-alive like the real API. Point the databases at it with
+the `WFINFO_DATA_API` environment variable, e.g. `WFINFO_DATA_API=http://localhost:8000 python src/database.py`.
+
+Slow and failing responses can be simulated: a latency before each response, a bandwidth limit on bodies,
+failing the first requests of each payload with 503s, or hanging them until the client gives up.
+
+Usage: python bench/mock_api.py <payload dir> [port] [--latency s] [--rate bytes/s] [--fail n] [--hang n]
+"""
+
+import argparse
+import gzip
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Bodies are sent in chunks this big when rate limited
+_CHUNK_SIZE = 4096
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """Serves payloads from the `payload_dir` of the server."""
+
+    # Keep connections alive between requests, without Nagle delaying bodies sent after the headers on them
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _fault(self, data: str) -> bool:
+        # Counts the request and fails or hangs it if it is one of the first of the payload
+        with self.server.lock:
+            count = self.server.requests[data] = self.server.requests.get(data, 0) + 1
+        if count <= self.server.hang:
+            # Never respond, the client should time out
+            time.sleep(self.server.hang_time)
+            self.close_connection = True
+            return True
+        if count <= self.server.hang + self.server.fail:
+            self.send_error(503)
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        path = self.server.payload_dir / f"{parts[-1]}.json"
+        if len(parts) != 2 or parts[0] != "wfinfo" or not path.is_file():
+            self.send_error(404)
+            return
+
+        time.sleep(self.server.latency)
+        if self._fault(parts[-1]):
+            return
+
+        body = path.read_bytes()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        last_modified = formatdate(path.stat().st_mtime, usegmt=True)
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        else:
+            encoding = None
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+
+        if not self.server.rate:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), _CHUNK_SIZE):
+            self.wfile.write(body[start : start + _CHUNK_SIZE])
+            self.wfile.flush()
+            time.sleep(_CHUNK_SIZE / self.server.rate)
+
+
+def create_server(
+    payload_dir: Path,
+    port: int = 0,
+    latency: float = 0,
+    rate: float = 0,
+    fail: int = 0,
+    hang: int = 0,
+    hang_time: float = 60,
+    verbose: bool = True,
+) -> ThreadingHTTPServer:
+    """Creates a mock API server for the payloads in the given directory.
+
+    Args:
+        payload_dir (Path): The directory of recorded payloads.
+        port (int, optional): The port to listen on. Defaults to 0 for any free port.
+        latency (float, optional): Seconds to wait before each response. Defaults to 0.
+        rate (float, optional): Bytes per second to send bodies at. Defaults to 0 for unlimited.
+        fail (int, optional): Number of requests of each payload to fail with a 503 (after the hung ones).
+            Defaults to 0.
+        hang (int, optional): Number of requests of each payload to never respond to. Defaults to 0.
+        hang_time (float, optional): Seconds to hold hung requests before closing them. Defaults to 60.
+        verbose (bool, optional): Whether to log each request. Defaults to True.
+
+    Returns:
+        ThreadingHTTPServer: The server, which is not started yet. Its `requests` are the number of requests
+            of each payload and `connections` the number of connections accepted.
+    """
+
+    server = ThreadingHTTPServer(("localhost", port), MockApiHandler)
+    server.daemon_threads = True
+    server.payload_dir = payload_dir
+    server.latency = latency
+    server.rate = rate
+    server.fail = fail
+    server.hang = hang
+    server.hang_time = hang_time
+    server.verbose = verbose
+    server.lock = threading.Lock()
+    server.requests = {}
+    server.connections = 0
+    return server
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("payload_dir", type=Path)
+    arg_parser.add_argument("port", type=int, nargs="?", default=8000)
+    arg_parser.add_argument("--latency", type=float, default=0)
+    arg_parser.add_argument("--rate", type=float, default=0)
+    arg_parser.add_argument("--fail", type=int, default=0)
+    arg_parser.add_argument("--hang", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    server = create_server(
+        args.payload_dir,
+        args.port,
+        latency=args.latency,
+        rate=args.rate,
+        fail=args.fail,
+        hang=args.hang,
+    )
+    print(f"Serving {args.payload_dir} on http://localhost:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,74 @@
+"""Compares counting the rewards from the layout of the bottom line with counting item endings in its OCR.
+
+Synthetic screens with 1 to 4 rewards in every theme and resolution from `synthetic.py` are counted both
+ways. Reports the median latency and accuracy of each, and how often the layout was ambiguous so the
+parser had to fall back to OCR.
+
+Usage: python bench/num_rewards.py [count] [seed]
+"""
+
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import geometry  # noqa: E402
+import parser  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+
+def _ocr(mask: np.ndarray, scale: float) -> int:
+    # What the parser did before, OCR of the whole line
+    text = parser.image_to_string(
+        parser.prepare_mask(mask, geometry.LINE_HEIGHT * scale), preprocessed=True
+    )
+    return len(re.findall("|".join(db.item_endings), text))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else len(theme.themes) * 4
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    parser.init_tess()
+    times = {"ocr": [], "layout": []}
+    correct = {"ocr": 0, "layout": 0, "parser": 0}
+    ambiguous = 0
+
+    for image, truth in synthetic.generate(count, seed):
+        scale = geometry.get_scale(image)
+        bottom_line = geometry.get_bottom_line_rewards(image, scale)
+        theme.init(bottom_line)
+        mask = theme.get_mask(np.asarray(bottom_line))
+        expected = len(truth["names"])
+
+        start = time.perf_counter()
+        result = _ocr(mask, scale)
+        times["ocr"].append(time.perf_counter() - start)
+        correct["ocr"] += result == expected
+
+        start = time.perf_counter()
+        result = parser.count_reward_slots(mask, scale)
+        times["layout"].append(time.perf_counter() - start)
+        correct["layout"] += result == expected
+        if result is None:
+            ambiguous += 1
+            print(f"    ambiguous: {truth}")
+        elif result != expected:
+            print(f"    counted {result}: {truth}")
+
+        correct["parser"] += parser._count_rewards(bottom_line, scale) == expected
+
+    print(f"{count} screens")
+    for method in times:
+        print(
+            f"{method:<8}{statistics.median(times[method]) * 1000:>10.3f} ms"
+            f"{correct[method] / count:>8.0%}"
+        )
+    print(f"parser{'':>16}{correct['parser'] / count:>8.0%}, {ambiguous} ambiguous")
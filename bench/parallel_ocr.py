@@ -0,0 +1,55 @@
+"""Compares parsing rewards one after another with parsing them in parallel with the Tesseract pool.
+
+The pool size can be set with the `WFINFO_TESS_WORKERS` environment variable.
+
+Usage: python bench/parallel_ocr.py <screenshot> [num rewards] [runs]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import PIL.Image as Img
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import geometry  # noqa: E402
+import parser  # noqa: E402
+import theme  # noqa: E402
+
+
+def _sequential(image: Img.Image, num_rewards: int) -> list[str]:
+    theme.init(geometry.get_bottom_line_rewards(image))
+    scale = geometry.get_scale(image)
+    line_height = geometry.LINE_HEIGHT * scale
+    return [
+        parser._parse_reward(img, line_height, scale)[0]
+        for img in geometry.cut_image(image, num_rewards)
+    ]
+
+
+def _time(fn, *args) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    num_rewards = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    with Img.open(sys.argv[1]) as image:
+        image = image.convert("RGB")
+
+    sequential = [_time(_sequential, image, num_rewards) for _ in range(runs)]
+    parallel = [_time(parser.parse_image, image, num_rewards) for _ in range(runs)]
+
+    assert sequential[0][1] == parallel[0][1], "Parallel output differs"
+    print(f"Rewards: {parallel[0][1]}")
+
+    seq = statistics.median(t for t, _ in sequential)
+    par = statistics.median(t for t, _ in parallel)
+    print(f"Sequential: {seq * 1000:.1f} ms")
+    print(f"Parallel ({parser._TESS_WORKERS} workers): {par * 1000:.1f} ms")
+    print(f"Speed-up: {seq / par:.2f}x")
@@ -0,0 +1,161 @@
+"""Benchmarks each stage of the parser on synthetic reward screens and reports latency and accuracy.
+
+Screens come from `synthetic.py` and cover every theme, 16:9, ultrawide and 16:10 resolutions and 1-4
+rewards. Latency percentiles are reported per stage, along with how many reward counts, names, line counts
+and timers were right.
+
+Results can be saved with `--save` and later runs compared against them with `--baseline`, which exits with
+an error if a stage's median got slower by more than the tolerance or an accuracy dropped.
+
+Usage: python bench/pipeline.py [--count N] [--seed N] [--save FILE] [--baseline FILE] [--tolerance FRACTION]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import frame  # noqa: E402
+import geometry  # noqa: E402
+import parser  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+_PERCENTILES = 50, 90, 99
+
+
+def _timed(times: dict[str, list[float]], stage: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    times.setdefault(stage, []).append(time.perf_counter() - start)
+    return result
+
+
+def run(count: int, seed: int) -> dict:
+    """Runs every stage on the synthetic screens.
+
+    Args:
+        count (int): The number of screens.
+        seed (int): The seed for the screens.
+
+    Returns:
+        dict: The latency percentiles of each stage in ms and the accuracy of each output.
+    """
+
+    parser.init_tess()
+    times = {}
+    correct = {"num_rewards": 0, "names": 0, "lines": 0, "time_left": 0}
+    totals = {"num_rewards": 0, "names": 0, "lines": 0, "time_left": 0}
+
+    for image, truth in synthetic.generate(count, seed):
+        ppm = io.BytesIO()
+        image.save(ppm, "PPM")
+        image = _timed(times, "decode", frame.from_ppm, ppm.getvalue())
+
+        num_rewards = len(truth["names"])
+        scale = geometry.get_scale(image)
+        line_height = geometry.LINE_HEIGHT * scale
+        bottom_line = geometry.get_bottom_line_rewards(image, scale)
+
+        # Theme is different for every screen so it is always detected again
+        _timed(times, "detect_theme", theme.init, bottom_line)
+        cells = geometry.cut_image(image, num_rewards, scale)
+        _timed(times, "strip", theme.strip, cells[0])
+
+        # Line detection is checked against the wrapping of the name by the renderer
+        font = synthetic._font(synthetic._FONT_SIZE * scale)
+        width = (geometry.REWARD_WIDTH - synthetic._MARGIN * 2) * scale
+        for cell, name in zip(cells, truth["names"]):
+            mask = theme.get_mask(np.asarray(cell))
+            lines = parser.get_text_lines(mask, line_height, scale)
+            correct["lines"] += lines == len(synthetic._wrap(name, font, width))
+            totals["lines"] += 1
+
+        counted = _timed(times, "num_rewards", parser.get_num_rewards, image)
+        names = _timed(times, "parse_image", parser.parse_image, image, num_rewards)
+        resolved = _timed(times, "resolve_items", parser.resolve_items, names)
+        time_left = _timed(times, "time_left", parser.get_time_left, image)
+        _timed(times, "analyze", parser.analyze, image)
+
+        correct["num_rewards"] += counted == num_rewards
+        totals["num_rewards"] += 1
+        correct["names"] += sum(
+            name == expected for (name, _), expected in zip(resolved, truth["names"])
+        )
+        totals["names"] += num_rewards
+        correct["time_left"] += time_left == truth["time_left"]
+        totals["time_left"] += 1
+
+    return {
+        "latency": {
+            stage: {
+                f"p{p}": float(np.percentile(stage_times, p)) * 1000
+                for p in _PERCENTILES
+            }
+            for stage, stage_times in times.items()
+        },
+        "accuracy": {name: correct[name] / totals[name] for name in correct},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compares results against a baseline.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of the baseline run.
+        tolerance (float): How much slower (as a fraction) a stage's median can be.
+
+    Returns:
+        list[str]: The regressions, empty if there are none.
+    """
+
+    regressions = []
+    for stage, latency in baseline["latency"].items():
+        new = results["latency"].get(stage)
+        if new and new["p50"] > latency["p50"] * (1 + tolerance):
+            regressions.append(
+                f"{stage} p50 {latency['p50']:.2f} ms -> {new['p50']:.2f} ms"
+            )
+    for name, accuracy in baseline["accuracy"].items():
+        if results["accuracy"].get(name, 0) < accuracy:
+            regressions.append(
+                f"{name} accuracy {accuracy:.1%} -> {results['accuracy'].get(name, 0):.1%}"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--count", type=int, default=len(theme.themes) * 4)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--save", type=Path)
+    arg_parser.add_argument("--baseline", type=Path)
+    arg_parser.add_argument("--tolerance", type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    results = run(args.count, args.seed)
+
+    print(f"{'stage':<16}" + "".join(f"{f'p{p} (ms)':>12}" for p in _PERCENTILES))
+    for stage, latency in results["latency"].items():
+        print(f"{stage:<16}" + "".join(f"{v:>12.2f}" for v in latency.values()))
+    print()
+    for name, accuracy in results["accuracy"].items():
+        print(f"{name} accuracy: {accuracy:.1%}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=4))
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
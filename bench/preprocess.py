@@ -0,0 +1,84 @@
+"""Compares OCR of the raw text mask of each reward with OCR of the trimmed and resampled mask.
+
+Synthetic 4 reward screens are rendered at each resolution from `synthetic.py`, the text lines of each
+reward are found like the parser does, then OCRed both ways. Reports the median OCR latency and how many
+names resolved to the right item for each resolution.
+
+Usage: python bench/preprocess.py [screens per resolution] [seed]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import geometry  # noqa: E402
+import parser  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+
+def _raw(mask: np.ndarray, line_height: float):
+    # What the parser did before, the mask as is
+    return theme.from_mask(mask)
+
+
+_METHODS = {"raw": _raw, "prepared": parser.prepare_mask}
+
+
+if __name__ == "__main__":
+    screens = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    parser.init_tess()
+    item_names = sorted(db.item_names)
+
+    print(
+        f"{'resolution':<12}"
+        + "".join(f"{f'{m} (ms)':>16}{f'{m} acc':>14}" for m in _METHODS)
+    )
+    for resolution, size in synthetic.RESOLUTIONS.items():
+        rand = random.Random(seed)
+        rng = np.random.default_rng(seed)
+        times = {method: [] for method in _METHODS}
+        correct = dict.fromkeys(_METHODS, 0)
+        total = 0
+
+        for i in range(screens):
+            names = rand.sample(item_names, 4)
+            image = synthetic.render(
+                size, names, theme.themes[i % len(theme.themes)], 10, rng
+            )
+            scale = geometry.get_scale(image)
+            line_height = geometry.LINE_HEIGHT * scale
+            theme.init(geometry.get_bottom_line_rewards(image, scale))
+
+            for cell, name in zip(geometry.cut_image(image, 4, scale), names):
+                mask = theme.get_mask(np.asarray(cell))
+                lines = parser.get_text_lines(mask, line_height, scale)
+                mask = mask[round(mask.shape[0] - lines * line_height) :]
+                total += 1
+
+                for method, prepare in _METHODS.items():
+                    start = time.perf_counter()
+                    text = parser.image_to_string(
+                        prepare(mask, line_height),
+                        preprocessed=True,
+                        multiline=lines > 1,
+                    )
+                    times[method].append(time.perf_counter() - start)
+                    correct[method] += parser.resolve_items([text])[0][0] == name
+
+        print(
+            f"{resolution:<12}"
+            + "".join(
+                f"{statistics.median(times[m]) * 1000:>16.1f}{correct[m] / total:>14.0%}"
+                for m in _METHODS
+            )
+        )
@@ -0,0 +1,86 @@
+"""Compares valuing every relic with the old nested loops with the vectorised engine.
+
+Uses the current generation of the cached databases, so they must exist (`python src/database.py`).
+
+Usage: python bench/relic_values.py [runs]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import valuation  # noqa: E402
+
+
+def _loop(relics: dict, items: dict) -> dict:
+    # The old per relic loop from _process_relics
+    prices = {}
+    for tier, tier_dict in relics.items():
+        for name, relic in tier_dict.items():
+            relic_prices = {}
+            for refinement, chances in db._REFINEMENTS.items():
+                r_price = {"platinum": 0, "ducats": 0}
+
+                for rarity, drops in relic["drops"].items():
+                    for drop in drops:
+                        for currency, value in items[drop]["price"].items():
+                            r_price[currency] += value * chances[rarity]
+
+                for currency in r_price:
+                    r_price[currency] = round(r_price[currency], 2)
+
+                relic_prices[refinement] = r_price
+            prices[(tier, name)] = relic_prices
+    return prices
+
+
+def _engine(relics: dict, items: dict) -> dict:
+    values = valuation.RelicValues(relics, items, db._REFINEMENTS)
+    values.set_prices(relics)
+    return {
+        (tier, name): relic["price"]
+        for tier, tier_dict in relics.items()
+        for name, relic in tier_dict.items()
+    }
+
+
+def _median(fn, runs: int, *args) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    relics, items = db.relics, db.items
+    num_relics = sum(len(tier_dict) for tier_dict in relics.values())
+
+    expected = _loop(relics, items)
+    actual = _engine(relics, items)
+    # Summing in a different order can round differently by a cent
+    diff = max(
+        abs(expected[key][r][c] - actual[key][r][c])
+        for key in expected
+        for r in expected[key]
+        for c in expected[key][r]
+    )
+    print(f"Relics: {num_relics}, max difference: {diff:.2f}")
+
+    loop = _median(_loop, runs, relics, items)
+    engine = _median(_engine, runs, relics, items)
+    print(f"Loop: {loop * 1000:.2f} ms")
+    print(f"Engine: {engine * 1000:.2f} ms")
+    print(f"Speed-up: {loop / engine:.2f}x")
+
+    values = valuation.RelicValues(relics, items, db._REFINEMENTS)
+    for players in range(1, valuation.MAX_PLAYERS + 1):
+        squad = _median(values.squad_values, runs, players)
+        print(f"Squad of {players}, all relics: {squad * 1000:.2f} ms")
@@ -0,0 +1,96 @@
+"""Benchmarks resolving corrupted reward names to items with `parser.resolve_items`.
+
+Names are taken from the cached item database and corrupted with random OCR-like edits. The batched
+resolver is compared with resolving each name separately. Then names with their first word cut off are
+resolved, exiting with an error if any resolve to a different item instead of being invalid.
+
+Usage: python bench/resolve.py [names] [max edits]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from rapidfuzz import fuzz, process
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import parser  # noqa: E402
+
+# Commonly confused characters
+_CONFUSIONS = {"e": "c", "i": "l", "l": "I", "o": "0", "r": "n", "m": "rn", "B": "8"}
+
+
+def _corrupt(name: str, edits: int) -> str:
+    chars = list(name)
+    for _ in range(edits):
+        i = random.randrange(len(chars))
+        op = random.random()
+        if op < 0.4 and chars[i] in _CONFUSIONS:
+            chars[i] = _CONFUSIONS[chars[i]]
+        elif op < 0.7:
+            del chars[i]
+        else:
+            chars.insert(i, random.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(chars)
+
+
+def _resolve_each(names: list[str]) -> list[str | None]:
+    results = []
+    for name in names:
+        match = process.extractOne(
+            name, db.item_names, scorer=fuzz.ratio, score_cutoff=parser._ITEM_CUTOFF
+        )
+        results.append(None if match is None else match[0])
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    max_edits = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    random.seed(0)
+
+    expected = random.choices(db.item_names, k=count)
+    corrupted = [_corrupt(n, random.randint(0, max_edits)) for n in expected]
+
+    exact = sum(c in db.items for c in corrupted)
+    print(f"Exact lookup accuracy: {exact / count:.1%}")
+
+    # Batches of 4 like a reward screen
+    start = time.perf_counter()
+    resolved = []
+    for i in range(0, count, 4):
+        resolved += [name for name, _ in parser.resolve_items(corrupted[i : i + 4])]
+    batched = time.perf_counter() - start
+    accuracy = sum(r == e for r, e in zip(resolved, expected)) / count
+    wrong = sum(r is not None and r != e for r, e in zip(resolved, expected)) / count
+    print(
+        f"Batched: {batched / count * 4000:.3f} ms per screen, {accuracy:.1%} accuracy, "
+        f"{wrong:.1%} wrong"
+    )
+
+    # Only the end of the name read, these should be invalid rather than some other item
+    truncated = {
+        " ".join(name.split()[1:]): name
+        for name in db.item_names
+        if len(name.split()) > 2
+    }
+    misresolved = [
+        (part, name, resolved)
+        for (part, name), (resolved, _) in zip(
+            truncated.items(), parser.resolve_items(list(truncated))
+        )
+        if resolved is not None and resolved != name
+    ]
+    print(f"Truncated: {len(misresolved)}/{len(truncated)} resolved to the wrong item")
+    for part, name, resolved in misresolved[:10]:
+        print(f"    {part!r} ({name}) -> {resolved}")
+
+    start = time.perf_counter()
+    _resolve_each(corrupted)
+    each = time.perf_counter() - start
+    print(f"Per name: {each / count * 4000:.3f} ms per screen")
+
+    sys.exit(1 if misresolved else 0)
@@ -0,0 +1,56 @@
+"""Compares the per-pixel `np.vectorize` strip with the vectorised mask in `theme.strip`.
+
+Crops are the size of a reward line and the bottom line of rewards at 1080p, 1440p and 4K.
+
+Usage: python bench/strip.py [runs]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import PIL.Image as Img
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import theme  # noqa: E402
+
+_RESOLUTIONS = {"1080p": 1, "1440p": 4 / 3, "4K": 2}
+_CROPS = {"line": (242, 24), "bottom line": (242 * 4, 24)}
+
+
+def _strip_per_pixel(img: Img.Image, theme_: theme.Theme) -> Img.Image:
+    # The original implementation, for comparison
+    img_array = np.array(img)
+    filter_fn_vec = np.vectorize(lambda r, g, b: theme.check_range((r, g, b), theme_))
+    mask = filter_fn_vec(img_array[..., 0], img_array[..., 1], img_array[..., 2])
+    output_array = np.ones_like(img_array) * 255
+    output_array[mask] = 0, 0, 0
+    return Img.fromarray(output_array.astype("uint8"))
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'crop':<24} {'per pixel (ms)':>15} {'vectorised (ms)':>16} {'speed-up':>9}"
+    )
+    for resolution, scale in _RESOLUTIONS.items():
+        for crop, (width, height) in _CROPS.items():
+            size = round(height * scale), round(width * scale), 3
+            img = Img.fromarray(rng.integers(0, 256, size, dtype=np.uint8))
+            theme_ = theme.themes[0]
+
+            old = min(
+                timeit.repeat(
+                    lambda: _strip_per_pixel(img, theme_), number=1, repeat=runs
+                )
+            )
+            new = min(
+                timeit.repeat(lambda: theme.strip(img, theme_), number=1, repeat=runs)
+            )
+            print(
+                f"{f'{resolution} {crop}':<24} {old * 1000:>15.2f} {new * 1000:>16.3f} {old / new:>8.0f}x"
+            )
@@ -0,0 +1,163 @@
+"""Renders fake reward screens with known rewards for benchmarking the parser without the game.
+
+Real item names are drawn in the theme colours at the reward geometry used by the parser, wrapped onto
+multiple lines when too wide, over a noisy background. The timer is drawn above the rewards.
+
+Usage: python bench/synthetic.py <output dir> [count] [seed]
+"""
+
+import json
+import os
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import PIL.Image as Img
+from PIL import ImageDraw, ImageFont
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import database as db  # noqa: E402
+import geometry  # noqa: E402
+import theme  # noqa: E402
+
+# 16:9, ultrawide and 16:10
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4K": (3840, 2160),
+    "UW 1080p": (2560, 1080),
+    "UW 1440p": (3440, 1440),
+    "WUXGA": (1920, 1200),
+    "WQXGA": (2560, 1600),
+}
+
+# Sizes at 1080p like the geometry
+_FONT_SIZE = 17
+_TIMER_FONT_SIZE = 30
+_MARGIN = 8
+_TIME_COLOUR = 255, 255, 255
+# Set to a TrueType font to render with it instead of PIL's default
+_FONT_PATH = os.environ.get("WFINFO_BENCH_FONT")
+
+
+def _font(size: float) -> ImageFont.FreeTypeFont:
+    size = max(round(size), 1)
+    if _FONT_PATH:
+        return ImageFont.truetype(_FONT_PATH, size)
+    return ImageFont.load_default(size)
+
+
+def _wrap(name: str, font: ImageFont.FreeTypeFont, width: float) -> list[str]:
+    lines = []
+    for word in name.split():
+        if lines and font.getlength(f"{lines[-1]} {word}") <= width:
+            lines[-1] += f" {word}"
+        else:
+            lines.append(word)
+    return lines
+
+
+def render(
+    size: tuple[int, int],
+    names: list[str],
+    theme_: theme.Theme,
+    time_left: int,
+    rng: np.random.Generator,
+) -> Img.Image:
+    """Renders a reward screen.
+
+    Args:
+        size (tuple[int, int]): The width and height of the screen.
+        names (list[str]): The reward names, from 1 to 4.
+        theme_ (theme.Theme): The theme to draw the names in.
+        time_left (int): The time left to draw on the timer.
+        rng (np.random.Generator): The generator for the background noise.
+
+    Returns:
+        Img.Image: The reward screen.
+    """
+
+    width, height = size
+    # Noisy background so the text is the most common colour
+    background = rng.integers(0, 48, (height, width, 3), dtype=np.uint8)
+    # Darken noise which would be taken as text, dark themes are in the range
+    background[theme.get_mask(background, theme_)] //= 2
+    image = Img.fromarray(background)
+    draw = ImageDraw.Draw(image)
+
+    scale = geometry.get_scale(image)
+    font = _font(_FONT_SIZE * scale)
+    line_height = geometry.LINE_HEIGHT * scale
+    cell_width = geometry.REWARD_WIDTH * scale
+    left = (width - cell_width * len(names)) / 2
+    bottom = height / 2 - geometry.REWARD_BOTTOM * scale
+
+    for i, name in enumerate(names):
+        lines = _wrap(name, font, cell_width - _MARGIN * scale * 2)
+        centre = left + cell_width * (i + 0.5)
+        for j, line in enumerate(reversed(lines)):
+            # Baseline a little above the bottom of each line
+            y = bottom - line_height * j - line_height * 0.25
+            draw.text((centre, y), line, fill=tuple(theme_[0]), font=font, anchor="ms")
+
+    timer_size = geometry.TIME_SIZE * scale
+    draw.text(
+        (width / 2, height / 2 - geometry.TIME_TOP * scale + timer_size / 2),
+        str(time_left),
+        fill=_TIME_COLOUR,
+        font=_font(_TIMER_FONT_SIZE * scale),
+        anchor="mm",
+    )
+
+    return image
+
+
+def generate(count: int, seed: int = 0):
+    """Generates reward screens covering every theme, resolution and number of rewards.
+
+    Args:
+        count (int): The number of screens.
+        seed (int, optional): The seed for the rewards and noise. Defaults to 0.
+
+    Yields:
+        tuple[Img.Image, dict]: Each screen and its truth: the resolution, theme index, reward names and
+            time left.
+    """
+
+    rand = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    item_names = sorted(db.item_names)
+    resolutions = list(RESOLUTIONS)
+
+    for i in range(count):
+        resolution = resolutions[i % len(resolutions)]
+        theme_index = i % len(theme.themes)
+        num_rewards = i % 4 + 1
+        names = rand.sample(item_names, num_rewards)
+        time_left = rand.randint(1, 15)
+
+        image = render(
+            RESOLUTIONS[resolution], names, theme.themes[theme_index], time_left, rng
+        )
+        yield image, {
+            "resolution": resolution,
+            "theme": theme_index,
+            "names": names,
+            "time_left": time_left,
+        }
+
+
+if __name__ == "__main__":
+    output_dir = Path(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else len(theme.themes) * 4
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    truth = {}
+    for i, (image, info) in enumerate(generate(count, seed)):
+        image.save(output_dir / f"{i}.ppm")
+        truth[f"{i}.ppm"] = info
+    (output_dir / "truth.json").write_text(json.dumps(truth, indent=4))
+    print(f"Wrote {count} screens to {output_dir}")
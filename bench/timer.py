@@ -0,0 +1,83 @@
+"""Compares reading the reward timer by template matching with reading it by Tesseract.
+
+Synthetic reward screens with every time left from 0 to 15 are rendered at each resolution from
+`synthetic.py`, so the scale from `get_scale` covers 1 to 2. Reports the median latency and accuracy of
+Tesseract alone, the templates alone (unsure reads count as wrong) and the templates with the Tesseract
+fallback as used by the parser, plus how often the fallback was needed. Templates are learned from scratch
+in a temporary dir, set WFINFO_BENCH_FONT to render with a font other than the one the templates start as.
+
+Usage: python bench/timer.py [seed]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import digits  # noqa: E402
+import geometry  # noqa: E402
+import parser  # noqa: E402
+import synthetic  # noqa: E402
+import theme  # noqa: E402
+
+_MAX_TIME = 15
+
+
+def _tesseract(mask: np.ndarray) -> int | None:
+    # OCR only, what the parser falls back to
+    return parser.ocr_time_left(mask)
+
+
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    parser.init_tess()
+    digits._LEARNED_PATH = Path(tempfile.mkdtemp()) / "digit_templates.npz"
+    rng = np.random.default_rng(seed)
+
+    methods = ("tesseract", "templates", "parser")
+    print(
+        f"{'resolution':<12}{'scale':>6}"
+        + "".join(f"{f'{m} (ms)':>16}{f'{m} acc':>15}" for m in methods)
+        + f"{'fallbacks':>11}"
+    )
+    for resolution, size in synthetic.RESOLUTIONS.items():
+        times = {method: [] for method in methods}
+        correct = dict.fromkeys(methods, 0)
+        fallbacks = 0
+
+        for time_left in range(_MAX_TIME + 1):
+            image = synthetic.render(
+                size, ["Forma Blueprint"], theme.themes[0], time_left, rng
+            )
+            scale = geometry.get_scale(image)
+            mask = (
+                np.asarray(geometry.get_timer(image, scale)) >= geometry.TIME_COLOUR
+            ).all(axis=-1)
+
+            for method, read in (
+                ("tesseract", lambda: _tesseract(mask)),
+                ("templates", lambda: digits.read(mask)),
+                ("parser", lambda: parser.get_time_left(image, scale)),
+            ):
+                if method == "parser":
+                    fallbacks += digits.read(mask) is None
+                start = time.perf_counter()
+                result = read()
+                times[method].append(time.perf_counter() - start)
+                correct[method] += result == time_left
+
+        print(
+            f"{resolution:<12}{geometry.get_scale(image):>6.2f}"
+            + "".join(
+                f"{statistics.median(times[m]) * 1000:>16.2f}"
+                f"{correct[m] / (_MAX_TIME + 1):>15.0%}"
+                for m in methods
+            )
+            + f"{fallbacks:>11}"
+        )
@@ -5,3 +5,4 @@ complete -c wfinfo -s t -l trigger -d 'Trigger manual fissure rewards detection'
 complete -c wfinfo -s g -l toggle-gui -d 'Toggle GUI overlay layers' -x
 complete -c wfinfo -l reload-css -d 'Reload GUI styles' -x
 complete -c wfinfo -l update-dbs -d 'Update relic, item and price databases' -x
+complete -c wfinfo -l reset-digits -d 'Forget the timer digits learned from the game' -x
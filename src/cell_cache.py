@@ -0,0 +1,226 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import PIL.Image as Img
+from platformdirs import user_cache_path
+
+import database as db
+
+_CACHE_PATH = user_cache_path("wfinfo") / "cell_cache.json"
+# Max number of cells to remember, the least recently used are evicted first, 0 to disable
+_MAX_ENTRIES = int(os.environ.get("WFINFO_CELL_CACHE_SIZE", 2048))
+# Size of the hash of each line of text
+_HASH_ROWS = 16
+_HASH_COLS = 128
+# Max fraction of hash bits that can differ for a cell to still be a hit
+_MAX_DISTANCE = 0.02
+# Seconds to wait after a change before saving, so saving is off the critical path and changes are batched
+_SAVE_DELAY = 5
+
+_lock = threading.Lock()
+# Hash key to (hash bits, recognised text), in least to most recently used order
+_entries = None
+# Key prefix (lines and aspect) to the keys with it and their hash bits, only these need comparing
+_buckets = None
+_vocabulary = None
+_dirty = False
+_save_timer = None
+
+# Since the daemon started
+hits = 0
+misses = 0
+
+
+def _get_vocabulary() -> str:
+    """Gets a fingerprint of the words the text of cached cells was corrected to.
+
+    Returns:
+        str: The fingerprint.
+    """
+
+    # Sorted as the order of the words depends on the hash seed, which is different in each process
+    return hashlib.sha1("\n".join(sorted(db.words)).encode()).hexdigest()
+
+
+def _prefix(key: str) -> str:
+    return key.rsplit(":", 1)[0]
+
+
+def _add(key: str, bits: np.ndarray, text: str) -> None:
+    """Adds an entry as the most recently used, evicting the least recently used if full.
+
+    Must be called with the lock held.
+
+    Args:
+        key (str): The key of the hash.
+        bits (np.ndarray): The bits of the hash.
+        text (str): The recognised text.
+    """
+
+    _entries[key] = bits, text
+    _entries.move_to_end(key)
+    _buckets.setdefault(_prefix(key), {})[key] = bits
+    while len(_entries) > _MAX_ENTRIES:
+        old, _ = _entries.popitem(last=False)
+        bucket = _buckets[_prefix(old)]
+        del bucket[old]
+        if not bucket:
+            del _buckets[_prefix(old)]
+
+
+def _load() -> None:
+    """Loads the cache from disk, discarding it if the vocabulary has changed since it was saved."""
+
+    global _entries, _buckets, _vocabulary
+
+    _vocabulary = _get_vocabulary()
+    _entries = OrderedDict()
+    _buckets = {}
+    try:
+        data = json.loads(_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return
+    if data.get("vocabulary") != _vocabulary:
+        return
+
+    for key, text in data["entries"]:
+        bits = np.unpackbits(np.frombuffer(bytes.fromhex(key.split(":")[-1]), np.uint8))
+        _add(key, bits, text)
+
+
+def _hash(mask: np.ndarray, lines: int) -> tuple[str, np.ndarray]:
+    """Calculates the perceptual hash of a text mask.
+
+    The mask is trimmed to the text, then averaged down to a fixed grid per line and thresholded. The key
+    includes the number of lines and a rough aspect ratio so only similar cells need comparing.
+
+    Args:
+        mask (np.ndarray): The boolean mask of text pixels.
+        lines (int): The number of lines of text in the mask.
+
+    Returns:
+        tuple[str, np.ndarray]: The key of the hash and its bits.
+    """
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    mask = mask[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+
+    grid = (
+        Img.fromarray(mask)
+        .convert("L")
+        .resize((_HASH_COLS, _HASH_ROWS * lines), Img.Resampling.BOX)
+    )
+    bits = (np.asarray(grid) >= 128).ravel()
+    aspect = round(mask.shape[1] / mask.shape[0] * 4)
+
+    return f"{lines}:{aspect}:{np.packbits(bits).tobytes().hex()}", bits
+
+
+def get(mask: np.ndarray, lines: int) -> tuple[str, str | None]:
+    """Gets the recognised text of a cell from the cache.
+
+    A cell is a hit if its hash is the same or only differs in a few bits from a cached one with the same
+    number of lines and aspect ratio.
+
+    Args:
+        mask (np.ndarray): The boolean mask of the lines of text in the cell.
+        lines (int): The number of lines of text.
+
+    Returns:
+        tuple[str, str | None]: The key to store the text with if a miss, and the text or None if a miss.
+    """
+
+    global hits, misses
+
+    if not _MAX_ENTRIES:
+        return "", None
+
+    key, bits = _hash(mask, lines)
+
+    with _lock:
+        if _entries is None:
+            _load()
+
+        if key in _entries:
+            _entries.move_to_end(key)
+            hits += 1
+            return key, _entries[key][1]
+
+        max_distance = bits.size * _MAX_DISTANCE
+        for other, other_bits in _buckets.get(_prefix(key), {}).items():
+            if np.count_nonzero(bits != other_bits) <= max_distance:
+                _entries.move_to_end(other)
+                hits += 1
+                return key, _entries[other][1]
+
+        misses += 1
+        return key, None
+
+
+def put(key: str, text: str) -> None:
+    """Caches the recognised text of a cell, which is saved to disk in the background shortly after.
+
+    Only cache text which is known to be right, e.g. resolves to an item, as similar cells get it from then on
+    instead of being recognised again.
+
+    Args:
+        key (str): The key from `get`.
+        text (str): The recognised text.
+    """
+
+    global _dirty, _save_timer
+
+    if not _MAX_ENTRIES:
+        return
+
+    bits = np.unpackbits(np.frombuffer(bytes.fromhex(key.split(":")[-1]), np.uint8))
+    with _lock:
+        _add(key, bits, text)
+        _dirty = True
+        if _save_timer is None:
+            _save_timer = threading.Timer(_SAVE_DELAY, save)
+            _save_timer.daemon = True
+            _save_timer.start()
+
+
+def save() -> None:
+    """Saves the cache to disk if it has changed. This is done automatically after changes and on exit."""
+
+    global _dirty, _save_timer
+
+    with _lock:
+        _save_timer = None
+        if not _dirty:
+            return
+        data = {
+            "vocabulary": _vocabulary,
+            "entries": [[key, text] for key, (_, text) in _entries.items()],
+        }
+        _dirty = False
+
+    _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=_CACHE_PATH.parent, delete=False) as file:
+        json.dump(data, file)
+    os.replace(file.name, _CACHE_PATH)
+
+
+# Save changes not yet saved by the timer
+atexit.register(save)
+
+
+def check_vocabulary() -> None:
+    """Clears the cache if the vocabulary has changed, e.g. after the databases are updated."""
+
+    global _dirty
+
+    with _lock:
+        if _entries is not None and _get_vocabulary() != _vocabulary:
+            _load()
+            _dirty = True
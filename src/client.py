@@ -0,0 +1,92 @@
+import json
+import os
+import socket
+import sys
+
+# Define socket path and ensure its dir exists
+# Same as platformdirs.user_runtime_path, but importing that (and pathlib) takes longer than the rest of this
+# script, which is run for every request
+_RUNTIME_DIR = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}", "wfinfo"
+)
+os.makedirs(_RUNTIME_DIR, exist_ok=True)
+SOCKET_PATH = os.path.join(_RUNTIME_DIR, "daemon.sock")
+
+
+def request(method: str, **params):
+    """Sends a request to the daemon and returns the result.
+
+    If the daemon is not running, the request is handled in this process instead. This is a lot slower as
+    everything (databases, Tesseract, etc) has to be loaded first.
+
+    Args:
+        method (str): The name of the method to run.
+        **params: The parameters of the method.
+
+    Raises:
+        RuntimeError: If the daemon returns an error.
+
+    Returns:
+        Any: The result of the method.
+    """
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(SOCKET_PATH)
+            sock.sendall(
+                json.dumps({"method": method, "params": params}).encode() + b"\n"
+            )
+            with sock.makefile("rb") as file:
+                response = json.loads(file.readline())
+    except (FileNotFoundError, ConnectionRefusedError):
+        # Daemon not running, so do it ourselves
+        from daemon import handle
+
+        # Background updates would be killed when this exits, so wait for them
+        if method == "update_dbs":
+            params = {**params, "wait": True}
+        return handle(method, params)
+
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+def _write_stdin_frame() -> str:
+    """Writes the frame on stdin to a file of this request for the daemon to map.
+
+    The runtime dir is in memory so this is cheap. The file is named after the pid instead of using tempfile,
+    which takes longer to import than the rest of this script, as no other running client has the same pid.
+    Remove the file once the request is done.
+
+    Returns:
+        str: The frame path.
+    """
+
+    # Only sent to the daemon once fully written, so it never sees a partial frame
+    path = os.path.join(_RUNTIME_DIR, f"frame.{os.getpid()}.ppm")
+    with open(path, "wb") as file:
+        file.write(sys.stdin.buffer.read())
+    return path
+
+
+# Send request from command line args if called as main script, e.g. `client.py parse path=... num_rewards=4`
+# A path of - reads a PPM from stdin, e.g. `grim -t ppm - | client.py parse path=-`
+if __name__ == "__main__":
+    params = {}
+    frame_path = None
+    for arg in sys.argv[2:]:
+        key, value = arg.split("=", 1)
+        if key == "path" and value == "-":
+            value = frame_path = _write_stdin_frame()
+        params[key] = int(value) if value.isdigit() else value
+
+    try:
+        result = request(sys.argv[1], **params)
+    finally:
+        if frame_path:
+            os.remove(frame_path)
+
+    # Print result for other scripts to use, no output if none
+    if result is not None:
+        print(json.dumps(result))
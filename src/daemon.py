@@ -0,0 +1,165 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+
+import database as db
+import digits
+import frame
+import history
+import parser
+import tracing
+from client import SOCKET_PATH
+
+# Tesseract apis are not thread safe, so only one OCR request at a time
+_ocr_lock = threading.Lock()
+
+
+def _num_rewards(path: str) -> int:
+    with _ocr_lock:
+        return parser.get_num_rewards(frame.open_frame(path))
+
+
+def _print_stats(stats: dict[str, int]) -> None:
+    cells = stats["cache_hits"] + stats["cache_misses"]
+    print(
+        f"OCR calls: {stats['ocr_calls']} ({stats['ocr_calls_saved']} saved), "
+        f"cell cache hits: {stats['cache_hits']}/{cells}"
+    )
+
+
+def _parse(path: str, num_rewards: int = None, sources: bool = False) -> list[dict]:
+    with _ocr_lock:
+        rewards = parser.parse_rewards(frame.open_frame(path), num_rewards, sources)
+        stats = dict(parser.last_stats)
+    _print_stats(stats)
+    return rewards
+
+
+def _time_left(path: str) -> int | None:
+    with _ocr_lock:
+        return parser.get_time_left(frame.open_frame(path))
+
+
+def _reload_dbs() -> None:
+    with _ocr_lock:
+        parser.reload_dbs()
+    # Updates mostly happen in the background, so tell the overlay through the daemon's output
+    print("Updated databases successfully!", flush=True)
+
+
+def _update_dbs(wait: bool = False) -> bool:
+    # Keep using the current databases while updating in the background, unless asked to wait for it
+    if not wait and db.refresh_dbs(_reload_dbs):
+        return False
+    # Not locked cause it is mostly waiting on the network
+    updated = db.update_dbs()
+    if updated:
+        _reload_dbs()
+    return updated
+
+
+def _analyze(path: str, sources: bool = False, num_rewards: int = None) -> dict:
+    with _ocr_lock:
+        result = parser.analyze(frame.open_frame(path), sources, num_rewards)
+        stats = dict(parser.last_stats)
+    if tracing.enabled:
+        result["trace"] = tracing.summary()
+    _print_stats(stats)
+    result["stats"] = stats
+    return result
+
+
+def _relic_value(
+    tier: str, name: str, refinement: str = "intact", players: int = 1
+) -> dict[str, float]:
+    return db.relic_values.query(tier, name, refinement, players)
+
+
+def _price_history(items: str | list[str], days: float = 7) -> dict:
+    # Comma separated from the command line
+    if isinstance(items, str):
+        items = items.split(",")
+    return history.trend(items, days)
+
+
+_METHODS = {
+    "analyze": _analyze,
+    "num_rewards": _num_rewards,
+    "parse": _parse,
+    "price_history": _price_history,
+    "relic_value": _relic_value,
+    "reset_digits": digits.reset,
+    "time_left": _time_left,
+    "update_dbs": _update_dbs,
+}
+
+
+def handle(method: str, params: dict = None):
+    """Runs the given method with the given parameters.
+
+    Args:
+        method (str): The name of the method to run.
+        params (dict, optional): The keyword arguments to pass to the method. Defaults to None.
+
+    Raises:
+        ValueError: If the method does not exist.
+
+    Returns:
+        Any: The result of the method.
+    """
+
+    if method not in _METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    with tracing.span(method):
+        return _METHODS[method](**(params or {}))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles newline delimited JSON requests from a client connection."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"result": handle(request["method"], request.get("params"))}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve() -> None:
+    """Serves requests on the daemon socket until interrupted, unless a daemon is already serving on it."""
+
+    if os.path.exists(SOCKET_PATH):
+        # Don't take over from a running daemon, only replace the socket of one which is gone
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(SOCKET_PATH)
+            except ConnectionRefusedError:
+                os.remove(SOCKET_PATH)
+            else:
+                print(f"Daemon already running on {SOCKET_PATH}")
+                return
+
+    # Load everything now so the first request doesn't have to
+    parser.init_tess()
+
+    with Server(SOCKET_PATH, _RequestHandler) as server:
+        print(f"Listening on {SOCKET_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(SOCKET_PATH)
+
+
+# Start server if called as main script
+if __name__ == "__main__":
+    serve()
@@ -1,22 +1,35 @@
 import json
+import os
+import shutil
 import sys
+import tempfile
+import threading
 import time
-from http.client import HTTPSConnection
+from pathlib import Path
 
 from platformdirs import user_cache_path
 
-# Define resource path and ensure it exists
-_RESOURCE_DIR = user_cache_path("wfinfo") / "resources"
-_RESOURCE_DIR.mkdir(parents=True, exist_ok=True)
-
-_PRICES_PATH = _RESOURCE_DIR / "prices.json"
-_CHARS_PATH = _RESOURCE_DIR / "whitelist_chars.txt"
-_ENDINGS_PATH = _RESOURCE_DIR / "item_endings.txt"
-_WORDS_PATH = _RESOURCE_DIR / "words.txt"
-_RELICS_PATH = _RESOURCE_DIR / "relics.json"
+import snapshot
 
-_DATA_API = "api.warframestat.us"
+# Define resource paths and ensure they exist
+_RESOURCE_DIR = user_cache_path("wfinfo") / "resources"
+_GENERATIONS_DIR = _RESOURCE_DIR / "generations"
+_GENERATIONS_DIR.mkdir(parents=True, exist_ok=True)
+_REMOTE_DIR = _RESOURCE_DIR / "remote"  # Raw remote data and its HTTP validators
+_REMOTE_DIR.mkdir(parents=True, exist_ok=True)
+_CURRENT_DIR = _RESOURCE_DIR / "current"  # Symlink to the active generation
+
+# Index for the relic view GUI, snapshot for everything else
+_RELIC_VIEW_PATH = _CURRENT_DIR / "relic_view.json"
+_SNAPSHOT_PATH = _CURRENT_DIR / "snapshot.bin"
+_REMOTE_META_PATH = _REMOTE_DIR / "meta.json"
+
+# Remote data and how deep to parse it as it arrives, each equipment and relic of filtered_items separately
+_REMOTE_DATA = {"prices": 1, "filtered_items": 2}
 _UPDATE_THRESHOLD = 3600 * 4  # 4 hours
+_KEEP_GENERATIONS = 2  # Keep the previous generation for readers still using it
+# Era of each bit of the relic view flags, the next bit is vaulted
+_ERAS = "Lith", "Meso", "Neo", "Axi", "Requiem"
 _BLUEPRINT_ENDINGS = "Systems", "Neuroptics", "Chassis", "Harness", "Wings", "Prime"
 _REFINEMENTS = {
     "intact": {
@@ -41,10 +54,92 @@ _REFINEMENTS = {
     },
 }
 
-items = {}
-whitelist_chars = ""
-item_endings = []
-words = []
+# Databases are loaded from the snapshot on first access via __getattr__, these are the snapshot sections
+_SECTIONS = (
+    "items",
+    "whitelist_chars",
+    "item_endings",
+    "words",
+    "word_index",
+    "relics",
+    "item_relics",
+)
+# Databases derived from the sections, given the databases to derive them from
+_DERIVED = {
+    "item_names": lambda dbs: [
+        name for name in _get("items", dbs) if name != "updated"
+    ],
+    "words_set": lambda dbs: set(_get("words", dbs)),
+    "relic_values": lambda dbs: _get_relic_values(dbs),
+}
+
+_snapshot = None
+# The loaded databases by name. Updates replace the whole dict at once, so readers (and databases derived
+# while it is replaced) never mix old and new databases
+_dbs = {}
+# Held while the databases are refreshed in the background
+_refresh_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """Gets the database with the given name, see `_get`."""
+
+    return _get(name)
+
+
+def _get(name: str, dbs: dict = None):
+    """Gets the database with the given name, loading it on first access.
+
+    The snapshot is opened (or the databases updated if they don't exist) on the first access of any database.
+    Functions in this module must use this as __getattr__ is only called for attribute access from outside
+    the module.
+
+    Args:
+        name (str): The name of the database.
+        dbs (dict, optional): The databases to get it from. Defaults to None for the current ones.
+
+    Raises:
+        AttributeError: If there is no database with the name.
+
+    Returns:
+        Any: The database.
+    """
+
+    if dbs is None:
+        dbs = _dbs
+    if name in dbs:
+        return dbs[name]
+
+    if name in _DERIVED:
+        value = _DERIVED[name](dbs)
+    elif name in _SECTIONS:
+        # Load on first use instead of on import
+        if _snapshot is None:
+            load_dbs()
+            # Updating sets the databases directly
+            return _get(name)
+        value = _snapshot.load(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    dbs[name] = value
+    return value
+
+
+def _get_relic_values(dbs: dict):
+    """Builds the valuation engine for the relics.
+
+    Args:
+        dbs (dict): The databases to value the relics with.
+
+    Returns:
+        valuation.RelicValues: The relic values.
+    """
+
+    # Only needed for scenario queries, numpy is slow to import
+    import valuation
+
+    return valuation.RelicValues(_get("relics", dbs), _get("items", dbs), _REFINEMENTS)
 
 
 def _normalise_item_name(name: str) -> str:
@@ -62,25 +157,20 @@ def _normalise_item_name(name: str) -> str:
     return f"{name} Blueprint" if name.split()[-1] in _BLUEPRINT_ENDINGS else name
 
 
-def _get_remote_data(data: str):
-    """Gets data from warframestat.us.
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Writes the given data to the given path atomically.
 
-    Raises:
-        e: The exception the request threw.
+    The data is written to a temporary file in the same directory which is then renamed to the path,
+    so readers either see the old file or the new file but never a partially written one.
 
-    Returns:
-        Any: The requested data from the remote.
+    Args:
+        path (Path): The path to write to.
+        data (bytes): The data to write.
     """
 
-    conn = HTTPSConnection(_DATA_API)
-    try:
-        conn.request("GET", f"/wfinfo/{data}/")
-        return json.loads(conn.getresponse().read())
-    except Exception as e:
-        print(f"Unable to get data from {_DATA_API}/wfinfo/{data}: {e}")
-        raise e
-    finally:
-        conn.close()
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(data)
+    os.replace(file.name, path)
 
 
 def _process_items(
@@ -109,11 +199,12 @@ def _process_items(
     return ducats
 
 
-def _process_relics(relics: dict[str, dict[str, bool | str]]) -> dict:
+def _process_relics(relics: dict[str, dict[str, bool | str]], items: dict) -> dict:
     """Processes relic data from the remote.
 
     Args:
         relics (dict[str, dict[str, bool  |  str]]): The relic data.
+        items (dict): The processed items, the vaulted status of each drop is set in place.
 
     Returns:
         dict[str, dict[str, bool | str | dict[str, tuple[str, str, str] | tuple[str, str] | tuple[str]]]]: The processed data.
@@ -158,22 +249,162 @@ def _process_relics(relics: dict[str, dict[str, bool | str]]) -> dict:
                         )
                     new_relic["drops"][rarity].append(drop)
 
-            for refinement, chances in _REFINEMENTS.items():
-                r_price = {"platinum": 0, "ducats": 0}
+            new_relics[tier][name] = new_relic
+
+    # Only needed when processing, numpy is slow to import
+    import valuation
 
-                for rarity, drops in new_relic["drops"].items():
-                    for drop in drops:
-                        for currency, value in items[drop]["price"].items():
-                            r_price[currency] += value * chances[rarity]
+    valuation.RelicValues(new_relics, items, _REFINEMENTS).set_prices(new_relics)
 
-                for currency in r_price:
-                    r_price[currency] = round(r_price[currency], 2)
+    return new_relics
 
-                new_relic["price"][refinement] = r_price
 
-            new_relics[tier][name] = new_relic
+def _build_item_relics(
+    relics: dict[str, dict[str, dict]],
+) -> dict[str, list[tuple[str, str, str, bool]]]:
+    """Builds an index of item names to the relics which drop them.
 
-    return new_relics
+    Args:
+        relics (dict[str, dict[str, dict]]): The processed relics.
+
+    Returns:
+        dict[str, list[tuple[str, str, str, bool]]]: The tier, name, rarity and vaulted status of each relic
+            which drops each item.
+    """
+
+    index = {}
+    for tier, tier_dict in relics.items():
+        for name, relic in tier_dict.items():
+            for rarity, drops in relic["drops"].items():
+                for drop in drops:
+                    index.setdefault(drop, []).append(
+                        (tier, name, rarity, relic["vaulted"])
+                    )
+    return index
+
+
+def _reprice_relics(
+    relics: dict[str, dict[str, dict]],
+    item_relics: dict[str, list[tuple[str, str, str, bool]]],
+    items: dict[str, dict],
+    old_items: dict[str, dict],
+) -> int:
+    """Recalculates the prices of the relics with a drop whose price changed.
+
+    Used instead of processing the relics again when only the prices have changed. The vaulted status of
+    each drop is copied from the old items as it comes from the relics.
+
+    Args:
+        relics (dict[str, dict[str, dict]]): The processed relics, which are updated in place.
+        item_relics (dict[str, list[tuple[str, str, str, bool]]]): The relics which drop each item.
+        items (dict[str, dict]): The new items, the vaulted status of each drop is copied into them.
+        old_items (dict[str, dict]): The items the relics were priced with.
+
+    Returns:
+        int: The number of relics repriced.
+    """
+
+    changed = {}
+    for item, sources in item_relics.items():
+        # Items can be added to or dropped from the prices, relics of dropped items are valued without them
+        new, old = items.get(item), old_items.get(item)
+        if new is not None and old is not None and "vaulted" in old:
+            new["vaulted"] = old["vaulted"]
+        if (new and new["price"]) != (old and old["price"]):
+            for tier, name, _, _ in sources:
+                changed.setdefault(tier, {})[name] = relics[tier][name]
+
+    if changed:
+        # Only needed when processing, numpy is slow to import
+        import valuation
+
+        valuation.RelicValues(changed, items, _REFINEMENTS).set_prices(relics)
+
+    return sum(len(tier_dict) for tier_dict in changed.values())
+
+
+def _build_relic_view(relics: dict[str, dict[str, dict]], items: dict) -> dict:
+    """Builds the index the relic view renders from, so it doesn't have to sort or search every relic itself.
+
+    Relics are listed in the default order (by tier then name) with the price of each drop, and are referred
+    to by their position in the list everywhere else in the index.
+
+    Args:
+        relics (dict[str, dict[str, dict]]): The processed relics.
+        items (dict): The processed items.
+
+    Returns:
+        dict: The index. "eras" is the era of each bit of the relic flags, the next bit is vaulted. "relics"
+            is the tier, name, flags, price of each refinement and drops (name, rarity, platinum and ducats)
+            of each relic. "orders" has the relics in ascending order of "platinum", "ducats" and
+            "platinum_increase" (over intact) for each refinement. "tokens" are the sorted lowercase words
+            of the relic and drop names, and "postings" the relics containing each word.
+    """
+
+    rows = sorted(
+        (relic for tier_dict in relics.values() for relic in tier_dict.values()),
+        key=lambda relic: relic["tier"] + relic["name"],
+    )
+
+    view_relics = []
+    postings = {}
+    for i, relic in enumerate(rows):
+        flags = (1 << _ERAS.index(relic["tier"])) if relic["tier"] in _ERAS else 0
+        if relic["vaulted"]:
+            flags |= 1 << len(_ERAS)
+        drops = [
+            [
+                drop,
+                rarity,
+                items[drop]["price"]["platinum"] if drop in items else 0,
+                items[drop]["price"]["ducats"] if drop in items else 0,
+            ]
+            for rarity, rarity_drops in relic["drops"].items()
+            for drop in rarity_drops
+        ]
+        view_relics.append([relic["tier"], relic["name"], flags, relic["price"], drops])
+
+        text = " ".join([relic["tier"], relic["name"], *(drop[0] for drop in drops)])
+        for token in set(text.lower().split()):
+            postings.setdefault(token, []).append(i)
+
+    # Sorts are stable so ties stay in the default order
+    orders = {"platinum": {}, "ducats": {}, "platinum_increase": {}}
+    for refinement in _REFINEMENTS:
+        for key in ("platinum", "ducats"):
+            orders[key][refinement] = sorted(
+                range(len(rows)), key=lambda i: rows[i]["price"][refinement][key]
+            )
+        orders["platinum_increase"][refinement] = sorted(
+            range(len(rows)),
+            key=lambda i: rows[i]["price"][refinement]["platinum"]
+            - rows[i]["price"]["intact"]["platinum"],
+        )
+
+    tokens = sorted(postings)
+    return {
+        "eras": _ERAS,
+        "relics": view_relics,
+        "orders": orders,
+        "tokens": tokens,
+        "postings": [postings[token] for token in tokens],
+    }
+
+
+def get_relic_sources(item: str) -> list[dict[str, str | bool]]:
+    """Gets the relics which drop the given item.
+
+    Args:
+        item (str): The name of the item.
+
+    Returns:
+        list[dict[str, str | bool]]: The tier, name, rarity and vaulted status of each relic.
+    """
+
+    return [
+        {"tier": tier, "relic": name, "rarity": rarity, "vaulted": vaulted}
+        for tier, name, rarity, vaulted in _get("item_relics").get(item, ())
+    ]
 
 
 def _process_prices(
@@ -241,80 +472,303 @@ def _process_prices(
     return new_prices, "".join(chars), list(endings), list(words)
 
 
+def _build_word_index(words: list[str]) -> dict[int, list[int]]:
+    """Builds an index of word lengths to the indices of the words with that length.
+
+    Args:
+        words (list[str]): The words to index.
+
+    Returns:
+        dict[int, list[int]]: The indices of the words of each length, in order.
+    """
+
+    index = {}
+    for i, word in enumerate(words):
+        index.setdefault(len(word), []).append(i)
+    return index
+
+
+def get_word_candidates(length: int) -> list[str]:
+    """Gets the words which could fuzzy match a word of the given length.
+
+    A word can only have a normalised Indel similarity of at least 0.8 with another word if
+    the difference in their lengths is at most a fifth of their total length, so any other
+    words can be skipped.
+
+    Args:
+        length (int): The length of the word to match.
+
+    Returns:
+        list[str]: The candidate words, in the same order as `words`.
+    """
+
+    indices = sorted(
+        i
+        for word_len, idxs in _get("word_index").items()
+        if 5 * abs(length - word_len) <= length + word_len
+        for i in idxs
+    )
+    all_words = _get("words")
+    return [all_words[i] for i in indices]
+
+
+def _dbs_exist() -> bool:
+    """Checks whether all databases exist in the current generation.
+
+    Returns:
+        bool: Whether the databases exist.
+    """
+
+    if not (_RELIC_VIEW_PATH.exists() and _SNAPSHOT_PATH.exists()):
+        return False
+    # Generations from older versions can be missing newer sections or be a different format, and the
+    # snapshot could be corrupted, all of which are rebuilt
+    try:
+        current = snapshot.Snapshot(_SNAPSHOT_PATH)
+    except (OSError, ValueError):
+        return False
+    return all(name in current for name in _SECTIONS)
+
+
+def _load_previous() -> tuple[dict, dict, dict] | None:
+    """Loads the items, relics and item relic index of the current generation.
+
+    Returns:
+        tuple[dict, dict, dict] | None: The items, relics and item relic index, or None if they don't exist.
+    """
+
+    if not _dbs_exist():
+        return None
+    current = snapshot.Snapshot(_SNAPSHOT_PATH)
+    return current.load("items"), current.load("relics"), current.load("item_relics")
+
+
+def _write_generation(files: dict[str, str], sections: dict, updated: float) -> int:
+    """Writes the given files and a snapshot as a new generation and atomically switches to it.
+
+    The generation is written to a temporary directory which is renamed into place once complete, then the
+    current generation symlink is replaced to point at it. Old generations are removed afterwards.
+
+    Args:
+        files (dict[str, str]): The content of each file by file name.
+        sections (dict): The data of each snapshot section by name.
+        updated (float): The time the data was updated.
+
+    Returns:
+        int: The new generation.
+    """
+
+    tmp_dir = Path(tempfile.mkdtemp(dir=_GENERATIONS_DIR, prefix="."))
+    for name, content in files.items():
+        (tmp_dir / name).write_text(content)
+
+    # Retry with the next generation if another process got there first
+    while True:
+        generations = [
+            int(p.name) for p in _GENERATIONS_DIR.iterdir() if p.name.isdigit()
+        ]
+        generation = max(generations, default=-1) + 1
+        # Snapshot header has the generation so write it for each attempt
+        snapshot.write(tmp_dir / _SNAPSHOT_PATH.name, updated, generation, sections)
+        try:
+            tmp_dir.rename(_GENERATIONS_DIR / str(generation))
+            break
+        except OSError:
+            continue
+
+    # Rename over the current symlink to switch atomically
+    link = _RESOURCE_DIR / f".current.{os.getpid()}"
+    link.unlink(missing_ok=True)
+    link.symlink_to(Path(_GENERATIONS_DIR.name) / str(generation))
+    os.replace(link, _CURRENT_DIR)
+
+    # Clean up old generations and leftovers from crashes
+    for path in _GENERATIONS_DIR.iterdir():
+        if path.name.isdigit():
+            if int(path.name) <= generation - _KEEP_GENERATIONS:
+                shutil.rmtree(path, ignore_errors=True)
+        elif path != tmp_dir and path.stat().st_mtime < time.time() - 3600:
+            shutil.rmtree(path, ignore_errors=True)
+
+    return generation
+
+
+def _set_dbs(sections: dict) -> None:
+    """Sets the module level databases, replacing any already loaded.
+
+    Args:
+        sections (dict): The databases by name. Any not given are loaded from the snapshot when accessed.
+    """
+
+    global _dbs
+
+    # Copy so the caller can't change the new databases after they are set
+    _dbs = dict(sections)
+
+
 def load_dbs() -> None:
-    """Loads the databases from the cache if they exist, otherwise updates them."""
-
-    if (
-        _PRICES_PATH.exists()
-        and _CHARS_PATH.exists()
-        and _ENDINGS_PATH.exists()
-        and _WORDS_PATH.exists()
-        and _RELICS_PATH.exists()
-    ):
-        global items, whitelist_chars, item_endings, words, relics
-
-        items = json.loads(_PRICES_PATH.read_text())
-        whitelist_chars = _CHARS_PATH.read_text()
-        item_endings = _ENDINGS_PATH.read_text().split()
-        words = _WORDS_PATH.read_text().split()
-        relics = json.loads(_RELICS_PATH.read_text())
+    """Loads the databases from the cache if they exist, otherwise updates them.
+
+    Only the snapshot header is read here, each database is loaded when it is first used.
+    """
+
+    global _snapshot
+
+    if _dbs_exist():
+        _snapshot = snapshot.Snapshot(_SNAPSHOT_PATH)
+        _set_dbs({})
     else:
         update_dbs()
 
 
 def update_dbs() -> bool:
-    """Updates databases if they do not exist or were last updated before the threshold interval.
+    """Updates databases if they do not exist or were last checked before the threshold interval.
+
+    Only remote data which has changed since the last check is downloaded. If nothing has changed, the
+    databases are not processed again. If the data can't be downloaded, the current databases are kept.
+
+    Raises:
+        e: The exception getting the data threw, if there are no current databases to keep.
 
     Returns:
         bool: Whether the databases were updated or not.
     """
 
     now = time.time()
-    if (
-        not (
-            _PRICES_PATH.exists()
-            and _CHARS_PATH.exists()
-            and _ENDINGS_PATH.exists()
-            and _WORDS_PATH.exists()
-            and _RELICS_PATH.exists()
-        )
-        or json.loads(_PRICES_PATH.read_text())["updated"] < now - _UPDATE_THRESHOLD
-    ):
-        # Try get price data, if unable to then exit
-        try:
-            price_data = _get_remote_data("prices")
-            filtered_items = _get_remote_data("filtered_items")
-        except Exception:
-            print("Exiting.")
-            sys.exit()
+    meta = (
+        json.loads(_REMOTE_META_PATH.read_text()) if _REMOTE_META_PATH.exists() else {}
+    )
+    if _dbs_exist() and meta.get("checked", 0) >= now - _UPDATE_THRESHOLD:
+        return False
+
+    # Only needed when updating
+    import remote
+
+    # Get changed data, if unable to then keep using the current databases
+    requests = {}
+    for data, depth in _REMOTE_DATA.items():
+        # Can't use a cached copy if it doesn't exist
+        raw_path = _REMOTE_DIR / f"{data}.json"
+        validators = meta.get(data) if raw_path.exists() else None
+        requests[data] = raw_path, validators, depth
+    try:
+        fetched = remote.fetch_all(requests)
+    except Exception:
+        if not _dbs_exist():
+            raise
+        print("Using the current databases.")
+        return False
+
+    updated = not _dbs_exist() or any(
+        value is not None for value, _ in fetched.values()
+    )
+    if updated:
+        parsed = {
+            data: (
+                value
+                if value is not None
+                else json.loads((_REMOTE_DIR / f"{data}.json").read_bytes())
+            )
+            for data, (value, _) in fetched.items()
+        }
+        price_data = parsed["prices"]
+        filtered_items = parsed["filtered_items"]
+
+        # Everything is built locally and published at once, the daemon serves requests during background updates
+        ducats = _process_items(filtered_items["eqmt"])
+        new_items, chars, endings, new_words = _process_prices(price_data, ducats)
+        new_items["updated"] = now
+        new_word_index = _build_word_index(new_words)
+
+        # Relics are the same if only the prices changed, so only reprice the affected ones
+        previous = None if fetched["filtered_items"][0] else _load_previous()
+        if previous:
+            old_items, new_relics, new_item_relics = previous
+            _reprice_relics(new_relics, new_item_relics, new_items, old_items)
         else:
-            global items, whitelist_chars, item_endings, words, relics
+            new_relics = _process_relics(filtered_items["relics"], new_items)
+            new_item_relics = _build_item_relics(new_relics)
+
+        sections = {
+            "items": new_items,
+            "whitelist_chars": chars,
+            "item_endings": endings,
+            "words": new_words,
+            "word_index": new_word_index,
+            "relics": new_relics,
+            "item_relics": new_item_relics,
+        }
+        meta["generation"] = _write_generation(
+            {
+                _RELIC_VIEW_PATH.name: json.dumps(
+                    _build_relic_view(new_relics, new_items), separators=(",", ":")
+                )
+            },
+            sections,
+            now,
+        )
+        _set_dbs(sections)
 
-            ducats = _process_items(filtered_items["eqmt"])
-            items, whitelist_chars, item_endings, words = _process_prices(
-                price_data, ducats
-            )
-            items["updated"] = now
-            relics = _process_relics(filtered_items["relics"])
+        if fetched["prices"][0] is not None:
+            # Only needed when the prices change, numpy is slow to import
+            import history
+
+            # History is extra, it mustn't stop the databases updating
+            try:
+                history.append(now, new_items)
+            except Exception as e:
+                print(f"Unable to add to the price history: {e}")
+
+    for data, (_, validators) in fetched.items():
+        meta[data] = validators
+    meta["checked"] = now
+    _write_atomic(_REMOTE_META_PATH, json.dumps(meta).encode())
+
+    return updated
+
+
+def refresh_dbs(on_update=None) -> bool:
+    """Updates the databases in the background, the current ones are used until it is done.
 
-            _PRICES_PATH.write_text(json.dumps(items))
-            _CHARS_PATH.write_text(whitelist_chars)
-            _ENDINGS_PATH.write_text("\n".join(item_endings))
-            _WORDS_PATH.write_text("\n".join(words))
-            _RELICS_PATH.write_text(json.dumps(relics))
+    Only one refresh runs at a time, refreshing while one is running does nothing.
 
-            return True
-    return False
+    Args:
+        on_update (Callable[[], None], optional): Called from the background thread if the databases were
+            updated. Defaults to None.
+
+    Returns:
+        bool: Whether there were current databases to use. If not nothing is done, use `update_dbs` instead.
+    """
+
+    if not _dbs_exist():
+        return False
+    if not _refresh_lock.acquire(blocking=False):
+        return True
+
+    def refresh() -> None:
+        try:
+            if update_dbs() and on_update:
+                on_update()
+        except Exception as e:
+            print(f"Unable to refresh databases: {e}")
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=refresh, daemon=True).start()
+    return True
 
 
-# Update dbs if called as main script otherwise load dbs
+# Update dbs if called as main script, otherwise dbs are loaded on first use
 if __name__ == "__main__":
-    updated = update_dbs()
+    try:
+        updated = update_dbs()
+    except Exception as e:
+        print(f"Unable to update databases: {type(e).__name__}: {e}")
+        print("Exiting.")
+        sys.exit(1)
     if updated:
         print("Updated databases successfully!")
     else:
         print(
-            f"Databases updated within {_UPDATE_THRESHOLD / 3600:.1f} hours. Ignoring."
+            f"Databases checked within {_UPDATE_THRESHOLD / 3600:.1f} hours or unchanged. Ignoring."
         )
-else:
-    load_dbs()
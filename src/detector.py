@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import PIL.Image as Img
+
+import frame
+import theme
+from geometry import TIME_COLOUR, get_bottom_line_box, get_size_scale, get_timer_box
+
+# Pixels (at 1080p) between samples of each region, the signature only needs rough fractions
+_LINE_STRIDE = 4
+_TIMER_STRIDE = 2
+# The bottom line is checked in bands of half a reward, so a single reward isn't lost in the whole line
+_LINE_BANDS = 8
+# Fraction of the sampled pixels of the best band which must be the primary colour of a single theme
+_MIN_TEXT_FRACTION = 0.02
+_MAX_TEXT_FRACTION = 0.5
+# Fraction of sampled timer pixels which must be digits, a bright background fills the whole region
+_MIN_TIMER_FRACTION = 0.01
+_MAX_TIMER_FRACTION = 0.5
+# Consecutive matching frames to trigger on, so a single odd frame doesn't cause a parse
+_MIN_MATCHES = int(os.environ.get("WFINFO_DETECT_MIN_MATCHES", 2))
+# Consecutive non matching frames after a trigger before the next reward screen can trigger
+_RESET_FRAMES = 5
+# Frames per second the signature check should manage on one core at 4K, checked by `bench/detector.py`
+TARGET_FPS = 500
+
+# Primary colour bounds of every theme, (themes, 3)
+_PRIMARY_LOWER, _PRIMARY_UPPER = theme.get_primary_bounds()
+
+
+def _sample(
+    array: np.ndarray, box: tuple[float, float, float, float], stride: int
+) -> np.ndarray:
+    left, top, right, bottom = (round(x) for x in box)
+    return array[top:bottom:stride, left:right:stride].reshape(-1, 3)
+
+
+def check_frame(array: np.ndarray) -> bool:
+    """Checks whether a frame looks like a reward screen.
+
+    This is a cheap signature of the screen, not a parse. A band of a strided sample of the bottom line of
+    rewards must have some but not too many pixels in the primary colour of one theme (the active theme,
+    which may be custom, is included), and a sample of the timer must have some but not too many white digit
+    pixels.
+
+    Args:
+        array (np.ndarray): The RGB pixels of the frame, (height, width, 3).
+
+    Returns:
+        bool: If the frame matches the signature.
+    """
+
+    height, width = array.shape[:2]
+    scale = get_size_scale(width, height)
+
+    timer = _sample(
+        array,
+        get_timer_box(width, height, scale),
+        max(round(_TIMER_STRIDE * scale), 1),
+    )
+    digits = np.count_nonzero((timer >= TIME_COLOUR).all(axis=1)) / len(timer)
+    if not _MIN_TIMER_FRACTION <= digits <= _MAX_TIMER_FRACTION:
+        return False
+
+    left, top, right, bottom = (
+        round(x) for x in get_bottom_line_box(width, height, scale)
+    )
+    stride = max(round(_LINE_STRIDE * scale), 1)
+    line = array[top:bottom:stride, left:right:stride]
+    # Whole bands only, so each has the same number of samples
+    rows, cols = line.shape[:2]
+    cols -= cols % _LINE_BANDS
+    line = line[:, :cols]
+
+    lower, upper = theme.get_bounds(theme.active_theme)
+    lower = np.concatenate((_PRIMARY_LOWER, lower[:1]))
+    upper = np.concatenate((_PRIMARY_UPPER, upper[:1]))
+    in_range = ((line[..., None, :] >= lower) & (line[..., None, :] <= upper)).all(
+        axis=-1
+    )
+    # Fraction of each band in each theme, (bands, themes)
+    bands = in_range.reshape(rows, _LINE_BANDS, -1, len(lower)).mean(axis=(0, 2))
+    text = bands.max()
+    return _MIN_TEXT_FRACTION <= text <= _MAX_TEXT_FRACTION
+
+
+def detect(frames):
+    """Finds reward screens in a sequence of frames.
+
+    A reward screen triggers once when `_MIN_MATCHES` consecutive frames match the signature, then can't
+    trigger again until `_RESET_FRAMES` consecutive frames don't match.
+
+    Args:
+        frames (Iterable[np.ndarray]): The RGB pixels of each frame.
+
+    Yields:
+        tuple[int, np.ndarray]: The index and pixels of each frame which triggered.
+    """
+
+    matches = 0
+    misses = _RESET_FRAMES
+    for index, array in enumerate(frames):
+        if check_frame(array):
+            matches += 1
+            if misses >= _RESET_FRAMES and matches >= _MIN_MATCHES:
+                misses = 0
+                yield index, array
+        else:
+            matches = 0
+            misses += 1
+
+
+def _natural_key(path: Path) -> list:
+    return [int(s) if s.isdigit() else s for s in re.split(r"(\d+)", path.name)]
+
+
+def read_frames(source: str):
+    """Reads frames from a directory of images, a stream of PPMs on stdin, or a FIFO or file of PPMs.
+
+    Args:
+        source (str): The directory (read in natural order), file or FIFO, or "-" for stdin.
+
+    Yields:
+        np.ndarray: The RGB pixels of each frame.
+    """
+
+    if source == "-":
+        yield from frame.read_ppm_stream(sys.stdin.buffer)
+    elif os.path.isdir(source):
+        for path in sorted(Path(source).iterdir(), key=_natural_key):
+            if path.suffix.lower() in (".ppm", ".png", ".jpg", ".jpeg"):
+                yield frame.open_array(str(path))
+    else:
+        with open(source, "rb") as file:
+            yield from frame.read_ppm_stream(file)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        description="Watch a stream of frames for reward screens. Prints a JSON event per reward screen."
+    )
+    arg_parser.add_argument(
+        "source", help="directory of frames, file or FIFO of PPMs, or - for stdin"
+    )
+    arg_parser.add_argument(
+        "--no-parse",
+        action="store_true",
+        help="only report which frames triggered, without parsing them",
+    )
+    args = arg_parser.parse_args()
+
+    if not args.no_parse:
+        import parser
+
+        parser.init_tess()
+
+    count = 0
+    start = time.perf_counter()
+
+    def counted(frames):
+        global count
+        for count, array in enumerate(frames, 1):
+            yield array
+
+    for index, array in detect(counted(read_frames(args.source))):
+        event = {"frame": index, "time": time.time()}
+        if not args.no_parse:
+            event.update(parser.analyze(Img.fromarray(array)))
+        print(json.dumps(event), flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count} frames in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f} fps)",
+        file=sys.stderr,
+    )
@@ -0,0 +1,239 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+import PIL.Image as Img
+from PIL import ImageDraw, ImageFont
+from platformdirs import user_cache_path
+
+# Digits read from the game's font by the Tesseract fallback, used as templates before the rendered ones
+_LEARNED_PATH = user_cache_path("wfinfo") / "digit_templates.npz"
+# Size glyphs are normalised to, glyphs are scaled to the height and centred horizontally
+_GLYPH_HEIGHT = 32
+_GLYPH_WIDTH = 24
+# Radius of the box blur of normalised glyphs
+_BLUR_RADIUS = 2
+# Font size to render the initial templates at, they are normalised so only needs to be big enough
+_RENDER_SIZE = 48
+# Brightness anti-aliased edges of the rendered digits must have to be kept, same as the timer colour
+_RENDER_THRESHOLD = 235
+# Min correlation of every glyph with its best digit, and min lead over the next best digit
+_MIN_CORRELATION = 0.75
+_MIN_MARGIN = 0.1
+# Glyphs shorter than this fraction of the tallest are noise
+_MIN_GLYPH_HEIGHT = 0.5
+# The timer never has more digits than this
+_MAX_DIGITS = 2
+
+_lock = threading.Lock()
+# Normalised templates, (templates, height * width), and the digit of each
+_templates = None
+_labels = None
+# Digit to its normalised template learned from the game
+_learned = None
+
+
+def _normalise(glyph: np.ndarray) -> np.ndarray | None:
+    """Normalises a glyph for correlation.
+
+    The glyph is scaled to the glyph height keeping its aspect ratio, centred in the glyph size, then made zero
+    mean and unit length so the dot product of two glyphs is their correlation.
+
+    Args:
+        glyph (np.ndarray): The boolean mask of the glyph, trimmed to it.
+
+    Returns:
+        np.ndarray | None: The normalised glyph, flattened, or None if it is blank or solid.
+    """
+
+    height, width = glyph.shape
+    new_width = min(max(round(width * _GLYPH_HEIGHT / height), 1), _GLYPH_WIDTH)
+    # Area average when shrinking so thin strokes aren't skipped
+    image = Img.fromarray(glyph.astype(np.uint8) * 255).resize(
+        (new_width, _GLYPH_HEIGHT),
+        Img.Resampling.BOX if height > _GLYPH_HEIGHT else Img.Resampling.BILINEAR,
+    )
+
+    canvas = np.zeros((_GLYPH_HEIGHT, _GLYPH_WIDTH), dtype=np.float32)
+    left = (_GLYPH_WIDTH - new_width) // 2
+    canvas[:, left : left + new_width] = np.asarray(image, dtype=np.float32) / 255
+
+    # Blur so slightly different stroke widths and positions still correlate
+    size = _BLUR_RADIUS * 2 + 1
+    padded = np.pad(canvas, _BLUR_RADIUS)
+    canvas = sum(
+        padded[y : y + _GLYPH_HEIGHT, x : x + _GLYPH_WIDTH]
+        for y in range(size)
+        for x in range(size)
+    )
+    vector = canvas.ravel() - canvas.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def split_glyphs(mask: np.ndarray) -> list[np.ndarray]:
+    """Splits the digits in a timer mask into glyphs.
+
+    Glyphs are the runs of columns with text pixels, trimmed to their rows with text pixels.
+
+    Args:
+        mask (np.ndarray): The boolean mask of the timer digits.
+
+    Returns:
+        list[np.ndarray]: The mask of each glyph, from left to right.
+    """
+
+    columns = np.concatenate(([0], mask.any(axis=0).view(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(columns))
+
+    glyphs = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        glyph = mask[:, start:end]
+        rows = np.flatnonzero(glyph.any(axis=1))
+        glyphs.append(glyph[rows[0] : rows[-1] + 1])
+
+    if not glyphs:
+        return []
+    tallest = max(glyph.shape[0] for glyph in glyphs)
+    return [g for g in glyphs if g.shape[0] >= tallest * _MIN_GLYPH_HEIGHT]
+
+
+def _render_templates() -> dict[int, np.ndarray]:
+    """Renders a template of each digit with the default font.
+
+    Returns:
+        dict[int, np.ndarray]: Each digit and its normalised template.
+    """
+
+    font = ImageFont.load_default(_RENDER_SIZE)
+    templates = {}
+    for digit in range(10):
+        image = Img.new("L", (_RENDER_SIZE * 2, _RENDER_SIZE * 2))
+        ImageDraw.Draw(image).text(
+            (_RENDER_SIZE, _RENDER_SIZE), str(digit), fill=255, font=font, anchor="mm"
+        )
+        glyphs = split_glyphs(np.asarray(image) >= _RENDER_THRESHOLD)
+        templates[digit] = _normalise(glyphs[0])
+    return templates
+
+
+def _load_learned() -> dict[int, np.ndarray]:
+    try:
+        with np.load(_LEARNED_PATH) as data:
+            if data["templates"].shape[1:] == (_GLYPH_HEIGHT * _GLYPH_WIDTH,):
+                return dict(zip(data["labels"].tolist(), data["templates"]))
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _get_templates() -> tuple[np.ndarray, np.ndarray]:
+    """Gets the templates, building them if needed. Must be called with the lock held.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The templates and the digit of each.
+    """
+
+    global _templates, _labels, _learned
+
+    if _templates is None:
+        if _learned is None:
+            _learned = _load_learned()
+        templates = list(_render_templates().items()) + list(_learned.items())
+        _labels = np.array([digit for digit, _ in templates])
+        _templates = np.stack([template for _, template in templates])
+    return _templates, _labels
+
+
+def read(mask: np.ndarray, confident: bool = True) -> int | None:
+    """Reads the time left from a timer mask by matching its glyphs against the digit templates.
+
+    All glyphs are correlated with all templates at once. Every glyph must match a digit confidently,
+    otherwise nothing is read so the caller can fall back to OCR.
+
+    Args:
+        mask (np.ndarray): The boolean mask of the timer digits.
+        confident (bool, optional): Whether every glyph must match confidently. Defaults to True, otherwise
+            the closest digit of each glyph is read, e.g. to check a read by other means.
+
+    Returns:
+        int | None: The time left, or None if not confident.
+    """
+
+    glyphs = split_glyphs(mask)
+    if not 1 <= len(glyphs) <= _MAX_DIGITS:
+        return None
+    vectors = [_normalise(glyph) for glyph in glyphs]
+    if any(vector is None for vector in vectors):
+        return None
+
+    with _lock:
+        templates, labels = _get_templates()
+    scores = np.stack(vectors) @ templates.T
+
+    # Best score of each digit for each glyph, (glyphs, 10)
+    digit_scores = np.full((len(glyphs), 10), -1, dtype=scores.dtype)
+    for digit in range(10):
+        matches = scores[:, labels == digit]
+        if matches.size:
+            digit_scores[:, digit] = matches.max(axis=1)
+
+    ranked = np.sort(digit_scores, axis=1)
+    if confident and (
+        (ranked[:, -1] < _MIN_CORRELATION).any()
+        or (ranked[:, -1] - ranked[:, -2] < _MIN_MARGIN).any()
+    ):
+        return None
+
+    return int("".join(str(digit) for digit in digit_scores.argmax(axis=1)))
+
+
+def learn(mask: np.ndarray, time_left: int) -> None:
+    """Learns the digit templates of the game's font from a timer read by other means.
+
+    Only one template is kept for each digit, the latest. The timer must be read reliably as the templates
+    are saved and matched confidently from then on, see `reset` if they are wrong.
+
+    Args:
+        mask (np.ndarray): The boolean mask of the timer digits.
+        time_left (int): The time left the timer was read as.
+    """
+
+    global _templates, _learned
+
+    glyphs = split_glyphs(mask)
+    if len(glyphs) != len(str(time_left)):
+        return
+
+    with _lock:
+        if _learned is None:
+            _learned = _load_learned()
+        for glyph, digit in zip(glyphs, str(time_left)):
+            vector = _normalise(glyph)
+            if vector is not None:
+                _learned[int(digit)] = vector
+        _templates = None
+        learned = dict(_learned)
+
+    _LEARNED_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=_LEARNED_PATH.parent, suffix=".npz", delete=False
+    ) as file:
+        np.savez(
+            file,
+            labels=np.array(list(learned)),
+            templates=np.stack(list(learned.values())),
+        )
+    os.replace(file.name, _LEARNED_PATH)
+
+
+def reset() -> None:
+    """Forgets the learned digit templates, so only the rendered ones are used until more are learned."""
+
+    global _templates, _learned
+
+    with _lock:
+        _learned = {}
+        _templates = None
+        _LEARNED_PATH.unlink(missing_ok=True)
@@ -0,0 +1,202 @@
+import mmap
+import os
+
+import numpy as np
+import PIL.Image as Img
+from PIL.Image import Image
+
+import tracing
+
+_PPM_MAGIC = b"P6"
+
+# Last opened frame and the stat of its file, so each screenshot is only decoded once
+_last_key = None
+_last_image = None
+
+
+def _ppm_array(buffer) -> np.ndarray:
+    """Wraps the pixels of a binary PPM (e.g. from `grim -t ppm`) in the given buffer without copying them.
+
+    Args:
+        buffer (Buffer): The buffer containing the PPM.
+
+    Raises:
+        ValueError: If the buffer is not an 8 bit binary PPM.
+
+    Returns:
+        np.ndarray: The pixels, (height, width, 3). The array is a view into the buffer.
+    """
+
+    if buffer[:2] != _PPM_MAGIC:
+        raise ValueError("Not a binary PPM")
+
+    # Header is the magic, width, height and max value separated by whitespace, with optional comments
+    fields = []
+    pos = 2
+    while len(fields) < 3:
+        while buffer[pos : pos + 1].isspace():
+            pos += 1
+        if buffer[pos : pos + 1] == b"#":
+            while buffer[pos : pos + 1] not in (b"\n", b""):
+                pos += 1
+            continue
+        start = pos
+        while buffer[pos : pos + 1].isdigit():
+            pos += 1
+        if start == pos:
+            raise ValueError("Invalid PPM header")
+        fields.append(int(buffer[start:pos]))
+    # Single whitespace char before the pixels
+    pos += 1
+
+    width, height, max_value = fields
+    if max_value != 255:
+        raise ValueError(f"Unsupported PPM max value: {max_value}")
+
+    return np.frombuffer(buffer, np.uint8, width * height * 3, pos).reshape(
+        height, width, 3
+    )
+
+
+def from_ppm(data: bytes) -> Image:
+    """Decodes a binary PPM, e.g. read from `grim -t ppm -` on stdin.
+
+    Args:
+        data (bytes): The PPM.
+
+    Returns:
+        Image: The image as RGB.
+    """
+
+    return Img.fromarray(_ppm_array(data))
+
+
+def _read_ppm_header(stream) -> tuple[int, int] | None:
+    """Reads the header of the next binary PPM in a stream of them.
+
+    Args:
+        stream (BinaryIO): The stream, positioned at the start of a PPM.
+
+    Raises:
+        ValueError: If the stream does not contain an 8 bit binary PPM.
+
+    Returns:
+        tuple[int, int] | None: The width and height, or None if the stream has ended.
+    """
+
+    magic = stream.read(2)
+    if not magic:
+        return None
+    if magic != _PPM_MAGIC:
+        raise ValueError("Not a binary PPM")
+
+    # Same header as `_ppm_array`, the whitespace after the last field is the single one before the pixels
+    fields = []
+    token = b""
+    while len(fields) < 3:
+        char = stream.read(1)
+        if not char:
+            raise ValueError("Truncated PPM header")
+        if char.isdigit():
+            token += char
+        elif char.isspace():
+            if token:
+                fields.append(int(token))
+                token = b""
+        elif char == b"#" and not token:
+            stream.readline()
+        else:
+            raise ValueError("Invalid PPM header")
+
+    width, height, max_value = fields
+    if max_value != 255:
+        raise ValueError(f"Unsupported PPM max value: {max_value}")
+    return width, height
+
+
+def read_ppm_stream(stream):
+    """Reads consecutive binary PPMs from a stream, e.g. stdin or a FIFO fed by a screen recorder.
+
+    Args:
+        stream (BinaryIO): The stream to read from.
+
+    Raises:
+        ValueError: If the stream contains something other than 8 bit binary PPMs.
+
+    Yields:
+        np.ndarray: The pixels of each frame, (height, width, 3). A truncated last frame is dropped.
+    """
+
+    while (size := _read_ppm_header(stream)) is not None:
+        width, height = size
+        data = stream.read(width * height * 3)
+        if len(data) < width * height * 3:
+            return
+        yield np.frombuffer(data, np.uint8).reshape(height, width, 3)
+
+
+def open_array(path: str) -> np.ndarray:
+    """Opens the image at the given path as an array of RGB pixels.
+
+    PPMs are memory mapped without copying, so only the pages which are read are loaded. The map is closed
+    when the array is no longer used.
+
+    Args:
+        path (str): The path to the image.
+
+    Returns:
+        np.ndarray: The pixels, (height, width, 3). It must not be modified.
+    """
+
+    with open(path, "rb") as file:
+        if file.read(2) == _PPM_MAGIC:
+            return _ppm_array(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    return np.asarray(_open(path))
+
+
+def _open(path: str) -> Image:
+    """Opens the image at the given path as RGB.
+
+    PPMs (including ones in shared memory or a memfd, e.g. `/proc/<pid>/fd/<fd>`) are memory mapped and
+    copied straight into the image, anything else is decoded by PIL.
+
+    Args:
+        path (str): The path to the image.
+
+    Returns:
+        Image: The image as RGB.
+    """
+
+    with open(path, "rb") as file:
+        if file.read(2) == _PPM_MAGIC:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                pixels = _ppm_array(buffer)
+                image = Img.fromarray(pixels)
+                # Release the view so the map can be closed
+                del pixels
+            return image
+
+    with Img.open(path) as image:
+        return image.convert("RGB")
+
+
+def open_frame(path: str) -> Image:
+    """Opens the frame at the given path as RGB, reusing the last frame if the file hasn't changed.
+
+    Args:
+        path (str): The path to the frame, which can be a PNG or a PPM.
+
+    Returns:
+        Image: The frame. It is shared between calls so must not be modified.
+    """
+
+    global _last_key, _last_image
+
+    stat = os.stat(path)
+    key = path, stat.st_ino, stat.st_size, stat.st_mtime_ns
+    if key != _last_key:
+        with tracing.span("decode"):
+            _last_image = _open(path)
+        _last_key = key
+    return _last_image
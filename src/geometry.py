@@ -0,0 +1,137 @@
+from PIL.Image import Image
+
+# Sizes at 1080p, multiply by the scale for the real size
+REWARD_WIDTH = 242  # Per player
+REWARD_TOTAL_WIDTH = REWARD_WIDTH * 4
+REWARD_BOTTOM = 80  # center - bottom = real bottom
+LINE_HEIGHT = 24
+REWARD_HEIGHT = LINE_HEIGHT * 3  # Height of 3 lines
+TIME_SIZE = 54
+TIME_TOP = 400  # center - top = real top
+
+# Min value of every channel of the pixels of the timer digits, shared by everything reading the timer
+TIME_COLOUR = 235
+
+
+def get_scale(image: Image) -> float:
+    """Calculates the scale of the image based on its dimensions.
+
+    Args:
+        image (Image): The image to calculate scale for.
+
+    Returns:
+        float: The scale.
+    """
+
+    return get_size_scale(image.width, image.height)
+
+
+def get_size_scale(width: int, height: int) -> float:
+    """Calculates the scale of an image with the given dimensions.
+
+    Args:
+        width (int): The width of the image.
+        height (int): The height of the image.
+
+    Returns:
+        float: The scale.
+    """
+
+    return height / 1080 if width / height > 16 / 9 else width / 1920
+
+
+def cut_image(image: Image, num_rewards: int, scale: float = None) -> list[Image]:
+    """Cuts the given image into sections for each reward based on the number of rewards.
+
+    Args:
+        image (Image): The image to cut.
+        num_rewards (int): The number of rewards.
+        scale (float, optional): The scale of the image if already known. Defaults to None to calculate it.
+
+    Returns:
+        list[Image]: The images of each reward name.
+    """
+
+    if scale is None:
+        scale = get_scale(image)
+    width = REWARD_WIDTH * scale
+    left = (image.width - width * num_rewards) / 2
+    bottom = image.height / 2 - REWARD_BOTTOM * scale
+    top = bottom - REWARD_HEIGHT * scale
+    return [
+        image.crop((left + width * i, top, left + width * (i + 1), bottom))
+        for i in range(num_rewards)
+    ]
+
+
+def get_bottom_line_rewards(image: Image, scale: float = None) -> Image:
+    """Crops the given image to the bottom line of the reward names of all 4 reward slots.
+
+    Args:
+        image (Image): The image to crop.
+        scale (float, optional): The scale of the image if already known. Defaults to None to calculate it.
+
+    Returns:
+        Image: The bottom line of rewards.
+    """
+
+    if scale is None:
+        scale = get_scale(image)
+    return image.crop(get_bottom_line_box(image.width, image.height, scale))
+
+
+def get_bottom_line_box(
+    width: int, height: int, scale: float
+) -> tuple[float, float, float, float]:
+    """Gets the box of the bottom line of the reward names of all 4 reward slots.
+
+    Args:
+        width (int): The width of the image.
+        height (int): The height of the image.
+        scale (float): The scale of the image.
+
+    Returns:
+        tuple[float, float, float, float]: The left, top, right and bottom of the box.
+    """
+
+    line_width = REWARD_TOTAL_WIDTH * scale
+    left = (width - line_width) / 2
+    bottom = height / 2 - REWARD_BOTTOM * scale
+    top = bottom - LINE_HEIGHT * scale
+    return left, top, left + line_width, bottom
+
+
+def get_timer(image: Image, scale: float = None) -> Image:
+    """Crops the given image to the reward choice timer.
+
+    Args:
+        image (Image): The image to crop.
+        scale (float, optional): The scale of the image if already known. Defaults to None to calculate it.
+
+    Returns:
+        Image: The timer.
+    """
+
+    if scale is None:
+        scale = get_scale(image)
+    return image.crop(get_timer_box(image.width, image.height, scale))
+
+
+def get_timer_box(
+    width: int, height: int, scale: float
+) -> tuple[float, float, float, float]:
+    """Gets the box of the reward choice timer.
+
+    Args:
+        width (int): The width of the image.
+        height (int): The height of the image.
+        scale (float): The scale of the image.
+
+    Returns:
+        tuple[float, float, float, float]: The left, top, right and bottom of the box.
+    """
+
+    size = TIME_SIZE * scale
+    left = (width - size) / 2
+    top = height / 2 - TIME_TOP * scale
+    return left, top, left + size, top + size
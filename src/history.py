@@ -0,0 +1,350 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from platformdirs import user_cache_path
+
+# Price history of every item, one row per database update with a column per item
+# Recent rows are appended to the head as raw columns, older rows are downsampled to a row per day and kept
+# in a segment of .npy columns per year
+_HISTORY_DIR = user_cache_path("wfinfo") / "history"
+# Item names, the column of each item is its index
+_IDS_PATH = _HISTORY_DIR / "items.json"
+_HEAD_PATH = _HISTORY_DIR / "head.json"  # Width of the head columns
+# Days of updates kept at full resolution before being downsampled
+_RAW_DAYS = 30
+_DAY = 86400
+
+# Column name to dtype and missing value, times are per row and the rest per row and item
+# Half precision is plenty for average prices and volumes are capped, so years stay in a few MB
+_TIMES = "times"
+_COLUMNS = {
+    "platinum": (np.float16, np.nan),
+    "today": (np.uint16, 0),
+    "yesterday": (np.uint16, 0),
+}
+_MAX_VOLUME = np.iinfo(np.uint16).max
+
+
+def _write_atomic(path: Path, write) -> None:
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        write(file)
+    os.replace(file.name, path)
+
+
+def _load_ids() -> list[str]:
+    try:
+        return json.loads(_IDS_PATH.read_text())
+    except FileNotFoundError:
+        return []
+
+
+def _head_width() -> int:
+    try:
+        return json.loads(_HEAD_PATH.read_text())["width"]
+    except FileNotFoundError:
+        return 0
+
+
+def _column_path(segment: str, column: str, raw: bool = False) -> Path:
+    return _HISTORY_DIR / f"{segment}.{column}.{'bin' if raw else 'npy'}"
+
+
+def _load_head() -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Loads the rows of the head.
+
+    Rows are appended to each column file separately, so a crash can leave some columns a row longer. Only
+    rows which are in every column are loaded.
+
+    Returns:
+        tuple[np.ndarray, dict[str, np.ndarray]]: The time of each row and each column, (rows, width).
+            Columns are memory mapped.
+    """
+
+    width = _head_width()
+    if not width or not _column_path("head", _TIMES, raw=True).exists():
+        return np.empty(0), {
+            name: np.empty((0, width), dtype) for name, (dtype, _) in _COLUMNS.items()
+        }
+
+    times = np.fromfile(_column_path("head", _TIMES, raw=True), np.float64)
+    columns = {}
+    for name, (dtype, _) in _COLUMNS.items():
+        path = _column_path("head", name, raw=True)
+        rows = path.stat().st_size // (np.dtype(dtype).itemsize * width)
+        # Empty once everything is compacted, and empty files can't be mapped
+        columns[name] = (
+            np.memmap(path, dtype, "r", shape=(rows, width))
+            if rows
+            else np.empty((0, width), dtype)
+        )
+    rows = min(len(times), *(len(column) for column in columns.values()))
+    return times[:rows], {name: column[:rows] for name, column in columns.items()}
+
+
+def _write_head(times: np.ndarray, columns: dict[str, np.ndarray]) -> None:
+    """Replaces the head with the given rows.
+
+    Args:
+        times (np.ndarray): The time of each row.
+        columns (dict[str, np.ndarray]): Each column, (rows, width).
+    """
+
+    width = next(iter(columns.values())).shape[1]
+    _write_atomic(_column_path("head", _TIMES, raw=True), times.tofile)
+    for name, column in columns.items():
+        _write_atomic(
+            _column_path("head", name, raw=True), np.ascontiguousarray(column).tofile
+        )
+    _write_atomic(
+        _HEAD_PATH, lambda file: file.write(json.dumps({"width": width}).encode())
+    )
+
+
+def _pad(column: np.ndarray, width: int, missing) -> np.ndarray:
+    """Pads a column with missing values up to the given width, for items added after it was written."""
+
+    if column.shape[1] >= width:
+        return column
+    padding = np.full((len(column), width - column.shape[1]), missing, column.dtype)
+    return np.concatenate((column, padding), axis=1)
+
+
+def _segments() -> list[str]:
+    """Gets the names of the daily segments, oldest first."""
+
+    return sorted(
+        path.name.split(".")[0] for path in _HISTORY_DIR.glob(f"*.{_TIMES}.npy")
+    )
+
+
+def _load_segment(segment: str) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    return np.load(_column_path(segment, _TIMES)), {
+        name: np.load(_column_path(segment, name), mmap_mode="r") for name in _COLUMNS
+    }
+
+
+def _downsample(
+    times: np.ndarray, columns: dict[str, np.ndarray]
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Downsamples rows to a row per day.
+
+    The price of a day is the mean of its prices, today's volume is the highest of the day (the volume so far
+    that day) and yesterday's volume is the last of the day.
+
+    Args:
+        times (np.ndarray): The time of each row, ascending.
+        columns (dict[str, np.ndarray]): Each column, (rows, width).
+
+    Returns:
+        tuple[np.ndarray, dict[str, np.ndarray]]: The start of each day and each downsampled column.
+    """
+
+    days, starts = np.unique(times // _DAY, return_index=True)
+    ends = np.append(starts[1:], len(times))
+
+    platinum = columns["platinum"].astype(np.float32)
+    # Mean ignoring missing prices, all missing stays missing
+    present = ~np.isnan(platinum)
+    sums = np.add.reduceat(np.where(present, platinum, 0), starts)
+    counts = np.add.reduceat(present.astype(np.int32), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+
+    return days * _DAY, {
+        "platinum": means.astype(np.float16),
+        "today": np.maximum.reduceat(columns["today"], starts),
+        "yesterday": columns["yesterday"][ends - 1],
+    }
+
+
+def _compact(now: float) -> None:
+    """Moves rows of the head older than the raw days into the daily segment of their year.
+
+    Args:
+        now (float): The current time.
+    """
+
+    times, columns = _load_head()
+    # Whole days only, so a day is never split between the head and a segment
+    cutoff = (now - _RAW_DAYS * _DAY) // _DAY * _DAY
+    old = np.searchsorted(times, cutoff)
+    if not old:
+        return
+
+    days, daily = _downsample(times[:old], {n: c[:old] for n, c in columns.items()})
+    years = np.array([time.gmtime(day).tm_year for day in days])
+    for year in np.unique(years):
+        rows = years == year
+        segment = f"daily-{year}"
+        new_times, new_columns = days[rows], {n: c[rows] for n, c in daily.items()}
+
+        if _column_path(segment, _TIMES).exists():
+            old_times, old_columns = _load_segment(segment)
+            # A day can only be compacted once, but keep the newest if it somehow was again
+            keep = old_times < new_times[0]
+            width = max(
+                old_columns["platinum"].shape[1], new_columns["platinum"].shape[1]
+            )
+            new_times = np.concatenate((old_times[keep], new_times))
+            new_columns = {
+                name: np.concatenate(
+                    (
+                        _pad(old_columns[name][keep], width, missing),
+                        _pad(new_columns[name], width, missing),
+                    )
+                )
+                for name, (_, missing) in _COLUMNS.items()
+            }
+
+        # Times last, they are what marks the segment as existing
+        for name, column in new_columns.items():
+            _write_atomic(
+                _column_path(segment, name), lambda file: np.save(file, column)
+            )
+        _write_atomic(
+            _column_path(segment, _TIMES), lambda file: np.save(file, new_times)
+        )
+
+    _write_head(times[old:], {name: column[old:] for name, column in columns.items()})
+
+
+def append(updated: float, items: dict[str, dict]) -> None:
+    """Appends the prices and volumes of every item to the history.
+
+    Rows older than the raw days are compacted into the daily segments first.
+
+    Args:
+        updated (float): The time the prices were updated.
+        items (dict[str, dict]): The processed items, as in `database.items`.
+    """
+
+    _HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+
+    ids = _load_ids()
+    index = {name: i for i, name in enumerate(ids)}
+    new = [name for name in items if name != "updated" and name not in index]
+    if new:
+        ids += new
+        index.update((name, i) for i, name in enumerate(new, len(index)))
+        _write_atomic(_IDS_PATH, lambda file: file.write(json.dumps(ids).encode()))
+
+    _compact(updated)
+
+    # Widen the head if there are new items
+    width = _head_width()
+    if len(ids) > width:
+        times, columns = _load_head()
+        width = len(ids)
+        _write_head(
+            times,
+            {
+                name: _pad(np.asarray(columns[name]), width, missing)
+                for name, (_, missing) in _COLUMNS.items()
+            },
+        )
+
+    row = {
+        name: np.full(width, missing, dtype)
+        for name, (dtype, missing) in _COLUMNS.items()
+    }
+    for name, item in items.items():
+        if name == "updated":
+            continue
+        i = index[name]
+        row["platinum"][i] = item["price"]["platinum"]
+        row["today"][i] = min(item["sold"]["today"], _MAX_VOLUME)
+        row["yesterday"][i] = min(item["sold"]["yesterday"], _MAX_VOLUME)
+
+    # Columns before times, a row only counts once it is in every column
+    for name, column in row.items():
+        with open(_column_path("head", name, raw=True), "ab") as file:
+            column.tofile(file)
+    with open(_column_path("head", _TIMES, raw=True), "ab") as file:
+        np.array([updated], np.float64).tofile(file)
+
+
+def query(names: list[str], start: float, end: float = None) -> dict:
+    """Gets the history of the given items between two times.
+
+    The daily segments and head are sorted by time, so only the rows in range of the items asked for are
+    read.
+
+    Args:
+        names (list[str]): The item names.
+        start (float): The earliest time to get.
+        end (float, optional): The latest time to get. Defaults to None for now.
+
+    Returns:
+        dict: "times" of each row, then each column of "platinum", "today" and "yesterday" as arrays of
+            (rows, items). Downsampled rows are at the start of their day. Prices are NaN where unknown,
+            including every row of items with no history.
+    """
+
+    if end is None:
+        end = time.time()
+    index = {name: i for i, name in enumerate(_load_ids())}
+    # Items with no history are all missing
+    ids = np.array([index.get(name, -1) for name in names], dtype=np.intp)
+
+    parts = [_load_segment(segment) for segment in _segments()]
+    parts.append(_load_head())
+
+    result = {_TIMES: []} | {name: [] for name in _COLUMNS}
+    for times, columns in parts:
+        first = np.searchsorted(times, start, side="left")
+        last = np.searchsorted(times, end, side="right")
+        if first >= last:
+            continue
+        result[_TIMES].append(times[first:last])
+        for name, (_, missing) in _COLUMNS.items():
+            column = columns[name]
+            # Items added after the part was written have no values in it
+            known = (ids >= 0) & (ids < column.shape[1])
+            values = np.full((last - first, len(ids)), missing, column.dtype)
+            values[:, known] = column[first:last, ids[known]]
+            result[name].append(values)
+
+    return {
+        _TIMES: np.concatenate(result[_TIMES]) if result[_TIMES] else np.empty(0),
+        **{
+            name: (
+                np.concatenate(result[name])
+                if result[name]
+                else np.empty((0, len(ids)), dtype)
+            )
+            for name, (dtype, _) in _COLUMNS.items()
+        },
+    }
+
+
+def trend(names: list[str], days: float = 7) -> dict:
+    """Gets the price and volume trend of the given items over the last days, e.g. for the rewards on screen.
+
+    Args:
+        names (list[str]): The item names.
+        days (float, optional): The number of days. Defaults to 7.
+
+    Returns:
+        dict: "times" of each update, then for each item its "platinum" price (None where unknown) and
+            "today" and "yesterday" volumes at each time.
+    """
+
+    history = query(names, time.time() - days * _DAY)
+    return {
+        _TIMES: history[_TIMES].tolist(),
+        "items": {
+            name: {
+                "platinum": [
+                    None if np.isnan(p) else round(float(p), 1)
+                    for p in history["platinum"][:, i]
+                ],
+                "today": history["today"][:, i].tolist(),
+                "yesterday": history["yesterday"][:, i].tolist(),
+            }
+            for i, name in enumerate(names)
+        },
+    }
@@ -0,0 +1,217 @@
+import ctypes
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+# Lines in EE.log which mean a reward screen is showing, one screen usually logs several of them
+MARKERS = (
+    "Pause countdown done",
+    "Got rewards",
+    "Created /Lotus/Interface/ProjectionRewardChoice.swf",
+)
+
+# Markers within this many seconds of a trigger are the same reward screen and are merged into it
+_WINDOW = 2
+# No new trigger for this many seconds after one, reward screens are never this close together
+_COOLDOWN = 15
+# Seconds between checks of the file without inotify events, for when inotify is unavailable or missed
+_POLL_INTERVAL = 1
+_READ_SIZE = 1 << 16
+
+# From sys/inotify.h
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(directory: str) -> int | None:
+    """Watches the given directory for changes to the files in it with inotify.
+
+    The directory is watched rather than the file so it can be followed when replaced.
+
+    Args:
+        directory (str): The directory to watch.
+
+    Returns:
+        int | None: The inotify file descriptor to read events from, or None if inotify is unavailable.
+    """
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+
+    mask = (
+        _IN_MODIFY
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+    )
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _read_inotify(fd: int, name: bytes) -> bool:
+    """Reads the pending inotify events and checks if any are for the given file.
+
+    Args:
+        fd (int): The inotify file descriptor.
+        name (bytes): The name of the file in the watched directory.
+
+    Returns:
+        bool: If any event was for the file.
+    """
+
+    changed = False
+    while True:
+        try:
+            buffer = os.read(fd, _READ_SIZE)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(buffer):
+            _, _, _, length = _EVENT.unpack_from(buffer, pos)
+            pos += _EVENT.size
+            changed |= buffer[pos : pos + length].rstrip(b"\0") == name
+            pos += length
+
+
+def follow(path: str):
+    """Follows the lines appended to a file, like `tail -F` from the current end of the file.
+
+    Only the bytes added since the last read are read. If the file is truncated it is read again from the
+    start, and if it is replaced (e.g. the game restarting and creating a new log) the new file is read from
+    the start.
+
+    Args:
+        path (str): The file to follow. It doesn't have to exist yet.
+
+    Yields:
+        tuple[str, str]: ("line", the line) for each complete line, or ("reset", "truncated" or "rotated")
+            when the file is read again from the start.
+    """
+
+    directory, name = os.path.split(os.path.abspath(path))
+    name = os.fsencode(name)
+    fd = _inotify_watch(directory)
+
+    try:
+        stat = os.stat(path)
+        inode, offset = stat.st_ino, stat.st_size
+    except FileNotFoundError:
+        inode, offset = None, 0
+    partial = b""
+
+    try:
+        while True:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+
+            if stat is not None:
+                if inode is not None and stat.st_ino != inode:
+                    offset, partial = 0, b""
+                    yield "reset", "rotated"
+                elif stat.st_size < offset:
+                    offset, partial = 0, b""
+                    yield "reset", "truncated"
+                inode = stat.st_ino
+
+                if stat.st_size > offset:
+                    with open(path, "rb") as file:
+                        file.seek(offset)
+                        data = file.read(stat.st_size - offset)
+                    offset += len(data)
+                    *lines, partial = (partial + data).split(b"\n")
+                    for line in lines:
+                        yield "line", line.decode(errors="replace").rstrip("\r")
+                    continue
+
+            if fd is None:
+                time.sleep(_POLL_INTERVAL)
+            else:
+                # Wait for a change to the file, or check anyway after a while in case an event was missed
+                while select.select([fd], [], [], _POLL_INTERVAL)[0]:
+                    if _read_inotify(fd, name):
+                        break
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def watch(path: str, window: float = _WINDOW, cooldown: float = _COOLDOWN):
+    """Watches a Warframe log for reward screens.
+
+    The first marker line of a reward screen triggers straight away. Markers within `window` seconds of the
+    trigger are merged into it, and markers after that but within `cooldown` seconds are suppressed. Counts
+    are per session, which lasts until the log is replaced when the game restarts.
+
+    Args:
+        path (str): The path to EE.log.
+        window (float, optional): Seconds after a trigger to merge markers into it. Defaults to `_WINDOW`.
+        cooldown (float, optional): Seconds after a trigger before another. Defaults to `_COOLDOWN`.
+
+    Yields:
+        dict: The events. "trigger" for a reward screen, with the marker and the session counts, "reset" when
+            the log is read again from the start, with the counts of the session if it ended.
+    """
+
+    session = {"triggers": 0, "merged": 0, "suppressed": 0}
+    last_trigger = None
+
+    for kind, value in follow(path):
+        if kind == "reset":
+            event = {"event": "reset", "reason": value, "time": time.time()}
+            if value == "rotated":
+                event["session"] = session
+                session = dict.fromkeys(session, 0)
+                last_trigger = None
+            yield event
+            continue
+
+        marker = next((marker for marker in MARKERS if marker in value), None)
+        if marker is None:
+            continue
+
+        now = time.monotonic()
+        since = None if last_trigger is None else now - last_trigger
+        if since is not None and since < window:
+            session["merged"] += 1
+        elif since is not None and since < cooldown:
+            session["suppressed"] += 1
+        else:
+            last_trigger = now
+            session["triggers"] += 1
+            yield {
+                "event": "trigger",
+                "marker": marker,
+                "time": time.time(),
+                "session": dict(session),
+            }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: {sys.argv[0]} <EE.log path>", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({"event": "watching", "path": sys.argv[1]}), flush=True)
+    for event in watch(sys.argv[1]):
+        print(json.dumps(event), flush=True)
@@ -1,8 +1,6 @@
 import sys
-from parser import get_num_rewards
 
-from PIL import Image
+from client import request
 
 if __name__ == "__main__":
-    with Image.open(sys.argv[1]).convert("RGB") as image:
-        print(get_num_rewards(image))
+    print(request("num_rewards", path=sys.argv[1]))
@@ -1,36 +1,108 @@
 import json
+import os
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from queue import SimpleQueue
 
-import Levenshtein as lev
+import numpy as np
 import PIL.Image as Img
+from PIL import ImageOps
 from PIL.Image import Image
 from platformdirs import user_cache_path
-from tesserocr import PyTessBaseAPI
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Indel
+from tesserocr import PSM, PyTessBaseAPI
 
+import cell_cache
 import database as db
+import digits
+import frame
 import theme
+import tracing
+from geometry import (
+    LINE_HEIGHT,
+    REWARD_WIDTH,
+    TIME_COLOUR,
+    cut_image,
+    get_bottom_line_rewards,
+    get_scale,
+    get_timer,
+)
 
-# Define save dir path and ensure it exists
 _SAVE_DIR = user_cache_path("wfinfo") / "images"
-_SAVE_DIR.mkdir(parents=True, exist_ok=True)
 
-_REWARD_WIDTH = 242  # Per player
-_REWARD_TOTAL_WIDTH = _REWARD_WIDTH * 4
-_REWARD_BOTTOM = 80  # center - bottom = real bottom
-_LINE_HEIGHT = 24
-_REWARD_HEIGHT = _LINE_HEIGHT * 3  # Height of 3 lines
+_MIN_TEXT_ROWS = 4  # Rows of text pixels (at 1080p) for a line to count as having text
+_ITEM_CUTOFF = 80  # Minimum similarity (out of 100) for a reward to resolve to an item
+# Min similarity when the reward is much shorter than the item and mostly in it, i.e. only part of the name
+# was read, which is also how much of the reward has to be in the item to count as partial
+_PARTIAL_CUTOFF = 95
+_PARTIAL_LENGTH = 0.9
+# Min lead of the best item over the next best, closer than this is a guess
+_ITEM_MARGIN = 5
+_MAX_TIME_LEFT = 15  # The timer starts at this
+# Text pixels a column of the bottom line needs to count as text, fewer are probably noise
+_MIN_COLUMN_PIXELS = 2
+# Widest gap (at 1080p) between columns of text of the same reward name, wider gaps are between rewards
+_NAME_GAP = 12
+# Narrowest text (at 1080p) which counts as a name
+_MIN_NAME_WIDTH = 4
+# Max distance of a name's centre from its slot's centre, as a fraction of the reward width
+_MAX_NAME_OFFSET = 0.15
+# Max height of a line of text given to Tesseract, higher resolutions are downscaled to this
+# Upscaling lower resolutions doesn't help as the mask is already binary
+_OCR_LINE_HEIGHT = 32
+_OCR_PADDING = 8  # Blank border around text given to Tesseract
+# Number of Tesseract apis to OCR rewards with at the same time, default 1 per reward
+_TESS_WORKERS = int(os.environ.get("WFINFO_TESS_WORKERS", 4))
 
 # Image save count for filename
 _tmp_count = 0
 
-# Tesseract api
-tess = PyTessBaseAPI(
-    path="/usr/share/tessdata",  # Manual path cause unable to autodetect
-    psm=7,
-    variables={"tessedit_char_whitelist": db.whitelist_chars},
-)
+# Stats of the last parsed image
+last_stats = {"ocr_calls": 0, "ocr_calls_saved": 0, "cache_hits": 0, "cache_misses": 0}
+
+# Pool of Tesseract apis, each api can only be used by one thread at a time
+# Tesseract releases the GIL while recognising so threads can OCR rewards in parallel
+# These are all created on first use by init_tess
+_tess_lock = threading.Lock()
+_tess_apis = []
+_tess_pool = None
+_executor = None
+
+
+def init_tess() -> None:
+    """Creates the Tesseract apis and the thread pool to use them if they have not been created yet.
+
+    This is called automatically before OCR, but can be called early to avoid the delay on first use.
+    """
+
+    global _tess_pool, _executor
+
+    if _tess_pool is not None:
+        return
+
+    with _tess_lock:
+        # Another thread might have created them while waiting
+        if _tess_pool is not None:
+            return
+
+        # One more than the workers so the timer doesn't wait for the rewards
+        pool = SimpleQueue()
+        for _ in range(_TESS_WORKERS + 1):
+            api = PyTessBaseAPI(
+                path="/usr/share/tessdata",  # Manual path cause unable to autodetect
+                psm=7,
+                variables={"tessedit_char_whitelist": db.whitelist_chars},
+            )
+            _tess_apis.append(api)
+            pool.put(api)
+
+        _executor = ThreadPoolExecutor(_TESS_WORKERS)
+        _tess_pool = pool
 
 
 def save_image(image: Image) -> Path:
@@ -45,6 +117,7 @@ def save_image(image: Image) -> Path:
 
     global _tmp_count
 
+    _SAVE_DIR.mkdir(parents=True, exist_ok=True)
     save_path = _SAVE_DIR / f"{_tmp_count}.png"
     _tmp_count += 1
 
@@ -53,47 +126,35 @@ def save_image(image: Image) -> Path:
     return save_path
 
 
-def get_scale(image: Image) -> float:
-    """Calculates the scale of the image based on its dimensions.
+@lru_cache(maxsize=4096)
+def correct_word(word: str) -> str | None:
+    """Corrects the given word to the closest word in the database of words.
 
     Args:
-        image (Image): The image to calculate scale for.
+        word (str): The word to correct.
 
     Returns:
-        float: The scale.
+        str | None: The corrected word or None if no word is close enough.
     """
 
-    return (
-        image.height / 1080
-        if image.width / image.height > 16 / 9
-        else image.width / 1920
-    )
-
-
-def cut_image(image: Image, num_rewards: int) -> list[Image]:
-    """Cuts the given image into sections for each reward based on the number of rewards.
+    if word in db.words_set:
+        return word
 
-    Args:
-        image (Image): The image to cut.
-        num_rewards (int): The number of rewards.
-
-    Returns:
-        list[Image]: The images of each reward name.
-    """
-
-    scale = get_scale(image)
-    width = _REWARD_WIDTH * scale
-    left = (image.width - width * num_rewards) / 2
-    bottom = image.height / 2 - _REWARD_BOTTOM * scale
-    top = bottom - _REWARD_HEIGHT * scale
-    return [
-        image.crop((left + width * i, top, left + width * (i + 1), bottom))
-        for i in range(num_rewards)
-    ]
+    # Indel normalised similarity == Levenshtein ratio, gets the first best match like a linear scan
+    candidates = db.get_word_candidates(len(word))
+    tracing.count("fuzzy_comparisons", len(candidates))
+    match = process.extractOne(
+        word, candidates, scorer=Indel.normalized_similarity, score_cutoff=0.8
+    )
+    return None if match is None else match[0]
 
 
 def image_to_string(
-    image: Image, preprocessed: bool = False, validate: bool = True
+    image: Image,
+    preprocessed: bool = False,
+    validate: bool = True,
+    multiline: bool = False,
+    whitelist: str = None,
 ) -> str:
     """Converts the given image to a string via Tesseract OCR.
 
@@ -101,6 +162,8 @@ def image_to_string(
         image (Image): The image to convert
         preprocessed (bool, optional): Whether the image has already been preprocessed. Defaults to False.
         validate (bool, optional): Whether to validate the words in the string against the database of words. Defaults to True.
+        multiline (bool, optional): Whether the image is a block of multiple lines instead of a single line. Defaults to False.
+        whitelist (str, optional): The characters to recognise. Defaults to None for the characters in the database.
 
     Returns:
         str: The image as a string.
@@ -109,9 +172,21 @@ def image_to_string(
     if not preprocessed:
         image = theme.strip(image)
 
-    # Tesseract image to string
-    tess.SetImage(image)
-    string = tess.GetUTF8Text().strip()
+    # Tesseract image to string, waits for a free api if all are in use
+    init_tess()
+    tess = _tess_pool.get()
+    try:
+        with tracing.span("ocr"):
+            tracing.count("ocr_calls")
+            tess.SetPageSegMode(PSM.SINGLE_BLOCK if multiline else PSM.SINGLE_LINE)
+            if whitelist:
+                tess.SetVariable("tessedit_char_whitelist", whitelist)
+            tess.SetImage(image)
+            string = tess.GetUTF8Text().strip()
+    finally:
+        if whitelist:
+            tess.SetVariable("tessedit_char_whitelist", db.whitelist_chars)
+        _tess_pool.put(tess)
 
     # Return if no validation
     if not validate:
@@ -124,33 +199,15 @@ def image_to_string(
 
     # 2nd layer of checking via fuzzy matching each word
     checked = ""
-    for word in string.split():
-        valid_word = None
-        if word in db.words:
-            valid_word = word
-        else:
-            best_ratio = 0
-            for w in db.words:
-                ratio = lev.ratio(word, w, score_cutoff=0.8)
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    valid_word = w
-        if valid_word is not None:
-            checked += f" {valid_word}"
+    with tracing.span("correct"):
+        for word in string.split():
+            valid_word = correct_word(word)
+            if valid_word is not None:
+                checked += f" {valid_word}"
 
     return checked.strip()
 
 
-def get_bottom_line_rewards(image: Image) -> Image:
-    scale = get_scale(image)
-    width = _REWARD_TOTAL_WIDTH * scale
-    left = (image.width - width) / 2
-    bottom = image.height / 2 - _REWARD_BOTTOM * scale
-    top = bottom - _LINE_HEIGHT * scale
-
-    return image.crop((left, top, left + width, bottom))
-
-
 def get_num_rewards(image: Image) -> int:
     """Calculates the number of rewards.
 
@@ -163,75 +220,462 @@ def get_num_rewards(image: Image) -> int:
         int: The number of rewards.
     """
 
-    rewards = image_to_string(get_bottom_line_rewards(image))
+    scale = get_scale(image)
+    bottom_line = get_bottom_line_rewards(image, scale)
+    theme.init(bottom_line)
+    return _count_rewards(bottom_line, scale)
+
+
+def _count_rewards(bottom_line: Image, scale: float) -> int:
+    """Counts the rewards in the bottom line of the reward names, the theme must already be initialised.
+
+    The rewards are counted from the layout of the text first, and only if that is ambiguous by OCRing the
+    line and counting the item endings.
+
+    Args:
+        bottom_line (Image): The image of the bottom line.
+        scale (float): The scale of the image the bottom line is from.
+
+    Returns:
+        int: The number of rewards.
+    """
+
+    with tracing.span("num_rewards"):
+        mask = theme.get_mask(np.asarray(bottom_line))
+        num_rewards = count_reward_slots(mask, scale)
+        if num_rewards is not None:
+            return num_rewards
+
+        tracing.count("num_rewards_ocr")
+        text = image_to_string(
+            prepare_mask(mask, LINE_HEIGHT * scale), preprocessed=True
+        )
+        return len(re.findall("|".join(db.item_endings), text))
+
+
+def count_reward_slots(mask: np.ndarray, scale: float) -> int | None:
+    """Counts the rewards from the columns with text in the bottom line of the reward names.
+
+    Columns with text are grouped into names, then each possible number of rewards is checked. The rewards
+    are centred on the screen, so every reward slot must have a name roughly centred in it and no name can
+    cross into another slot.
+
+    Args:
+        mask (np.ndarray): The text mask of the bottom line of all 4 reward slots.
+        scale (float): The scale of the image the mask is from.
+
+    Returns:
+        int | None: The number of rewards, or None if no number or more than one fits the layout.
+    """
+
+    columns = np.flatnonzero(mask.sum(axis=0) >= _MIN_COLUMN_PIXELS)
+    if not columns.size:
+        return None
+
+    # Split where the gap between columns is too wide to be between words of the same name
+    splits = np.flatnonzero(np.diff(columns) > _NAME_GAP * scale) + 1
+    names = [
+        (group[0], group[-1] + 1)
+        for group in np.split(columns, splits)
+        if group.size >= _MIN_NAME_WIDTH * scale
+    ]
+    if not names:
+        return None
+
+    reward_width = REWARD_WIDTH * scale
+    centre = mask.shape[1] / 2
+    fits = []
+    for num_rewards in range(1, 5):
+        left = centre - reward_width * num_rewards / 2
+        # Leftmost and rightmost column of text in each slot
+        extents = [None] * num_rewards
+        for start, end in names:
+            slot = int((start - left) // reward_width)
+            if not 0 <= slot < num_rewards or end > left + reward_width * (slot + 1):
+                break
+            if extents[slot] is not None:
+                start = min(start, extents[slot][0])
+                end = max(end, extents[slot][1])
+            extents[slot] = start, end
+        else:
+            if all(
+                extent is not None
+                and abs(
+                    (extent[0] + extent[1]) / 2 - left - reward_width * (slot + 0.5)
+                )
+                <= reward_width * _MAX_NAME_OFFSET
+                for slot, extent in enumerate(extents)
+            ):
+                fits.append(num_rewards)
+
+    return fits[0] if len(fits) == 1 else None
+
+
+def get_text_lines(mask: np.ndarray, line_height: float, scale: float) -> int:
+    """Gets the number of lines of text at the bottom of the given reward mask.
+
+    This works by finding the rows with text in them from the row sums of the mask. Lines are counted from the
+    bottom up until a line without enough rows of text.
+
+    Args:
+        mask (np.ndarray): The text mask of the reward.
+        line_height (float): The height of a line of text in the mask.
+        scale (float): The scale of the image the mask is from.
+
+    Returns:
+        int: The number of lines of text.
+    """
+
+    # Ignore rows with a single pixel cause probably noise
+    text_rows = mask.sum(axis=1) > 1
+    min_rows = _MIN_TEXT_ROWS * scale
+
+    height = mask.shape[0]
+    lines = 0
+    while round((lines + 1) * line_height) <= height:
+        top = round(height - (lines + 1) * line_height)
+        bottom = round(height - lines * line_height)
+        if text_rows[top:bottom].sum() < min_rows:
+            break
+        lines += 1
+
+    return lines
+
+
+def prepare_mask(mask: np.ndarray, line_height: float) -> Image:
+    """Prepares a text mask for OCR.
+
+    Blank margins are trimmed and text from high resolution screens is resampled so each line is at most the
+    OCR line height, then a blank border is added back.
+
+    Args:
+        mask (np.ndarray): The boolean mask of text pixels.
+        line_height (float): The height of a line of text in the mask.
+
+    Returns:
+        Image: The binary L image for OCR, with text black and everything else white.
+    """
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size:
+        mask = mask[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+
+    factor = min(_OCR_LINE_HEIGHT / line_height, 1)
+    height, width = mask.shape
+    size = max(round(width * factor), 1), max(round(height * factor), 1)
+    image = theme.from_mask(mask)
+    if size != (width, height):
+        # Threshold after smooth resampling so the edges stay binary
+        image = image.resize(size, Img.Resampling.BICUBIC).point(
+            lambda v: 0 if v < 128 else 255
+        )
+
+    return ImageOps.expand(image, _OCR_PADDING, fill=255)
+
+
+def _parse_reward(image: Image, line_height: float, scale: float) -> tuple[str, int]:
+    """Parses the name of a single reward.
+
+    The lines with text are found first, then they are all OCRed at once unless the cell is in the cache.
+    Text which resolves to an item is cached.
+
+    Args:
+        image (Image): The image of the reward name.
+        line_height (float): The height of a line of text in the image.
+        scale (float): The scale of the image the reward is from.
+
+    Returns:
+        tuple[str, int]: The reward name and the number of lines it has.
+    """
+
+    with tracing.span("mask"):
+        mask = theme.get_mask(np.asarray(image))
+        lines = get_text_lines(mask, line_height, scale)
+
+    if not lines:
+        return "", 0
+
+    # Crop to lines with text, which are all OCRed in one call
+    mask = mask[round(mask.shape[0] - lines * line_height) :]
+    key, reward = cell_cache.get(mask, lines)
+    if reward is None:
+        tracing.count("ocr_lines", lines)
+        reward = image_to_string(
+            prepare_mask(mask, line_height), preprocessed=True, multiline=lines > 1
+        )
+        # Misreads would be given to similar cells instead of OCRing them again
+        if resolve_items([reward])[0][0] is not None:
+            cell_cache.put(key, reward)
+    else:
+        tracing.count("cache_hits")
 
-    return len(re.findall("|".join(db.item_endings), rewards))
+    return reward, lines
 
 
 def parse_image(image: Image, num_rewards: int = None) -> list[str]:
     """Parses the given image for rewards and returns the reward names.
 
+    Each reward is parsed in parallel by the pool of Tesseract apis.
+
     Args:
         image (Image): The image to parse.
         num_rewards (int, optional): The number of rewards in the image. Defaults to None for autodetection.
 
     Returns:
-        list[str]: The reward names.
+        list[str]: The reward names, in order from left to right.
     """
 
     if num_rewards is None:
         num_rewards = get_num_rewards(image)
 
+    scale = get_scale(image)
+
     # Initialise theme module for image
-    theme.init(image)
-
-    images = cut_image(image, num_rewards)
-    line_height = _LINE_HEIGHT * get_scale(image)
-    rewards = []
-
-    # Do for each reward
-    for image in images:
-        off = 0
-        reward = ""
-        line = True  # Default to init loop
-
-        # Parse line by line
-        while line:
-            # Get line as str
-            line = image.crop(
-                (0, image.height - line_height - off, image.width, image.height - off)
-            )
-            line = image_to_string(line)
+    theme.init(get_bottom_line_rewards(image, scale))
+
+    return _parse_names(image, num_rewards, scale)
+
+
+def _parse_names(image: Image, num_rewards: int, scale: float) -> list[str]:
+    """Parses the reward names in parallel, the theme must already be initialised for the image.
+
+    Args:
+        image (Image): The image to parse.
+        num_rewards (int): The number of rewards in the image.
+        scale (float): The scale of the image.
+
+    Returns:
+        list[str]: The reward names, in order from left to right.
+    """
+
+    images = cut_image(image, num_rewards, scale)
+    line_height = LINE_HEIGHT * scale
+
+    def parse_cell(index: int, image: Image) -> tuple[str, int]:
+        with tracing.span("cell", index=index):
+            return _parse_reward(image, line_height, scale)
+
+    # Map keeps the order of the rewards
+    init_tess()
+    hits, misses = cell_cache.hits, cell_cache.misses
+    rewards = list(_executor.map(parse_cell, range(len(images)), images))
+
+    # Parsing line by line took an OCR call per line and one for the empty line above
+    last_stats["cache_hits"] = cell_cache.hits - hits
+    last_stats["cache_misses"] = cell_cache.misses - misses
+    ocr_calls = sum(lines > 0 for _, lines in rewards) - last_stats["cache_hits"]
+    last_stats["ocr_calls"] = ocr_calls
+    last_stats["ocr_calls_saved"] = sum(lines + 1 for _, lines in rewards) - ocr_calls
+
+    return [reward for reward, _ in rewards]
+
+
+def resolve_items(names: list[str]) -> list[tuple[str | None, float]]:
+    """Resolves the given reward names to the most similar item names in the database.
+
+    All names are scored against every item name in a single batch. A name only resolves if its best item
+    is clearly better than the next best, e.g. "Prime Systems Blueprint" is as similar to every "X Prime
+    Systems Blueprint" so it doesn't resolve to any of them. Names much shorter than their best item and
+    contained in it need a higher similarity, as only part of the name was read.
+
+    Args:
+        names (list[str]): The reward names to resolve.
+
+    Returns:
+        list[tuple[str | None, float]]: The best item name and its similarity (out of 100) for each reward.
+            The item name is None if no item is similar enough, the similarity is still that of the best.
+    """
+
+    if not names or not db.item_names:
+        return [(None, 0.0) for _ in names]
+
+    with tracing.span("resolve"):
+        tracing.count("fuzzy_comparisons", len(names) * len(db.item_names))
+        scores = process.cdist(
+            names, db.item_names, scorer=fuzz.ratio, score_cutoff=_ITEM_CUTOFF
+        )
+    if scores.shape[1] > 1:
+        # Best two items of each name, in any order
+        top = np.argpartition(scores, -2, axis=1)[:, -2:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        best_items = top[np.arange(len(names)), top_scores.argmax(axis=1)]
+        best, runner_up = top_scores.max(axis=1), top_scores.min(axis=1)
+    else:
+        best, runner_up = scores[:, 0], np.zeros(len(names))
+        best_items = np.zeros(len(names), dtype=np.intp)
+
+    results = []
+    for name, i, score, next_score in zip(names, best_items, best, runner_up):
+        item = db.item_names[i]
+        score = float(score)
+        # Part of the name read is a shorter name that's (almost) all in the item, rather than OCR errors
+        partial = (
+            len(name) < len(item) * _PARTIAL_LENGTH
+            and fuzz.partial_ratio(name, item) >= _PARTIAL_CUTOFF
+        )
+        if score < 100 and (
+            score - next_score < _ITEM_MARGIN or (partial and score < _PARTIAL_CUTOFF)
+        ):
+            item = None
+        results.append((item if score else None, score))
+    return results
+
+
+def parse_rewards(
+    image: Image, num_rewards: int = None, sources: bool = False
+) -> list[dict]:
+    """Parses the given image for rewards and returns the item data of each reward.
+
+    Args:
+        image (Image): The image to parse.
+        num_rewards (int, optional): The number of rewards in the image. Defaults to None for autodetection.
+        sources (bool, optional): Whether to include the relics which drop each reward. Defaults to False.
+
+    Returns:
+        list[dict]: The item data of each reward. Invalid rewards have placeholder data.
+    """
+
+    return _get_item_data(parse_image(image, num_rewards), sources)
+
+
+def _get_item_data(rewards: list[str], sources: bool = False) -> list[dict]:
+    """Gets the item data of each of the given reward names.
+
+    Args:
+        rewards (list[str]): The reward names.
+        sources (bool, optional): Whether to include the relics which drop each reward. Defaults to False.
+
+    Returns:
+        list[dict]: The item data of each reward with the "score" (out of 100) of its name, so low confidence
+            can be shown. Invalid rewards have placeholder data.
+    """
+
+    data = [
+        (
+            {"name": name, **db.items[name], "score": score}
+            if name is not None
+            else {
+                "name": f"Invalid ({r})",
+                "price": {"platinum": 0, "ducats": 0},
+                "sold": {"today": 0, "yesterday": 0},
+                "vaulted": False,
+                "score": score,
+            }
+        )
+        for r, (name, score) in zip(rewards, resolve_items(rewards))
+    ]
+    if sources:
+        for reward in data:
+            reward["relics"] = db.get_relic_sources(reward["name"])
+    return data
+
+
+def ocr_time_left(mask: np.ndarray) -> int | None:
+    """OCRs the time left from a timer mask.
+
+    Args:
+        mask (np.ndarray): The boolean mask of the timer digits.
+
+    Returns:
+        int | None: The time left or None if unable to read it.
+    """
+
+    # Increase size cause apparently tesseract doesn't do so well with small images
+    stripped = theme.from_mask(mask)
+    scaled = stripped.resize((stripped.width * 8, stripped.height * 8))
+    string = image_to_string(scaled, True, False, whitelist="1234567890")
+    return int(string) if string.isdigit() else None
+
+
+def get_time_left(image: Image, scale: float = None) -> int | None:
+    """Reads the time left to choose a reward from the timer above the rewards.
+
+    The digits are matched against templates first, and only OCRed if they don't match confidently. Digits
+    which are OCRed are learned as templates if the time is possible and the closest templates agree.
+
+    Args:
+        image (Image): The image to read the timer from.
+        scale (float, optional): The scale of the image if already known. Defaults to None to calculate it.
+
+    Returns:
+        int | None: The time left in seconds or None if unable to read it.
+    """
+
+    with tracing.span("time_left"):
+        mask = (np.asarray(get_timer(image, scale)) >= TIME_COLOUR).all(axis=-1)
+
+        # Match the digits against templates, only OCR if unsure
+        time_left = digits.read(mask)
+        if time_left is not None:
+            return time_left
+
+        time_left = ocr_time_left(mask)
+        # So the same digits can be matched next time, but only if the closest templates agree as Tesseract
+        # consistently misreads some digits and a misread would be matched confidently from then on
+        if (
+            time_left is not None
+            and time_left <= _MAX_TIME_LEFT
+            and digits.read(mask, confident=False) == time_left
+        ):
+            digits.learn(mask, time_left)
+        return time_left
+
+
+def analyze(image: Image, sources: bool = False, num_rewards: int = None) -> dict:
+    """Analyses the rewards in the given image in a single pass.
+
+    The scale is calculated once, and the bottom line of the rewards is cropped and masked once for both
+    detecting the theme and counting the rewards. The timer is read while the rewards are parsed.
+
+    Args:
+        image (Image): The image to analyse.
+        sources (bool, optional): Whether to include the relics which drop each reward. Defaults to False.
+        num_rewards (int, optional): The number of rewards if already known, e.g. to show placeholders while
+            this runs. Defaults to None to count them.
+
+    Returns:
+        dict: The number of rewards, the reward names, the item data of each reward and the time left (None
+            if unable to read it).
+    """
+
+    init_tess()
+    scale = get_scale(image)
+    time_left = _executor.submit(get_time_left, image, scale)
 
-            # Add to reward name and add offset to go up a line
-            reward = f"{line} {reward.strip()}"
-            off += line_height
+    bottom_line = get_bottom_line_rewards(image, scale)
+    theme.init(bottom_line)
+    if num_rewards is None:
+        num_rewards = _count_rewards(bottom_line, scale)
+
+    rewards = _parse_names(image, num_rewards, scale)
 
-        reward = reward.strip()
-        rewards.append(reward)
+    return {
+        "num_rewards": num_rewards,
+        "rewards": rewards,
+        "items": _get_item_data(rewards, sources),
+        "time_left": time_left.result(),
+    }
 
-    return rewards
+
+def reload_dbs() -> None:
+    """Updates the Tesseract character whitelists and clears the word and cell caches if needed.
+
+    This should be called after the databases are updated in a long-lived process, while
+    no OCR is running.
+    """
+
+    for tess in _tess_apis:
+        tess.SetVariable("tessedit_char_whitelist", db.whitelist_chars)
+    correct_word.cache_clear()
+    cell_cache.check_vocabulary()
 
 
 # Parse given image and output if called as main script
 if __name__ == "__main__":
-    with Img.open(sys.argv[1]).convert("RGB") as image:
-        print(
-            json.dumps(
-                [
-                    (
-                        {"name": r, **db.items[r]}
-                        if r in db.items
-                        else {
-                            "name": f"Invalid ({r})",
-                            "price": {"platinum": 0, "ducats": 0},
-                            "sold": {"today": 0, "yesterday": 0},
-                            "vaulted": False,
-                        }
-                    )
-                    for r in parse_image(
-                        image, int(sys.argv[2]) if len(sys.argv) > 2 else None
-                    )
-                ]
-            )
+    image = frame.open_frame(sys.argv[1])
+    print(
+        json.dumps(
+            parse_rewards(image, int(sys.argv[2]) if len(sys.argv) > 2 else None)
         )
+    )
@@ -0,0 +1,356 @@
+import codecs
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection, IncompleteRead
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Data API to get the databases from, can be pointed at a local server, e.g. bench/mock_api.py
+_DATA_API = urlsplit(os.environ.get("WFINFO_DATA_API", "https://api.warframestat.us"))
+# Seconds to wait to connect and for each read before giving up on an attempt
+_TIMEOUT = 10
+# Attempts at each request, the delay before a retry starts at the backoff and doubles after each
+_ATTEMPTS = 3
+_BACKOFF = 0.5
+# Statuses worth retrying, the server is overloaded or having a moment
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_READ_SIZE = 1 << 16
+
+# Idle keep-alive connections to the data API
+_pool_lock = threading.Lock()
+_pool = []
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters which can continue a number
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class StatusError(HTTPException):
+    """The data API responded with an unexpected status."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"{status} {reason}")
+        self.status = status
+
+
+class _Stream:
+    """Text arriving in chunks, with the position parsed up to."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.done = False
+
+    def more(self) -> bool:
+        """Reads the next chunk, dropping the text already parsed.
+
+        Returns:
+            bool: False if there are no more chunks.
+        """
+
+        for chunk in self._chunks:
+            self.text = self.text[self.pos :] + chunk
+            self.pos = 0
+            return True
+        self.done = True
+        return False
+
+    def peek(self) -> str:
+        """Skips whitespace and gets the next character, reading more if needed.
+
+        Returns:
+            str: The next character, or an empty string at the end.
+        """
+
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consumes the next character, which must be one of the given ones.
+
+        Raises:
+            json.JSONDecodeError: If it is not.
+        """
+
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self.text, self.pos
+            )
+        self.pos += 1
+        return char
+
+
+def _decode(stream: _Stream):
+    """Decodes the next whole value of a stream, reading more of it until the value is complete.
+
+    Decoding is only tried again once the unparsed text has doubled, so a long value is decoded in linear
+    time rather than once per chunk.
+    """
+
+    stream.peek()
+    wanted = 0
+    while True:
+        available = len(stream.text) - stream.pos
+        if available >= wanted or stream.done:
+            try:
+                value, end = _decoder.raw_decode(stream.text, stream.pos)
+                # A number could continue in the next chunk, e.g. "1." then "5", so it needs to be followed by
+                # something which can't be part of it
+                if stream.done or (
+                    end < len(stream.text)
+                    and not (
+                        isinstance(value, (int, float))
+                        and stream.text[end] in _NUMBER_CHARS
+                    )
+                ):
+                    stream.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if stream.done:
+                    raise
+            wanted = available * 2
+        stream.more()
+
+
+def _parse(stream: _Stream, depth: int):
+    """Parses the next value of a stream, the containers above the depth piece by piece."""
+
+    char = stream.peek()
+    if depth <= 0 or char not in ("[", "{"):
+        return _decode(stream)
+
+    stream.pos += 1
+    is_object = char == "{"
+    close = "}" if is_object else "]"
+    result = {} if is_object else []
+    if stream.peek() == close:
+        stream.pos += 1
+        return result
+
+    while True:
+        if is_object:
+            if stream.peek() != '"':
+                raise json.JSONDecodeError(
+                    "Expecting property name", stream.text, stream.pos
+                )
+            key = _decode(stream)
+            stream.expect(":")
+            result[key] = _parse(stream, depth - 1)
+        else:
+            result.append(_parse(stream, depth - 1))
+        if stream.expect("," + close) == close:
+            return result
+
+
+def parse_stream(chunks, depth: int = 1):
+    """Parses a JSON document as it arrives.
+
+    The arrays and objects down to the given depth are parsed piece by piece and each value at the depth is
+    decoded as soon as all of it has arrived, so parsing overlaps the download and only the unparsed part of
+    the text is kept.
+
+    Args:
+        chunks (Iterable[str]): The text of the document in chunks.
+        depth (int, optional): How deep to parse piece by piece. Defaults to 1, each item of the top level.
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid or incomplete.
+
+    Returns:
+        Any: The parsed document.
+    """
+
+    stream = _Stream(chunks)
+    value = _parse(stream, depth)
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", stream.text, stream.pos)
+    return value
+
+
+def _connect() -> tuple[HTTPConnection, bool]:
+    """Gets an idle connection to the data API from the pool, or a new one if there are none.
+
+    Returns:
+        tuple[HTTPConnection, bool]: The connection and whether it was reused.
+    """
+
+    with _pool_lock:
+        if _pool:
+            return _pool.pop(), True
+    if _DATA_API.scheme == "https":
+        return HTTPSConnection(_DATA_API.netloc, timeout=_TIMEOUT), False
+    return HTTPConnection(_DATA_API.netloc, timeout=_TIMEOUT), False
+
+
+def _read_chunks(response, file, gzipped: bool):
+    """Reads the body of a response as it arrives, decompressing it and writing it to a file on the way.
+
+    Yields:
+        str: The decoded text of each chunk.
+    """
+
+    decompressor = zlib.decompressobj(wbits=31) if gzipped else None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while chunk := response.read1(_READ_SIZE):
+        if decompressor:
+            chunk = decompressor.decompress(chunk)
+        file.write(chunk)
+        yield decoder.decode(chunk)
+
+    # The connection closing early isn't an error when reading in chunks
+    if response.length:
+        raise IncompleteRead(b"", response.length)
+    if decompressor:
+        if not decompressor.eof:
+            raise IncompleteRead(b"")
+        chunk = decompressor.flush()
+        file.write(chunk)
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _fetch_once(url: str, headers: dict[str, str], raw_path: Path, depth: int):
+    conn, reused = _connect()
+    try:
+        try:
+            conn.request("GET", url, headers=headers)
+            response = conn.getresponse()
+        except ConnectionError:
+            # The server closed the idle connection, only worth trying again if it was reused
+            conn.close()
+            if not reused:
+                raise
+            conn, _ = _connect()
+            conn.request("GET", url, headers=headers)
+            response = conn.getresponse()
+
+        if response.status == 304:
+            response.read()
+            value = None
+        elif response.status != 200:
+            response.read()
+            raise StatusError(response.status, response.reason)
+        else:
+            with tempfile.NamedTemporaryFile(
+                dir=raw_path.parent, prefix=f".{raw_path.name}.", delete=False
+            ) as file:
+                try:
+                    value = parse_stream(
+                        _read_chunks(
+                            response,
+                            file,
+                            response.getheader("Content-Encoding") == "gzip",
+                        ),
+                        depth,
+                    )
+                except BaseException:
+                    os.remove(file.name)
+                    raise
+            os.replace(file.name, raw_path)
+    except BaseException:
+        conn.close()
+        raise
+
+    # Closing the response only finishes it, the connection stays open for the next
+    response.close()
+    if response.will_close:
+        conn.close()
+    else:
+        with _pool_lock:
+            _pool.append(conn)
+    return value, response
+
+
+def fetch(
+    data: str, raw_path: Path, validators: dict[str, str] = None, depth: int = 1
+) -> tuple[object | None, dict[str, str]]:
+    """Gets data from the data API if it has changed.
+
+    The body is parsed as it arrives and written to the raw path once complete. Connections are kept alive
+    and reused, and failed attempts are retried with backoff unless the status says it won't help.
+
+    Args:
+        data (str): The name of the data to get.
+        raw_path (Path): Where to keep the raw data. It is replaced atomically once all of it has arrived.
+        validators (dict[str, str], optional): The ETag and Last-Modified headers of the last response for
+            a conditional request. Defaults to None.
+        depth (int, optional): How deep to parse the JSON piece by piece, see `parse_stream`. Defaults to 1.
+
+    Raises:
+        e: The exception the last attempt threw.
+
+    Returns:
+        tuple[object | None, dict[str, str]]: The parsed data (None if unchanged) and its validators.
+    """
+
+    headers = {"Accept-Encoding": "gzip"}
+    if validators:
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    url = f"{_DATA_API.path.rstrip('/')}/wfinfo/{data}/"
+    for attempt in range(_ATTEMPTS):
+        try:
+            value, response = _fetch_once(url, headers, raw_path, depth)
+            break
+        except Exception as e:
+            retry = attempt < _ATTEMPTS - 1 and (
+                not isinstance(e, StatusError) or e.status in _RETRY_STATUSES
+            )
+            print(
+                f"Unable to get data from {_DATA_API.netloc}{url}: {e}"
+                + (", retrying." if retry else "")
+            )
+            if not retry:
+                raise e
+            # Jitter so concurrent requests don't all retry at once
+            time.sleep(_BACKOFF * 2**attempt * random.uniform(1, 1.5))
+
+    if value is None:
+        return None, validators
+
+    new_validators = {}
+    if response.getheader("ETag"):
+        new_validators["etag"] = response.getheader("ETag")
+    if response.getheader("Last-Modified"):
+        new_validators["last_modified"] = response.getheader("Last-Modified")
+    return value, new_validators
+
+
+def fetch_all(
+    requests: dict[str, tuple[Path, dict[str, str] | None, int]],
+) -> dict[str, tuple[object | None, dict[str, str]]]:
+    """Gets several data from the data API concurrently, see `fetch`.
+
+    Args:
+        requests (dict[str, tuple[Path, dict[str, str] | None, int]]): The raw path, validators and parse
+            depth of each data to get.
+
+    Raises:
+        e: The exception of the first request which failed, after the rest finish.
+
+    Returns:
+        dict[str, tuple[object | None, dict[str, str]]]: The parsed data and validators of each.
+    """
+
+    with ThreadPoolExecutor(len(requests)) as executor:
+        futures = {
+            data: executor.submit(fetch, data, *args) for data, args in requests.items()
+        }
+        return {data: future.result() for data, future in futures.items()}
@@ -0,0 +1,91 @@
+import marshal
+import mmap
+import struct
+from pathlib import Path
+
+_MAGIC = b"WFDB"
+_VERSION = 1
+# Magic, version, updated timestamp, generation, number of sections
+_HEADER = struct.Struct("<4sIdII")
+# Section name, offset, length
+_SECTION = struct.Struct("<16sQQ")
+_MAX_NAME_LENGTH = 16
+
+
+def write(path: Path, updated: float, generation: int, sections: dict) -> None:
+    """Writes a snapshot of the given sections to the given path.
+
+    The file starts with a small header containing the metadata and a table of where each section is,
+    followed by each section encoded with `marshal`.
+
+    Args:
+        path (Path): The path to write the snapshot to.
+        updated (float): The time the data was updated.
+        generation (int): The generation of the data.
+        sections (dict): The data of each section by name.
+    """
+
+    encoded = {name: marshal.dumps(value) for name, value in sections.items()}
+
+    offset = _HEADER.size + _SECTION.size * len(encoded)
+    table = []
+    for name, data in encoded.items():
+        # Longer names would be truncated by the table, so could collide
+        assert len(name.encode()) <= _MAX_NAME_LENGTH, f"Section name too long: {name}"
+        table.append(_SECTION.pack(name.encode(), offset, len(data)))
+        offset += len(data)
+
+    header = _HEADER.pack(_MAGIC, _VERSION, updated, generation, len(encoded))
+    path.write_bytes(header + b"".join(table) + b"".join(encoded.values()))
+
+
+class Snapshot:
+    """A memory mapped snapshot which decodes sections only when they are loaded."""
+
+    def __init__(self, path: Path) -> None:
+        """Opens the snapshot at the given path and reads its header.
+
+        Args:
+            path (Path): The path to the snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot, is a different version or is truncated.
+        """
+
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, self.updated, self.generation, count = _HEADER.unpack_from(
+                self._mmap
+            )
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a version {_VERSION} snapshot")
+
+            self._sections = {}
+            for i in range(count):
+                name, offset, length = _SECTION.unpack_from(
+                    self._mmap, _HEADER.size + _SECTION.size * i
+                )
+                if offset + length > len(self._mmap):
+                    raise ValueError(f"{path} is truncated")
+                self._sections[name.rstrip(b"\0").decode()] = offset, length
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"{path} is not a valid snapshot: {e}") from e
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    def load(self, name: str):
+        """Decodes the section with the given name.
+
+        Args:
+            name (str): The name of the section.
+
+        Returns:
+            Any: The data of the section.
+        """
+
+        offset, length = self._sections[name]
+        with memoryview(self._mmap) as view:
+            return marshal.loads(view[offset : offset + length])
@@ -4,6 +4,8 @@ import numpy as np
 import PIL.Image as Img
 from PIL.Image import Image
 
+import tracing
+
 type Pixel = tuple[int, int, int] | np.ndarray
 type Theme = tuple[Pixel, ...]
 
@@ -29,6 +31,15 @@ themes = [
 
 # Active theme to use for stripping when not given
 active_theme = themes[0]
+# Most common colour of the last detected theme
+_active_colour = None
+
+# How far a colour can be from a theme colour (as a fraction of it) to still match
+_THRESHOLD = 0.2
+# Fraction of pixels that must be the last most common colour to skip detection
+_PROBE_FRACTION = 0.01
+# Histogram bins to check exactly for the most common colour before just counting every colour
+_MAX_BINS = 8
 
 
 def check_range(pixel: Pixel, theme: Theme) -> bool:
@@ -42,9 +53,8 @@ def check_range(pixel: Pixel, theme: Theme) -> bool:
         bool: If the pixel is in the theme's range.
     """
 
-    threshold = 0.2
-    min = 1 - threshold
-    max = 1 + threshold
+    min = 1 - _THRESHOLD
+    max = 1 + _THRESHOLD
 
     # Colours any
     for colour in theme:
@@ -59,8 +69,148 @@ def check_range(pixel: Pixel, theme: Theme) -> bool:
     return False
 
 
+def get_bounds(theme: Theme) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the inclusive lower and upper bounds of each colour in the given theme.
+
+    The bounds are the same as the ranges used by `check_range`, rounded inwards to integers. Colours
+    which no pixel can be in the range of are removed.
+
+    Args:
+        theme (Theme): The theme to get the bounds of.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The lower and upper bounds, each of shape (colours, 3).
+    """
+
+    colours = np.array(theme, dtype=np.float64).reshape(-1, 3)
+    lower = np.ceil(colours * (1 - _THRESHOLD))
+    upper = np.floor(colours * (1 + _THRESHOLD))
+
+    valid = (lower <= 255).all(axis=1)
+    return lower[valid].astype(np.uint8), np.minimum(upper[valid], 255).astype(np.uint8)
+
+
+def get_mask(array: np.ndarray, theme: Theme = None) -> np.ndarray:
+    """Gets a mask of the pixels in the given array which are in the colour range of the given theme.
+
+    This is the vectorised equivalent of calling `check_range` on every pixel.
+
+    Args:
+        array (np.ndarray): The RGB pixels to check, of shape (height, width, 3).
+        theme (Theme, optional): The theme to use for colour checking. Defaults to None for active theme.
+
+    Returns:
+        np.ndarray: The boolean mask of shape (height, width).
+    """
+
+    if theme is None:
+        theme = active_theme
+
+    mask = np.zeros(array.shape[:2], dtype=bool)
+    for lower, upper in zip(*get_bounds(theme)):
+        # lower <= x <= upper is the same as x - lower <= upper - lower with uint8 wrap around
+        in_range = (array - lower) <= (upper - lower)
+        mask |= in_range[..., 0] & in_range[..., 1] & in_range[..., 2]
+    return mask
+
+
+# All themes as arrays of shape (themes, colours, 3) to match all at once
+_THEME_COLOURS = np.array(themes)
+_THEME_LOWER = np.ceil(_THEME_COLOURS * (1 - _THRESHOLD))
+_THEME_UPPER = np.floor(_THEME_COLOURS * (1 + _THRESHOLD))
+
+
+def get_primary_bounds() -> tuple[np.ndarray, np.ndarray]:
+    """Gets the inclusive lower and upper bounds of the primary colour of every theme.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The lower and upper bounds, each of shape (themes, 3).
+    """
+
+    return _THEME_LOWER[:, 0], _THEME_UPPER[:, 0]
+
+
+def _pack(array: np.ndarray, bits: int = 8) -> np.ndarray:
+    """Packs the top bits of each channel of the given RGB pixels into a single integer.
+
+    Args:
+        array (np.ndarray): The RGB pixels of shape (..., 3).
+        bits (int, optional): The number of bits of each channel to keep. Defaults to 8.
+
+    Returns:
+        np.ndarray: The packed pixels of shape (...).
+    """
+
+    channels = (array >> (8 - bits)).astype(np.uint32)
+    return (
+        (channels[..., 0] << (bits * 2)) | (channels[..., 1] << bits) | channels[..., 2]
+    )
+
+
+def get_most_common_colour(array: np.ndarray) -> np.ndarray:
+    """Gets the most common colour in the given RGB pixels.
+
+    The pixels are counted in a coarse 5 bit per channel histogram first. The most common exact colour can
+    only be in a bin with at least as many pixels as it, so bins are checked exactly from the most common
+    until no bin left could beat the best colour found. This is linear in the number of pixels instead of
+    sorting all of them, unless the pixels are so spread out it is quicker to just sort them.
+
+    Args:
+        array (np.ndarray): The RGB pixels of shape (height, width, 3).
+
+    Returns:
+        np.ndarray: The most common colour.
+    """
+
+    pixels = array.reshape(-1, 3)
+    quantised = _pack(pixels, bits=5)
+    bin_counts = np.bincount(quantised)
+
+    best_colour, best_count = 0, 0
+    for checked, bin_ in enumerate(np.argsort(bin_counts)[::-1]):
+        if bin_counts[bin_] <= best_count:
+            break
+        if checked == _MAX_BINS:
+            unique, counts = np.unique(_pack(pixels), return_counts=True)
+            best_colour = unique[counts.argmax()]
+            break
+        unique, counts = np.unique(_pack(pixels[quantised == bin_]), return_counts=True)
+        if counts.max() > best_count:
+            best_colour, best_count = unique[counts.argmax()], counts.max()
+
+    return np.array(
+        [best_colour >> 16, (best_colour >> 8) & 255, best_colour & 255], dtype=np.uint8
+    )
+
+
+def match_theme(colour: np.ndarray) -> Theme:
+    """Gets the theme which the given primary colour belongs to.
+
+    Args:
+        colour (np.ndarray): The primary colour.
+
+    Returns:
+        Theme: The matching theme or a custom theme with the colour as its range if no theme matches.
+    """
+
+    # Exact check primary colour
+    exact = (_THEME_COLOURS[:, 0] == colour).all(axis=1)
+    if exact.any():
+        return themes[exact.argmax()]
+
+    # Secondary check within range of any colour
+    in_range = (
+        ((_THEME_LOWER <= colour) & (colour <= _THEME_UPPER)).all(axis=2).any(axis=1)
+    )
+    if in_range.any():
+        return themes[in_range.argmax()]
+
+    # Custom theme with primary colour most common colour
+    return (colour,)
+
+
 def detect_theme(image: Image) -> Theme:
-    """Detect the active Warframe theme from the given image.
+    """Detect the active Warframe theme from the bottom line of rewards.
 
     This function works by checking the primary colour in the reward text area in the image.
     As the reward text should be the primary colour of the theme, that colour should be the
@@ -68,79 +218,81 @@ def detect_theme(image: Image) -> Theme:
     a custom theme with that colour as the range is returned.
 
     Args:
-        image (Image): The image to detect the active theme in.
+        image (Image): The image of the bottom line of rewards to detect the active theme in.
 
     Returns:
         Theme: The active theme.
     """
 
-    from parser import get_bottom_line_rewards  # ugh
+    return match_theme(get_most_common_colour(np.asarray(image)))
 
-    # Get numpy array of bottom line of rewards
-    array = np.array(get_bottom_line_rewards(image))
 
-    # Create view of array and get unique counts
-    array = array.view(np.dtype((np.void, array.dtype.itemsize * array.shape[2])))
-    unique, counts = np.unique(array, return_counts=True)
+def from_mask(mask: np.ndarray) -> Image:
+    """Creates an image for OCR from the given mask.
 
-    # It's a byte string for some reason, so turn it back into an int
-    most_common = np.frombuffer(unique[np.argmax(counts)], dtype=np.uint8)
+    Args:
+        mask (np.ndarray): The boolean mask of text pixels.
 
-    # Exact check primary colour
-    for theme in themes:
-        if (theme[0] == most_common).all():
-            return theme
+    Returns:
+        Image: The image, with text pixels black and everything else white.
+    """
 
-    # Secondary check within range
-    for theme in themes:
-        if check_range(most_common, theme):
-            return theme
+    output = np.full(mask.shape, 255, dtype=np.uint8)  # Full white array
+    output[mask] = 0  # Set matching to black
 
-    # Custom theme with primary colour most common colour
-    return (most_common,)
+    return Img.fromarray(output)
 
 
 def strip(
-    img: Image, theme: Theme = None, filter_fn: callable[[Pixel], bool] = None
+    img: Image,
+    theme: Theme = None,
+    filter_fn: callable[[np.ndarray], np.ndarray] = None,
 ) -> Image:
     """Strips the text from the given image for OCR.
 
     Args:
         img (Image): The image to strip.
         theme (Theme, optional): The theme to use for colour checking. Defaults to None for active theme.
-        filter_fn (callable[[Pixel], bool], optional): A filter function to use instead of a theme.
-            If a theme is also passed in, it is ignored in favour of the filter function. Defaults to None.
+        filter_fn (callable[[np.ndarray], np.ndarray], optional): A vectorised filter function to use instead of
+            a theme. It is given the RGB pixels of the image as an array of shape (height, width, 3) and should
+            return a boolean mask of shape (height, width). If a theme is also passed in, it is ignored in favour
+            of the filter function. Defaults to None.
 
     Returns:
-        Image: The modified image.
+        Image: The modified image, with matching pixels black and everything else white.
     """
 
-    # Use filter_fn if given, else check theme colours
-    if filter_fn is None:
-        # Use active theme if not specified
-        if theme is None:
-            theme = active_theme
+    with tracing.span("strip"):
+        array = np.asarray(img)
 
-        def filter_fn(pxl):
-            return check_range(pxl, theme)
+        # Use filter_fn if given, else check theme colours
+        mask = get_mask(array, theme) if filter_fn is None else filter_fn(array)
 
-    img_array = np.array(img)
-    filter_fn_vec = np.vectorize(lambda r, g, b: filter_fn((r, g, b)))
-    mask = filter_fn_vec(img_array[..., 0], img_array[..., 1], img_array[..., 2])
-    output_array = np.ones_like(img_array) * 255  # Full white array
-    output_array[mask] = 0, 0, 0  # Set matching to black
-
-    return Img.fromarray(output_array.astype("uint8"))
+        return from_mask(mask)
 
 
 def init(image: Image) -> None:
     """Initialises the theme module for the given image.
 
-    This should be called every time a new image is used.
+    This should be called every time a new image is used. If the most common colour of the last detected
+    theme is still common in a sample of the image, the theme is kept without detecting it again.
 
     Args:
-        image (Image): The image to load this module for.
+        image (Image): The image of the bottom line of rewards to load this module for.
     """
 
-    global active_theme
-    active_theme = detect_theme(image)
+    global active_theme, _active_colour
+
+    array = np.asarray(image)
+
+    # Cheap probe on every 4th pixel of every 2nd row
+    if _active_colour is not None:
+        sample = array[::2, ::4]
+        matches = (sample == _active_colour).all(axis=2).sum()
+        if matches >= sample.shape[0] * sample.shape[1] * _PROBE_FRACTION:
+            tracing.count("theme_reused")
+            return
+
+    with tracing.span("detect_theme"):
+        _active_colour = get_most_common_colour(array)
+        active_theme = match_theme(_active_colour)
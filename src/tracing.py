@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Set WFINFO_TRACE to a file to append a trace of each request to, and WFINFO_TRACE_FORMAT to
+# "chrome" for a Chrome trace (open in about:tracing or Perfetto) instead of JSON lines
+_TRACE_ENV = "WFINFO_TRACE"
+_FORMAT_ENV = "WFINFO_TRACE_FORMAT"
+
+enabled = False
+_path = None
+_format = "jsonl"
+
+# Shared no-op span so disabled tracing doesn't allocate anything
+_NULL_SPAN = nullcontext()
+
+_lock = threading.Lock()
+_local = threading.local()
+# State of the current trace, which lasts until every open span is closed
+_open_spans = 0
+_root_name = None
+_trace_start = 0
+_trace_end = None
+_events = []
+_counts = {}
+
+
+def _noop_span(name: str, **args) -> nullcontext:
+    return _NULL_SPAN
+
+
+def _noop_count(name: str, n: int = 1) -> None:
+    pass
+
+
+class _Span:
+    """A timed section of a trace, written as a trace event when it ends."""
+
+    __slots__ = "name", "args", "start"
+
+    def __init__(self, name: str, **args) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        global _open_spans, _root_name, _trace_start, _trace_end
+
+        now = time.perf_counter_ns()
+        with _lock:
+            # First span starts a new trace
+            if _open_spans == 0:
+                _root_name = self.name
+                _trace_start = now
+                _trace_end = None
+                _events.clear()
+                _counts.clear()
+            _open_spans += 1
+
+        if not hasattr(_local, "stack"):
+            _local.stack = []
+        _local.stack.append(self)
+        self.start = now
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _open_spans, _trace_end
+
+        end = time.perf_counter_ns()
+        _local.stack.pop()
+        event = {
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start // 1000,
+            "dur": (end - self.start) // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        }
+
+        with _lock:
+            _events.append(event)
+            _open_spans -= 1
+            if _open_spans == 0:
+                _trace_end = end
+                _write(_events)
+
+
+def _count(name: str, n: int = 1) -> None:
+    stack = getattr(_local, "stack", None)
+    if stack:
+        args = stack[-1].args
+        args[name] = args.get(name, 0) + n
+    with _lock:
+        _counts[name] = _counts.get(name, 0) + n
+
+
+def _write(events: list[dict]) -> None:
+    """Appends the events of a trace to the trace file.
+
+    Args:
+        events (list[dict]): The trace events.
+    """
+
+    with open(_path, "a") as file:
+        if _format == "chrome":
+            # The closing bracket is optional in the trace event format, so the file can be appended to
+            if file.tell() == 0:
+                file.write("[\n")
+            file.writelines(f"{json.dumps(event)},\n" for event in events)
+        else:
+            file.writelines(f"{json.dumps(event)}\n" for event in events)
+
+
+span = _noop_span
+count = _noop_count
+
+
+def enable(path: str, format: str = "jsonl") -> None:
+    """Enables tracing to the given file.
+
+    Args:
+        path (str): The file to append traces to.
+        format (str, optional): "jsonl" for a trace event per line or "chrome" for the Chrome trace event
+            format. Defaults to "jsonl".
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+
+    global enabled, _path, _format, span, count
+
+    if format not in ("jsonl", "chrome"):
+        raise ValueError(f"Unsupported trace format: {format}")
+
+    enabled = True
+    _path = path
+    _format = format
+    span = _Span
+    count = _count
+
+
+def summary() -> str | None:
+    """Summarises the current or last trace in a single line.
+
+    Durations are the total time spent in each span, so spans which run in parallel can add up to more than
+    the whole trace.
+
+    Returns:
+        str | None: The summary, or None if nothing has been traced.
+    """
+
+    with _lock:
+        if _root_name is None:
+            return None
+        end = _trace_end or time.perf_counter_ns()
+        durations = {}
+        for event in _events:
+            if event["name"] != _root_name:
+                durations[event["name"]] = (
+                    durations.get(event["name"], 0) + event["dur"]
+                )
+        counts = dict(_counts)
+
+    parts = [f"{_root_name} {(end - _trace_start) / 1e6:.1f} ms"]
+    parts += [f"{name} {dur / 1000:.1f} ms" for name, dur in durations.items()]
+    parts += [f"{name} {n}" for name, n in counts.items()]
+    return ", ".join(parts)
+
+
+if os.environ.get(_TRACE_ENV):
+    enable(os.environ[_TRACE_ENV], os.environ.get(_FORMAT_ENV, "jsonl"))
@@ -0,0 +1,148 @@
+import numpy as np
+
+RARITIES = "common", "uncommon", "rare"
+# Rarity of each drop slot of a relic, in the same order as the relic's drops
+SLOT_RARITIES = ("common",) * 3 + ("uncommon",) * 2 + ("rare",)
+CURRENCIES = "platinum", "ducats"
+MAX_PLAYERS = 4
+# Price of drops with no price data, e.g. items dropped from the prices since the relics were processed
+_UNPRICED = {"price": dict.fromkeys(CURRENCIES, 0)}
+
+# Which rarity each slot is, (rarities, slots)
+_SLOT_MATRIX = np.array(
+    [[slot == rarity for slot in SLOT_RARITIES] for rarity in RARITIES], dtype=float
+)
+
+
+class RelicValues:
+    """The expected values of every relic, computed for all relics at once.
+
+    Relic drop prices are kept as a (relics, slots, currencies) matrix and drop chances as a
+    (refinements, rarities) matrix, so the values of every relic for every refinement come out of a
+    single matrix product.
+    """
+
+    def __init__(
+        self,
+        relics: dict[str, dict[str, dict]],
+        items: dict[str, dict],
+        refinements: dict[str, dict[str, float]],
+    ) -> None:
+        """Builds the price and chance matrices for the given relics.
+
+        Args:
+            relics (dict[str, dict[str, dict]]): The processed relics by tier and name.
+            items (dict[str, dict]): The processed items, which must include every drop.
+            refinements (dict[str, dict[str, float]]): The chance of each rarity for each refinement.
+        """
+
+        self.keys = [(tier, name) for tier in relics for name in relics[tier]]
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.drops = [
+            [
+                drop
+                for rarity in RARITIES
+                for drop in relics[tier][name]["drops"][rarity]
+            ]
+            for tier, name in self.keys
+        ]
+
+        self.refinements = list(refinements)
+        self.chances = np.array(
+            [
+                [chances[rarity] for rarity in RARITIES]
+                for chances in refinements.values()
+            ]
+        )
+
+        self.prices = np.array(
+            [
+                [
+                    [items.get(drop, _UNPRICED)["price"][c] for c in CURRENCIES]
+                    for drop in drops
+                ]
+                for drops in self.drops
+            ],
+            dtype=float,
+        ).reshape(len(self.keys), len(SLOT_RARITIES), len(CURRENCIES))
+
+    def expected_values(self) -> np.ndarray:
+        """Calculates the expected value of every relic when opened solo.
+
+        Returns:
+            np.ndarray: The expected values, (relics, refinements, currencies).
+        """
+
+        return np.einsum("kr,rs,nsc->nkc", self.chances, _SLOT_MATRIX, self.prices)
+
+    def squad_values(self, players: int) -> np.ndarray:
+        """Calculates the expected value of every relic when a squad opens the same relic and picks the best drop.
+
+        The best of the players' drops is worth the highest value whose slot was dropped for at least
+        one player, so the chance of each value being the best is the difference between the
+        cumulative chances of all values up to and including it and those below it, to the power of
+        the number of players. Each currency is maximised separately.
+
+        Args:
+            players (int): The number of players opening the relic, from 1 to 4.
+
+        Raises:
+            ValueError: If the number of players is out of range.
+
+        Returns:
+            np.ndarray: The expected values of the best drop, (relics, refinements, currencies).
+        """
+
+        if not 1 <= players <= MAX_PLAYERS:
+            raise ValueError(f"Players must be from 1 to {MAX_PLAYERS}, got {players}")
+
+        # Sort the slots of each relic by value, (relics, slots, currencies)
+        order = np.argsort(self.prices, axis=1, kind="stable")
+        values = np.take_along_axis(self.prices, order, axis=1)
+
+        # Chance of each sorted slot for each refinement, (refinements, relics, slots, currencies)
+        slot_chances = (self.chances @ _SLOT_MATRIX)[:, order]
+        below = np.cumsum(slot_chances, axis=2)
+        best = below**players
+        best[:, :, 1:] -= below[:, :, :-1] ** players
+
+        return np.einsum("knsc,nsc->nkc", best, values)
+
+    def set_prices(self, relics: dict[str, dict[str, dict]]) -> None:
+        """Sets the solo price of each refinement of the given relics, rounded to 2 decimal places.
+
+        Args:
+            relics (dict[str, dict[str, dict]]): The processed relics to set the prices of.
+        """
+
+        values = self.expected_values().round(2).tolist()
+        for (tier, name), relic_values in zip(self.keys, values):
+            relics[tier][name]["price"] = {
+                refinement: dict(zip(CURRENCIES, currency_values))
+                for refinement, currency_values in zip(self.refinements, relic_values)
+            }
+
+    def query(
+        self, tier: str, name: str, refinement: str = "intact", players: int = 1
+    ) -> dict[str, float]:
+        """Gets the expected value of a relic for a squad scenario.
+
+        Args:
+            tier (str): The tier of the relic, e.g. Axi.
+            name (str): The name of the relic, e.g. A1.
+            refinement (str, optional): The refinement of the relic. Defaults to "intact".
+            players (int, optional): The number of players opening the relic and picking the best drop.
+                Defaults to 1.
+
+        Raises:
+            KeyError: If the relic does not exist.
+            ValueError: If the refinement does not exist or the number of players is out of range.
+
+        Returns:
+            dict[str, float]: The expected value in each currency.
+        """
+
+        row = self.index[(tier, name)]
+        column = self.refinements.index(refinement)
+        values = self.squad_values(players)[row, column]
+        return {c: round(float(v), 2) for c, v in zip(CURRENCIES, values)}